@@ -1,3 +1,14 @@
-from .agent import Agent
-from .host import HostAgent
-from .guest import GuestAgent
+from ..lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    "Agent": ".agent",
+    "HostAgent": ".host",
+    "GuestAgent": ".guest",
+    "LanguageGuard": ".language_guard",
+    "LanguageDriftError": ".language_guard",
+    "ConversationMemory": ".memory",
+    "TurnRetriever": ".retrieval",
+    "VectorIndex": ".retrieval",
+    "RepetitionDetector": ".repetition",
+    "RepetitionError": ".repetition",
+})
@@ -1,5 +1,11 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable
 from ..models.ollama_client import OllamaClient
+from ..models.options import GenerationOptions
+from ..models.session import ChatSession
+from ..models.translator import SentenceTranslator
+from .language_guard import LanguageGuard, LanguageDriftError
+from .repetition import RepetitionDetector, RepetitionError
+from .memory import ConversationMemory
 
 class Agent:
     """Base class for podcast agents (host and guest)."""
@@ -8,12 +14,28 @@ class Agent:
                 name: str, 
                 personality: str, 
                 ollama_client: OllamaClient,
-                language: str = "Hindi"):
-        """Initialize an agent with name and personality."""
+                language: str = "Hindi",
+                use_session: bool = False,
+                language_guard: Optional[LanguageGuard] = None,
+                translator: Optional[SentenceTranslator] = None,
+                memory: Optional[ConversationMemory] = None,
+                repetition_detector: Optional[RepetitionDetector] = None):
+        """
+        Initialize an agent with name and personality.
+        With use_session, the agent keeps an append-only chat with the model and
+        only sends the new turns each time, so Ollama can reuse its KV cache.
+        """
         self.name = name
         self.personality = personality
         self.ollama_client = ollama_client
         self.language = language
+        self.use_session = use_session
+        self.session: Optional[ChatSession] = None
+        self.session_seen = 0
+        self.language_guard = language_guard or LanguageGuard(ollama_client)
+        self.translator = translator or SentenceTranslator(ollama_client)
+        self.memory = memory or ConversationMemory(ollama_client, language)
+        self.repetition_detector = repetition_detector or RepetitionDetector()
         
     def get_system_prompt(self) -> str:
         """Get the basic system prompt for this agent."""
@@ -35,16 +57,14 @@ class Agent:
             "Respond as if you genuinely embody this identity."
         )
         
-    def generate_response(self, 
-                         conversation_history: List[Dict[str, str]], 
-                         current_topic: str, 
-                         tone: str,
-                         max_tokens: int = 200) -> str:
-        """Generate a response based on conversation history and current topic."""
-        system_prompt = self.get_system_prompt()
+    def build_prompt(self, 
+                    conversation_history: List[Dict[str, str]], 
+                    current_topic: str, 
+                    tone: str) -> str:
+        """Build the prompt for the next turn."""
         formatted_history = self.format_history(conversation_history)
         
-        user_prompt = (
+        return (
             f"Topic: {current_topic}\n"
             f"Tone: {tone}\n\n"
             f"Previous conversation:\n{formatted_history}\n"
@@ -52,19 +72,203 @@ class Agent:
             f"Your response should be in the style of your personality: {self.personality}."
         )
         
-        response = self.ollama_client.generate(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            max_tokens=max_tokens
+    def generate_response(self, 
+                         conversation_history: List[Dict[str, str]], 
+                         current_topic: str, 
+                         tone: str,
+                         max_tokens: int = 200,
+                         on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Generate a response based on conversation history and current topic.
+        If on_chunk is given, the response is streamed and each chunk is passed to it.
+        """
+        if self.use_session and self.session is not None and self.session.turns:
+            prompt = self.build_session_prompt(conversation_history, current_topic, tone)
+        else:
+            prompt = self.build_prompt(conversation_history, current_topic, tone)
+            
+        options = self.stop_options(conversation_history)
+        response = self.complete(prompt, max_tokens, on_chunk, options=options)
+        self.session_seen = len(conversation_history)
+        self.repetition_detector.flag_duplicate(self.name, response, conversation_history)
+        return response
+    
+    def stop_options(self, conversation_history: List[Dict[str, str]]) -> GenerationOptions:
+        """
+        Return options that stop generation where the model starts writing
+        another speaker's turn, so a response is never longer than one turn.
+        """
+        speakers = {entry.get('speaker') for entry in conversation_history}
+        speakers.discard(self.name)
+        speakers.discard(None)
+        if not speakers:
+            return GenerationOptions()
+        return GenerationOptions(stop=[f"\n{speaker}:" for speaker in sorted(speakers)])
+    
+    def build_session_prompt(self, 
+                            conversation_history: List[Dict[str, str]], 
+                            current_topic: str, 
+                            tone: str) -> str:
+        """Build a session prompt from only the turns added since this agent last spoke."""
+        new_entries = [
+            entry for entry in conversation_history[self.session_seen:]
+            if entry.get('speaker') != self.name
+        ]
+        new_turns = ConversationMemory.format_entries(new_entries)
+        
+        if self.language.lower() == "hindi":
+            return (
+                f"{new_turns}"
+                f"विषय है: {current_topic}। टोन है: {tone}। "
+                f"{self.name} के रूप में बातचीत को स्वाभाविक रूप से आगे बढ़ाएँ।"
+            )
+        return (
+            f"{new_turns}"
+            f"The topic is: {current_topic}. The tone is: {tone}. "
+            f"Continue the conversation naturally as {self.name}."
         )
+    
+    def start_session(self) -> ChatSession:
+        """Start a new chat session with this agent's system prompt."""
+        self.session = ChatSession(self.ollama_client, self.get_system_prompt())
+        self.session_seen = 0
+        return self.session
+    
+    def restore_session(self, 
+                       conversation_history: List[Dict[str, Any]], 
+                       current_topic: str, 
+                       tone: str) -> ChatSession:
+        """
+        Start a session holding this agent's part of an existing conversation,
+        e.g. one resumed from a journal. Each of its turns becomes an exchange
+        whose prompt is rebuilt from the turns before it.
+        """
+        session = self.start_session()
+        for index, entry in enumerate(conversation_history):
+            if entry.get('speaker') != self.name:
+                continue
+            history = conversation_history[:index]
+            if session.turns:
+                prompt = self.build_session_prompt(history, current_topic, tone)
+            else:
+                prompt = self.build_prompt(history, current_topic, tone)
+            session.messages.append({"role": "user", "content": prompt})
+            session.messages.append({"role": "assistant", "content": entry.get('text', '')})
+            self.session_seen = index
+        return session
+    
+    def complete(self, 
+                prompt: str, 
+                max_tokens: int = 200,
+                on_chunk: Optional[Callable[[str], None]] = None,
+                ollama_client: Optional[OllamaClient] = None,
+                options: Optional[GenerationOptions] = None) -> str:
+        """
+        Run a prompt with this agent's system prompt and enforce its language.
+        Hindi responses are watched while they stream: one that drifts away from
+        Devanagari is cancelled and regenerated with a stronger instruction, and
+        only the final attempt falls back to translating its non-Hindi sentences.
+        A response that starts looping is cut off after its last clean sentence.
+        A different ollama_client (e.g. routed to another model) bypasses the session;
+        options override the client's generation options for this call.
+        """
+        if self.language.lower() != "hindi":
+            return self._generate_clean(prompt, max_tokens, on_chunk, ollama_client, options).strip()
+        
+        guard = self.language_guard
+        attempt_prompt = prompt
+        for attempt in range(guard.max_attempts):
+            watcher = guard.watch(on_chunk, attempt)
+            try:
+                response = self._generate_clean(attempt_prompt, max_tokens, watcher, ollama_client, options)
+            except LanguageDriftError:
+                guard.aborts += 1
+                attempt_prompt = guard.strengthen(prompt)
+                continue
+            watcher.flush()
+            break
         
+        if not self.ollama_client.is_hindi(response):
+            guard.translations += 1
+            response = self.translator.translate(response)
+            if self._uses_session(ollama_client):
+                # Keep what was actually said in the session
+                self.session.replace_last_reply(response)
+            
         return response.strip()
     
+    def _uses_session(self, ollama_client: Optional[OllamaClient] = None) -> bool:
+        """Return True if a call on ollama_client goes through this agent's session."""
+        return self.use_session and ollama_client in (None, self.ollama_client)
+    
+    def _generate_clean(self, 
+                       prompt: str, 
+                       max_tokens: int,
+                       on_chunk: Optional[Callable[[str], None]] = None,
+                       ollama_client: Optional[OllamaClient] = None,
+                       options: Optional[GenerationOptions] = None) -> str:
+        """
+        Generate a raw response through the repetition detector, which always
+        streams it so a loop can be stopped as soon as it starts.
+        """
+        watcher = self.repetition_detector.watch(on_chunk)
+        try:
+            response = self._generate(prompt, max_tokens, watcher, ollama_client, options)
+        except RepetitionError:
+            response = watcher.clean_text()
+            # Passing on the held-back words may still abort the attempt, so flush before recording it
+            watcher.flush()
+            if self._uses_session(ollama_client):
+                # The cut-off exchange never completed in the session; record what was kept
+                (self.session or self.start_session()).append(prompt, response)
+            return response
+        
+        try:
+            # Pass on the words still held back
+            watcher.flush()
+        except LanguageDriftError:
+            if self._uses_session(ollama_client):
+                # The session already recorded the exchange of the abandoned attempt
+                self.session.drop_last_exchange()
+            raise
+        return response
+    
+    def _generate(self, 
+                 prompt: str, 
+                 max_tokens: int,
+                 on_chunk: Optional[Callable[[str], None]] = None,
+                 ollama_client: Optional[OllamaClient] = None,
+                 options: Optional[GenerationOptions] = None) -> str:
+        """Generate a raw response, streaming it to on_chunk if given."""
+        if self._uses_session(ollama_client):
+            session = self.session or self.start_session()
+            return session.send(prompt, max_tokens, on_chunk, options)
+        
+        ollama_client = ollama_client or self.ollama_client
+        if not on_chunk:
+            return ollama_client.generate(
+                prompt=prompt,
+                system_prompt=self.get_system_prompt(),
+                max_tokens=max_tokens,
+                options=options
+            )
+        
+        stream = ollama_client.generate_stream(
+            prompt=prompt,
+            system_prompt=self.get_system_prompt(),
+            max_tokens=max_tokens,
+            options=options
+        )
+        chunks = []
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                on_chunk(chunk)
+        finally:
+            # Cancels the request if on_chunk aborted it
+            stream.close()
+        return "".join(chunks)
+    
     def format_history(self, conversation_history: List[Dict[str, str]]) -> str:
-        """Format conversation history for the prompt."""
-        formatted = ""
-        for entry in conversation_history[-5:]:  # Only use the last 5 exchanges to avoid context length issues
-            speaker = entry.get('speaker', '')
-            text = entry.get('text', '')
-            formatted += f"{speaker}: {text}\n\n"
-        return formatted
+        """Format conversation history for the prompt within the memory's token budget."""
+        return self.memory.format(conversation_history)
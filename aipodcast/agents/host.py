@@ -1,6 +1,10 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .agent import Agent
+from .language_guard import LanguageGuard
+from .memory import ConversationMemory
+from .repetition import RepetitionDetector
 from ..models.ollama_client import OllamaClient
+from ..models.translator import SentenceTranslator
 
 class HostAgent(Agent):
     """Host agent for the podcast."""
@@ -9,9 +13,24 @@ class HostAgent(Agent):
                 name: str, 
                 personality: str, 
                 ollama_client: OllamaClient,
-                language: str = "Hindi"):
+                language: str = "Hindi",
+                use_session: bool = False,
+                language_guard: Optional[LanguageGuard] = None,
+                translator: Optional[SentenceTranslator] = None,
+                memory: Optional[ConversationMemory] = None,
+                repetition_detector: Optional[RepetitionDetector] = None):
         """Initialize the host agent."""
-        super().__init__(name, personality, ollama_client, language)
+        super().__init__(
+            name, 
+            personality, 
+            ollama_client, 
+            language,
+            use_session=use_session,
+            language_guard=language_guard,
+            translator=translator,
+            memory=memory,
+            repetition_detector=repetition_detector
+        )
     
     def get_system_prompt(self) -> str:
         """Get the system prompt for the host."""
@@ -23,12 +42,11 @@ class HostAgent(Agent):
         )
         return f"{base_prompt}\n\n{host_specific}"
     
-    def generate_response(self, 
-                         conversation_history: List[Dict[str, str]], 
-                         current_topic: str, 
-                         tone: str,
-                         max_tokens: int = 200) -> str:
-        """Generate a host response or question."""
+    def build_prompt(self, 
+                    conversation_history: List[Dict[str, str]], 
+                    current_topic: str, 
+                    tone: str) -> str:
+        """Build the prompt for a host response or question."""
         history_text = self.format_history(conversation_history)
         
         # Determine if this is the start of the podcast
@@ -67,14 +85,4 @@ class HostAgent(Agent):
                     f"Follow up on the previous answer or move the topic forward with a new question or comment."
                 )
         
-        response = self.ollama_client.generate(
-            prompt=prompt,
-            system_prompt=self.get_system_prompt(),
-            max_tokens=max_tokens
-        )
-        
-        # Only check/translate if language is Hindi
-        if self.language.lower() == "hindi" and not self.ollama_client.is_hindi(response):
-            response = self.ollama_client.translate_to_hindi(response)
-            
-        return response
+        return prompt
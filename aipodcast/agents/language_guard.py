@@ -0,0 +1,112 @@
+from typing import Dict, List, Optional, Callable
+
+from ..models.ollama_client import OllamaClient
+from ..models.scripts import ScriptCounter, is_script
+
+
+class LanguageDriftError(Exception):
+    """Raised from a stream callback to cancel a response that left the target script."""
+
+
+class StreamWatcher:
+    """
+    Stream callback that holds back the first chunks of a response until the
+    guard has seen enough text to judge its script.
+    """
+
+    def __init__(self,
+                guard: 'LanguageGuard',
+                on_chunk: Optional[Callable[[str], None]] = None,
+                enforce: bool = True):
+        """Initialize the watcher for one generation attempt."""
+        self.guard = guard
+        self.on_chunk = on_chunk
+        self.enforce = enforce
+        self.buffer: List[str] = []
+        self.buffered_chars = 0
+        self.counter = ScriptCounter()
+        self.verified = False
+
+    def __call__(self, chunk: str) -> None:
+        """Receive a chunk, abort on drift and pass verified text through."""
+        if self.verified:
+            self._emit(chunk)
+            return
+
+        self.buffer.append(chunk)
+        self.buffered_chars += len(chunk)
+        # Count incrementally so each chunk is only analysed once
+        self.counter.update(chunk)
+        if self.buffered_chars < self.guard.probe_chars:
+            return
+
+        if self.enforce and self.counter.ratio(self.guard.script) < self.guard.abort_ratio:
+            raise LanguageDriftError(f"Response drifted away from {self.guard.script} script")
+
+        self.verified = True
+        self.flush()
+
+    def flush(self) -> None:
+        """Pass on text still held back, e.g. when the response is shorter than the probe."""
+        for chunk in self.buffer:
+            self._emit(chunk)
+        self.buffer = []
+
+    def _emit(self, chunk: str) -> None:
+        """Forward a chunk downstream."""
+        if self.on_chunk:
+            self.on_chunk(chunk)
+
+
+class LanguageGuard:
+    """
+    Enforces Hindi output while the response is being generated.
+    The first probe_chars characters of every streamed response are checked,
+    and a response whose Devanagari ratio is clearly too low is cancelled and
+    regenerated with a stronger instruction instead of being generated in full
+    and translated afterwards.
+    """
+
+    STRONG_INSTRUCTION = (
+        "महत्वपूर्ण: केवल हिंदी में, देवनागरी लिपि में उत्तर दें। "
+        "अंग्रेज़ी शब्दों या रोमन लिपि का प्रयोग न करें। "
+        "(Respond only in Hindi, written in Devanagari script.)"
+    )
+
+    def __init__(self,
+                ollama_client: OllamaClient,
+                probe_chars: int = 60,
+                abort_ratio: float = 0.4,
+                max_attempts: int = 3,
+                script: str = "devanagari"):
+        """
+        Initialize the guard.
+        A response is aborted when less than abort_ratio of its first probe_chars
+        characters are in script (Devanagari for Hindi). max_attempts counts all generations of a turn;
+        the last one is never aborted so there is always a response to translate.
+        """
+        self.ollama_client = ollama_client
+        self.probe_chars = probe_chars
+        self.abort_ratio = abort_ratio
+        self.max_attempts = max(1, max_attempts)
+        self.script = script
+        self.aborts = 0
+        self.translations = 0
+
+    def is_drifting(self, text: str) -> bool:
+        """Return True if the text is clearly not in the guarded script."""
+        return not is_script(text, self.script, self.abort_ratio)
+
+    def strengthen(self, prompt: str) -> str:
+        """Append the stronger language instruction used for regeneration."""
+        return f"{prompt}\n\n{self.STRONG_INSTRUCTION}"
+
+    def watch(self,
+             on_chunk: Optional[Callable[[str], None]],
+             attempt: int) -> StreamWatcher:
+        """Return the stream callback for a generation attempt."""
+        return StreamWatcher(self, on_chunk, enforce=attempt < self.max_attempts - 1)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return the abort and translation counters."""
+        return {"aborts": self.aborts, "translations": self.translations}
@@ -0,0 +1,131 @@
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from ..models.ollama_client import OllamaClient
+from ..models.scripts import estimate_tokens
+from ..models.transport import OllamaError
+
+if TYPE_CHECKING:
+    from .retrieval import TurnRetriever
+
+
+class ConversationMemory:
+    """
+    Token-budgeted view of the conversation history for prompts.
+    The most recent turns are kept verbatim within history_tokens. Older turns
+    are folded into a running summary every summary_every turns, so the
+    summary is updated incrementally instead of being recomputed and the
+    prompt size stays flat however long the podcast runs. With a retriever,
+    the older turns most relevant to the latest one are also recalled
+    verbatim, within the retriever's own token budget.
+    """
+
+    def __init__(self,
+                ollama_client: OllamaClient,
+                language: str = "Hindi",
+                history_tokens: int = 800,
+                summary_every: int = 4,
+                summary_tokens: int = 200,
+                min_tail_turns: int = 2,
+                retriever: Optional["TurnRetriever"] = None):
+        """Initialize an empty memory."""
+        self.ollama_client = ollama_client
+        self.language = language
+        self.history_tokens = history_tokens
+        self.summary_every = max(1, summary_every)
+        self.summary_tokens = summary_tokens
+        self.min_tail_turns = min_tail_turns
+        self.retriever = retriever
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the summary and every tracked turn."""
+        self.summary = ""
+        self.seen = 0
+        # Turns kept verbatim, oldest first, with their token estimates
+        self.tail: List[Dict[str, str]] = []
+        self.tail_token_counts: List[int] = []
+        # Turns pushed out of the tail that are not summarized yet
+        self.pending: List[Dict[str, str]] = []
+        if self.retriever is not None:
+            self.retriever.reset()
+
+    def update(self, conversation_history: List[Dict[str, str]]) -> None:
+        """Take in turns added to the history since the last update."""
+        if len(conversation_history) < self.seen:
+            # A new conversation was started with a fresh history
+            self.reset()
+
+        for entry in conversation_history[self.seen:]:
+            self.tail.append(entry)
+            self.tail_token_counts.append(estimate_tokens(entry.get('text', '')))
+            if self.retriever is not None:
+                self.retriever.add(entry)
+        self.seen = len(conversation_history)
+
+        while (len(self.tail) > self.min_tail_turns
+               and sum(self.tail_token_counts) > self.history_tokens):
+            self.pending.append(self.tail.pop(0))
+            self.tail_token_counts.pop(0)
+
+        if len(self.pending) >= self.summary_every:
+            self.fold_pending()
+
+    def fold_pending(self) -> None:
+        """Fold the pending turns into the running summary with one model call."""
+        new_turns = self.format_entries(self.pending)
+
+        if self.language.lower() == "hindi":
+            prompt = (
+                "नीचे एक पॉडकास्ट का अब तक का सारांश और उसके बाद की नई बातचीत है। "
+                "सारांश को अपडेट करें ताकि उसमें नई बातचीत के मुख्य बिंदु भी शामिल हों। "
+                "केवल अपडेट किया गया सारांश लिखें, अधिकतम पाँच वाक्यों में, हिंदी (देवनागरी लिपि) में।\n\n"
+                f"अब तक का सारांश:\n{self.summary or '(कोई नहीं)'}\n\n"
+                f"नई बातचीत:\n{new_turns}"
+            )
+        else:
+            prompt = (
+                "Below is the summary of a podcast so far, followed by the new conversation. "
+                "Update the summary so it also covers the main points of the new conversation. "
+                f"Write only the updated summary, in at most five sentences, in {self.language}.\n\n"
+                f"Summary so far:\n{self.summary or '(none)'}\n\n"
+                f"New conversation:\n{new_turns}"
+            )
+
+        try:
+            summary = self.ollama_client.generate(
+                prompt,
+                system_prompt="You write short, faithful summaries of podcast conversations.",
+                max_tokens=self.summary_tokens
+            )
+        except OllamaError as e:
+            # The pending turns stay in the prompt; folding is retried on the next update
+            print(f"Could not update conversation summary: {str(e)}")
+            return
+
+        if summary.strip():
+            self.summary = summary.strip()
+            self.pending = []
+
+    @staticmethod
+    def format_entries(entries: List[Dict[str, str]]) -> str:
+        """Format turns as 'speaker: text' paragraphs."""
+        formatted = ""
+        for entry in entries:
+            speaker = entry.get('speaker', '')
+            text = entry.get('text', '')
+            formatted += f"{speaker}: {text}\n\n"
+        return formatted
+
+    def format(self, conversation_history: Optional[List[Dict[str, str]]] = None) -> str:
+        """Return the summary followed by the verbatim recent turns."""
+        if conversation_history is not None:
+            self.update(conversation_history)
+
+        formatted = ""
+        if self.summary:
+            label = "पिछली बातचीत का सारांश" if self.language.lower() == "hindi" else "Summary of the earlier conversation"
+            formatted += f"{label}: {self.summary}\n\n"
+        if self.retriever is not None:
+            # Only turns that are no longer in the prompt verbatim are recalled
+            formatted += self.retriever.format(self.seen - len(self.pending) - len(self.tail))
+        return formatted + self.format_entries(self.pending + self.tail)
@@ -0,0 +1,206 @@
+import bisect
+import re
+from collections import deque
+from typing import Dict, List, Optional, Callable, Set, Tuple
+
+# Characters that end a sentence; a newline ends one too
+SENTENCE_TERMINATORS = set("।॥.!?\n")
+# Punctuation ignored when comparing words and sentences
+PUNCTUATION = re.compile(r'[\s.,;:!?।॥"\'“”‘’()\[\]\-–—…]+')
+
+# Polynomial rolling hash over the hashes of the last ngram_size words
+HASH_BASE = 1_000_003
+HASH_MODULUS = (1 << 61) - 1
+
+
+class RepetitionError(Exception):
+    """Raised from a stream callback to cut off a response that started looping."""
+
+
+class RepetitionWatcher:
+    """
+    Stream callback that follows a response word by word and sentence by
+    sentence, and cuts it off as soon as it repeats itself.
+    Only the words still in the n-gram window are held back, so the stream
+    lags by at most ngram_size words and the n-gram that triggers a cut is
+    never passed on. A cut that reaches back into text already passed on
+    trims it from clean_text(). flush() passes on the rest when the response ends.
+    """
+
+    def __init__(self,
+                detector: 'RepetitionDetector',
+                on_chunk: Optional[Callable[[str], None]] = None):
+        """Initialize the watcher for one generation attempt."""
+        self.detector = detector
+        self.on_chunk = on_chunk
+        self.text = ""
+        self.scanned = 0
+        self.word_start: Optional[int] = None
+        self.sentence_start = 0
+        self.sentence_ends: List[int] = []
+        self.fingerprints: Set[int] = set()
+        # Hashes of the words in the window, and the rolling hash over them
+        self.window: deque = deque()
+        self.window_starts: deque = deque()
+        self.rolling_hash = 0
+        self.oldest_weight = pow(HASH_BASE, detector.ngram_size, HASH_MODULUS)
+        # Per n-gram hash: times seen, and where its second occurrence starts
+        self.ngrams: Dict[int, List[int]] = {}
+        self.cut: Optional[int] = None
+        self.emitted = 0
+
+    def __call__(self, chunk: str) -> None:
+        """Receive a chunk, raise RepetitionError on a loop and pass clean text through."""
+        self.text += chunk
+        for position in range(self.scanned, len(self.text)):
+            char = self.text[position]
+            if char.isspace() or char in SENTENCE_TERMINATORS:
+                if self.word_start is not None:
+                    self._add_word(self.word_start, position)
+                    self.word_start = None
+                if char in SENTENCE_TERMINATORS:
+                    self._end_sentence(position + 1)
+            elif self.word_start is None:
+                self.word_start = position
+        self.scanned = len(self.text)
+        self._emit(self._safe_end())
+
+    def _safe_end(self) -> int:
+        """Return the end of the text that can be passed on: everything before the n-gram window."""
+        # The words in the window may still complete an n-gram seen too often
+        return self.window_starts[0] if self.window_starts else 0
+
+    def _emit(self, end: int) -> None:
+        """Pass the text up to end downstream."""
+        if end > self.emitted:
+            chunk = self.text[self.emitted:end]
+            self.emitted = end
+            if self.on_chunk:
+                self.on_chunk(chunk)
+
+    def flush(self) -> None:
+        """Pass on the text still held back, up to the cut if the response was cut off."""
+        self._emit(self.cut if self.cut is not None else len(self.text))
+
+    def _add_word(self, start: int, end: int) -> None:
+        """Add a finished word to the n-gram window and count the n-gram it completes."""
+        word = PUNCTUATION.sub("", self.text[start:end]).lower()
+        if not word:
+            return
+        size = self.detector.ngram_size
+        word_hash = hash(word) % HASH_MODULUS
+        self.rolling_hash = (self.rolling_hash * HASH_BASE + word_hash) % HASH_MODULUS
+        self.window.append(word_hash)
+        self.window_starts.append(start)
+        if len(self.window) > size:
+            # Drop the oldest word's contribution
+            oldest = self.window.popleft()
+            self.window_starts.popleft()
+            self.rolling_hash = (self.rolling_hash - oldest * self.oldest_weight) % HASH_MODULUS
+        if len(self.window) < size:
+            return
+
+        seen = self.ngrams.setdefault(self.rolling_hash, [0, 0])
+        seen[0] += 1
+        if seen[0] == 2:
+            seen[1] = self.window_starts[0]
+        if seen[0] > self.detector.max_ngram_repeats:
+            # Keep everything before the second occurrence of the looping words
+            self._stop(seen[1])
+
+    def _end_sentence(self, end: int) -> None:
+        """Fingerprint a finished sentence; a sentence seen before in this response is a loop."""
+        sentence = self.text[self.sentence_start:end]
+        key = PUNCTUATION.sub(" ", sentence).strip().lower()
+        if len(key) >= self.detector.min_sentence_chars:
+            fingerprint = hash(key)
+            if fingerprint in self.fingerprints:
+                self._stop(self.sentence_start)
+            self.fingerprints.add(fingerprint)
+        self.sentence_ends.append(end)
+        self.sentence_start = end
+
+    def _stop(self, repeat_start: int) -> None:
+        """Cut the response at the last sentence end before repeat_start and abort the stream."""
+        index = bisect.bisect_right(self.sentence_ends, repeat_start) - 1
+        self.cut = self.sentence_ends[index] if index >= 0 else repeat_start
+        self.detector.loops_cut += 1
+        raise RepetitionError("Response started repeating itself")
+
+    def clean_text(self) -> str:
+        """
+        Return the response up to where it was cut off (all of it if it was not).
+        This may be shorter than the text already passed on.
+        """
+        return self.text[:self.cut].strip() if self.cut is not None else self.text.strip()
+
+
+class RepetitionDetector:
+    """
+    Detects degenerate, looping responses while they are generated.
+    A response is cut off once a sentence repeats within it or a run of
+    ngram_size words occurs more than max_ngram_repeats times, and only the
+    text before the repetition is kept. Finished turns can also be compared
+    with the earlier turns of the conversation to flag near-duplicates.
+    """
+
+    def __init__(self,
+                ngram_size: int = 6,
+                max_ngram_repeats: int = 2,
+                min_sentence_chars: int = 12,
+                check_history: bool = True,
+                duplicate_threshold: float = 0.6):
+        """
+        Initialize the detector.
+        Sentences shorter than min_sentence_chars (e.g. "हाँ।") may repeat freely.
+        A turn whose word trigrams overlap those of an earlier turn by at least
+        duplicate_threshold (Jaccard similarity) is flagged as a near-duplicate
+        when check_history is set.
+        """
+        self.ngram_size = max(2, ngram_size)
+        self.max_ngram_repeats = max(1, max_ngram_repeats)
+        self.min_sentence_chars = min_sentence_chars
+        self.check_history = check_history
+        self.duplicate_threshold = duplicate_threshold
+        self.loops_cut = 0
+        self.near_duplicates = 0
+
+    def watch(self, on_chunk: Optional[Callable[[str], None]] = None) -> RepetitionWatcher:
+        """Return the stream callback for a generation attempt."""
+        return RepetitionWatcher(self, on_chunk)
+
+    @staticmethod
+    def shingles(text: str) -> Set[Tuple[str, ...]]:
+        """Return the set of word trigrams of text."""
+        words = PUNCTUATION.sub(" ", text).lower().split()
+        return {tuple(words[i:i + 3]) for i in range(max(1, len(words) - 2))} if words else set()
+
+    def find_duplicate(self, text: str, conversation_history: List[Dict[str, str]]) -> Tuple[int, float]:
+        """Return the index of the earlier turn most similar to text and their trigram overlap."""
+        shingles = self.shingles(text)
+        best, best_similarity = -1, 0.0
+        if not shingles:
+            return best, best_similarity
+        for index, entry in enumerate(conversation_history):
+            other = self.shingles(entry.get('text', ''))
+            if not other:
+                continue
+            similarity = len(shingles & other) / len(shingles | other)
+            if similarity > best_similarity:
+                best, best_similarity = index, similarity
+        return best, best_similarity
+
+    def flag_duplicate(self, speaker: str, text: str, conversation_history: List[Dict[str, str]]) -> bool:
+        """Warn about and count a turn that nearly repeats an earlier one; returns True if it does."""
+        if not self.check_history:
+            return False
+        index, similarity = self.find_duplicate(text, conversation_history)
+        if similarity < self.duplicate_threshold:
+            return False
+        self.near_duplicates += 1
+        print(f"Warning: {speaker}'s turn nearly repeats turn {index + 1} ({similarity:.0%} similar)")
+        return True
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return the loop and near-duplicate counters."""
+        return {"loops_cut": self.loops_cut, "near_duplicates": self.near_duplicates}
@@ -0,0 +1,200 @@
+import math
+import queue
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ..models.ollama_client import OllamaClient
+from ..models.scripts import estimate_tokens
+from ..models.transport import OllamaError
+from .memory import ConversationMemory
+
+
+class VectorIndex:
+    """
+    Unit-length embedding vectors searched by cosine similarity.
+    With NumPy the vectors are rows of one float32 matrix that grows by
+    doubling, so a search is a single matrix-vector product; without it
+    they are kept as lists of floats.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.size = 0
+        self._matrix = None
+        self._rows: List[List[float]] = []
+
+    @staticmethod
+    def normalize(vector: Sequence[float]) -> List[float]:
+        """Return vector scaled to unit length."""
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def add(self, vector: Sequence[float]) -> int:
+        """Add a vector and return its position."""
+        vector = self.normalize(vector)
+        if numpy is None:
+            self._rows.append(vector)
+        else:
+            if self._matrix is None:
+                self._matrix = numpy.zeros((16, len(vector)), dtype=numpy.float32)
+            elif self.size == len(self._matrix):
+                self._matrix = numpy.concatenate([self._matrix, numpy.zeros_like(self._matrix)])
+            self._matrix[self.size] = vector
+        self.size += 1
+        return self.size - 1
+
+    def vector(self, position: int) -> List[float]:
+        """Return the stored (normalized) vector at position."""
+        if numpy is None:
+            return self._rows[position]
+        return self._matrix[position].tolist()
+
+    def search(self, vector: Sequence[float], k: int, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Return the positions and similarities of the k vectors most similar to
+        vector, best first. Only the first limit positions are searched.
+        """
+        count = self.size if limit is None else min(limit, self.size)
+        if count <= 0 or k <= 0:
+            return []
+        query = self.normalize(vector)
+
+        if numpy is None:
+            scores = [sum(a * b for a, b in zip(row, query)) for row in self._rows[:count]]
+            best = sorted(range(count), key=lambda position: scores[position], reverse=True)[:k]
+            return [(position, scores[position]) for position in best]
+
+        scores = self._matrix[:count] @ numpy.asarray(query, dtype=numpy.float32)
+        if k < count:
+            best = numpy.argpartition(-scores, k)[:k]
+        else:
+            best = numpy.arange(count)
+        best = best[numpy.argsort(-scores[best])]
+        return [(int(position), float(scores[position])) for position in best]
+
+
+class TurnRetriever:
+    """
+    Recalls earlier turns that are relevant to the latest one.
+    Every turn added is embedded in the background, several at a time when
+    turns arrive faster than they are embedded, and stored in a VectorIndex.
+    recall() uses the latest turn's vector as the query, so building a
+    prompt costs no extra model call, and returns the best matching older
+    turns within a token budget.
+    """
+
+    def __init__(self,
+                ollama_client: OllamaClient,
+                language: str = "Hindi",
+                top_k: int = 3,
+                max_tokens: int = 300,
+                min_similarity: float = 0.3,
+                batch_size: int = 16):
+        """
+        Initialize an empty retriever.
+        ollama_client must use a model that supports /api/embed.
+        """
+        self.ollama_client = ollama_client
+        self.language = language
+        self.top_k = top_k
+        self.max_tokens = max_tokens
+        self.min_similarity = min_similarity
+        self.batch_size = max(1, batch_size)
+        self.disabled = False
+        self._queue: "queue.Queue[Tuple[int, int]]" = queue.Queue()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget every turn; embeddings still in flight are discarded."""
+        with self._cond:
+            self.entries: List[Dict[str, str]] = []
+            self.index = VectorIndex()
+            # Positions in entries of the embedded turns, in index order
+            self.positions: Dict[int, int] = {}
+            self._generation = getattr(self, "_generation", 0) + 1
+            self._cond.notify_all()
+
+    def add(self, entry: Dict[str, str]) -> None:
+        """Queue a turn for embedding."""
+        if self.disabled:
+            return
+        with self._cond:
+            self.entries.append(entry)
+            self._queue.put((self._generation, len(self.entries) - 1))
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._embed_queued, daemon=True)
+            self._worker.start()
+
+    def _embed_queued(self) -> None:
+        """Worker thread: embed queued turns in batches."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get())
+
+            with self._cond:
+                generation = self._generation
+                batch = [position for batch_generation, position in batch if batch_generation == generation]
+                texts = [self.entries[position].get('text', '') for position in batch]
+            if not batch:
+                continue
+
+            try:
+                vectors = self.ollama_client.embed(texts)
+            except OllamaError as e:
+                print(f"Could not embed turns, continuing without recalling earlier turns: {str(e)}")
+                with self._cond:
+                    self.disabled = True
+                    self._cond.notify_all()
+                return
+
+            with self._cond:
+                if generation == self._generation:
+                    for position, vector in zip(batch, vectors):
+                        self.positions[position] = self.index.add(vector)
+                self._cond.notify_all()
+
+    def recall(self, before: int, timeout: float = 30.0) -> List[Dict[str, str]]:
+        """
+        Return the turns before position before that are most similar to the
+        latest turn, in conversation order and within max_tokens.
+        Waits up to timeout seconds for the latest turns to be embedded.
+        """
+        with self._cond:
+            if not self.entries or before <= 0:
+                return []
+            latest = len(self.entries) - 1
+            self._cond.wait_for(lambda: self.disabled or latest in self.positions or latest >= len(self.entries),
+                                timeout)
+            if self.disabled or latest not in self.positions:
+                return []
+
+            # Turns are embedded in order, so the candidates are a prefix of the index
+            limit = sum(1 for position in self.positions if position < before)
+            matches = self.index.search(self.index.vector(self.positions[latest]), self.top_k, limit)
+            by_index = {index: position for position, index in self.positions.items()}
+            found = [by_index[index] for index, similarity in matches if similarity >= self.min_similarity]
+
+            recalled, used = [], 0
+            for position in found:
+                tokens = estimate_tokens(self.entries[position].get('text', ''))
+                if used + tokens > self.max_tokens:
+                    continue
+                recalled.append(position)
+                used += tokens
+            return [self.entries[position] for position in sorted(recalled)]
+
+    def format(self, before: int) -> str:
+        """Return the recalled turns as a labelled prompt section, or an empty string."""
+        recalled = self.recall(before)
+        if not recalled:
+            return ""
+        label = "बातचीत में पहले" if self.language.lower() == "hindi" else "Earlier in the conversation"
+        return f"{label}:\n{ConversationMemory.format_entries(recalled)}"
@@ -0,0 +1 @@
+# Benchmarks for the podcast generator; run the modules with python -m
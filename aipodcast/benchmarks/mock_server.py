@@ -0,0 +1,284 @@
+import json
+import random
+import re
+import socket
+import sys
+import threading
+import time
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional
+
+# Canned responses per language; "mixed" ones make a Hindi podcast translate
+RESPONSES: Dict[str, List[str]] = {
+    "hindi": [
+        "नमस्ते दोस्तों, आज हम एक बहुत ही रोचक विषय पर बात करेंगे। "
+        "यह विषय हमारे समाज और हमारे भविष्य दोनों से जुड़ा हुआ है।",
+        "आपने बिल्कुल सही कहा। मेरे अनुभव में बदलाव हमेशा छोटे कदमों से शुरू होता है। "
+        "लोगों को साथ लाना सबसे कठिन और सबसे ज़रूरी काम है।",
+        "यह एक दिलचस्प बात है। क्या आप हमें बता सकते हैं कि उस समय "
+        "आपके मन में सबसे बड़ा सवाल क्या था?",
+    ],
+    "english": [
+        "Welcome, friends. Today we are going to talk about a fascinating subject "
+        "that touches both our society and our future.",
+        "You are absolutely right. In my experience change always begins with small steps. "
+        "Bringing people together is the hardest and most important work.",
+        "That is an interesting point. Could you tell us what the biggest question "
+        "on your mind was at that time?",
+    ],
+    "mixed": [
+        "नमस्ते दोस्तों, आज हम एक बहुत ही रोचक विषय पर बात करेंगे। "
+        "This topic touches both our society and our future.",
+        "आपने बिल्कुल सही कहा। In my experience change always begins with small steps. "
+        "लोगों को साथ लाना सबसे ज़रूरी काम है।",
+        "That is an interesting point. क्या आप हमें बता सकते हैं कि "
+        "आपके मन में सबसे बड़ा सवाल क्या था?",
+    ],
+}
+
+TRANSLATION_LINE = "यह वाक्य हिंदी में अनुवादित है।"
+NUMBERED_LINE = re.compile(r'^\s*(\d+)\.\s', re.MULTILINE)
+
+
+class MockOllamaServer:
+    """
+    In-process stand-in for the Ollama HTTP API.
+    Serves canned responses on /api/generate and /api/chat (streaming or not),
+    bag-of-words embeddings on /api/embed and lists models on /api/tags and /api/ps. latency delays the first token,
+    tokens_per_second paces the rest and error_rate answers that share of
+    generation requests with HTTP 503, so runs are repeatable for a given seed.
+    """
+
+    def __init__(self,
+                responses: str = "hindi",
+                latency: float = 0.0,
+                tokens_per_second: float = 0.0,
+                error_rate: float = 0.0,
+                seed: int = 0,
+                models: Optional[List[str]] = None,
+                host: str = "127.0.0.1",
+                port: int = 0):
+        """Initialize the server; port 0 picks a free port when it starts."""
+        if responses not in RESPONSES:
+            raise ValueError(f"Unknown response set '{responses}'. Must be one of: {', '.join(RESPONSES)}")
+        self.responses = RESPONSES[responses]
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.models = models or ["llama3:latest"]
+        self.address = (host, port)
+        self.requests = 0
+        self.errors = 0
+        self.tokens = 0
+        self._next_response = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockOllamaServer':
+        """Start serving on a background thread."""
+        self._server = _Server(self.address, _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'MockOllamaServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def should_fail(self) -> bool:
+        """Count a generation request and decide whether to inject an error."""
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.errors += 1
+                return True
+        return False
+
+    def reply(self, prompt: str) -> str:
+        """Return the text to generate for a prompt."""
+        if prompt.startswith("Translate each numbered line"):
+            # Answer translation requests line for line so the translator can parse them
+            numbers = NUMBERED_LINE.findall(prompt)
+            return "\n".join(f"{number}. {TRANSLATION_LINE}" for number in numbers)
+        with self._lock:
+            text = self.responses[self._next_response % len(self.responses)]
+            self._next_response += 1
+        return text
+
+    @staticmethod
+    def embed(text: str, dimensions: int = 64) -> List[float]:
+        """Return a bag-of-words vector of text, so texts sharing words get similar embeddings."""
+        vector = [0.0] * dimensions
+        for word in text.split():
+            vector[zlib.crc32(word.encode("utf-8")) % dimensions] += 1.0
+        return vector
+
+    def tokenize(self, text: str, num_predict: Optional[int]) -> List[str]:
+        """Split text into word tokens, cut to num_predict like the real server."""
+        tokens = re.findall(r'\S+\s*', text)
+        if num_predict is not None and num_predict >= 0:
+            tokens = tokens[:num_predict]
+        with self._lock:
+            self.tokens += len(tokens)
+        return tokens
+
+
+class _Server(ThreadingHTTPServer):
+    """HTTP server that ignores clients dropping their connections."""
+
+    def handle_error(self, request, client_address) -> None:
+        """Pooled connections are closed or reset by the client at any time."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler of MockOllamaServer."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        """Send small writes at once, like a real server, instead of waiting on Nagle's algorithm."""
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format: str, *args) -> None:
+        """Keep the benchmark output quiet."""
+
+    def send_json(self, status: int, body: Dict[str, Any]) -> None:
+        """Send a complete JSON response."""
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        mock = self.server.mock
+        if self.path in ("/api/tags", "/api/ps"):
+            self.send_json(200, {"models": [{"name": name, "model": name} for name in mock.models]})
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        mock = self.server.mock
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_json(400, {"error": "invalid JSON"})
+            return
+
+        if self.path == "/api/embed":
+            texts = body.get("input", [])
+            texts = texts if isinstance(texts, list) else [texts]
+            self.send_json(200, {
+                "model": body.get("model"),
+                "embeddings": [mock.embed(text) for text in texts],
+                "prompt_eval_count": sum(len(text.split()) for text in texts),
+            })
+            return
+
+        if self.path not in ("/api/generate", "/api/chat"):
+            self.send_json(404, {"error": "not found"})
+            return
+
+        chat = self.path == "/api/chat"
+        if chat:
+            messages = body.get("messages", [])
+            prompt = messages[-1].get("content", "") if messages else ""
+        else:
+            prompt = body.get("prompt", "")
+            if not prompt:
+                # A load request: no prompt, nothing generated
+                self.send_json(200, {"model": body.get("model"), "response": "", "done": True})
+                return
+
+        if mock.should_fail():
+            self.send_json(503, {"error": "server busy"})
+            return
+
+        options = body.get("options", {})
+        tokens = mock.tokenize(mock.reply(prompt), options.get("num_predict"))
+        done_reason = "length" if len(tokens) == options.get("num_predict") else "stop"
+        started = time.perf_counter()
+        if mock.latency:
+            time.sleep(mock.latency)
+        # The first-token delay stands in for prompt evaluation
+        prompt_evaluated = time.perf_counter()
+
+        final = {
+            "model": body.get("model"),
+            "done": True,
+            "done_reason": done_reason,
+            "prompt_eval_count": len(prompt.split()),
+            "eval_count": len(tokens),
+        }
+
+        if not body.get("stream", True):
+            if mock.tokens_per_second:
+                time.sleep(len(tokens) / mock.tokens_per_second)
+            final.update(self.content("".join(tokens), chat))
+            final.update(self.durations(started, prompt_evaluated))
+            self.send_json(200, final)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                if mock.tokens_per_second:
+                    time.sleep(1 / mock.tokens_per_second)
+                self.write_chunk({"model": body.get("model"), "done": False, **self.content(token, chat)})
+            final.update(self.content("", chat))
+            final.update(self.durations(started, prompt_evaluated))
+            self.write_chunk(final)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client cancelled the stream
+            self.close_connection = True
+
+    @staticmethod
+    def durations(started: float, prompt_evaluated: float) -> Dict[str, int]:
+        """Return Ollama's timing fields, in nanoseconds, for a response started at started."""
+        now = time.perf_counter()
+        return {
+            "total_duration": int((now - started) * 1e9),
+            "load_duration": 0,
+            "prompt_eval_duration": int((prompt_evaluated - started) * 1e9),
+            "eval_duration": int((now - prompt_evaluated) * 1e9),
+        }
+
+    @staticmethod
+    def content(text: str, chat: bool) -> Dict[str, Any]:
+        """Return the text fields of a /api/chat or /api/generate response object."""
+        if chat:
+            return {"message": {"role": "assistant", "content": text}}
+        return {"response": text}
+
+    def write_chunk(self, body: Dict[str, Any]) -> None:
+        """Write one NDJSON line as an HTTP chunk."""
+        data = (json.dumps(body, ensure_ascii=False) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
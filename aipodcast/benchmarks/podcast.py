@@ -0,0 +1,238 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+from ..models import OllamaTransport
+from ..cli.runner import PodcastRunner, create_client
+from .mock_server import MockOllamaServer
+
+# Benchmark scenarios; every podcast in a scenario uses the same config
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "short": {
+        "description": "Short English podcast",
+        "language": "English", "responses": "english", "duration": 2,
+    },
+    "long": {
+        "description": "Long Hindi podcast, exercises the memory summaries",
+        "language": "Hindi", "responses": "hindi", "duration": 30,
+    },
+    "retrieval": {
+        "description": "Long Hindi podcast that also recalls earlier turns by embedding",
+        "language": "Hindi", "responses": "hindi", "duration": 30, "memory": {"retrieval": True},
+    },
+    "translation": {
+        "description": "Hindi podcast whose responses mix in English sentences",
+        "language": "Hindi", "responses": "mixed", "duration": 10,
+    },
+    "streaming": {
+        "description": "Hindi podcast streamed through the language guard",
+        "language": "Hindi", "responses": "hindi", "duration": 10, "stream": True,
+    },
+    "batch": {
+        "description": "Eight Hindi podcasts, four at a time on a shared transport",
+        "language": "Hindi", "responses": "hindi", "duration": 5, "podcasts": 8, "parallel": 4,
+    },
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of values, interpolating between ranks."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def make_config(scenario: Dict[str, Any], output_path: str, output_format: str) -> Dict[str, Any]:
+    """Build the podcast config of a scenario."""
+    podcast_config = {
+        "host": {"name": "Host", "personality": "Curious, warm interviewer"},
+        "guest": {"name": "Guest", "personality": "Thoughtful storyteller"},
+        "language": scenario["language"],
+        "tone": "Formal",
+        "theme": "The future of our cities",
+        "max_tokens_per_response": scenario.get("max_tokens", 200),
+        "total_podcast_duration_minutes": scenario["duration"],
+        "ollama_model": "llama3",
+        "output_format": output_format,
+        "output_file": output_path,
+        # The canned responses are short; a fixed number of turns keeps runs comparable across commits
+        "duration_control": scenario.get("duration_control", "fixed"),
+    }
+    if "memory" in scenario:
+        podcast_config["memory"] = scenario["memory"]
+    return podcast_config
+
+
+def run_podcast(podcast_config: Dict[str, Any],
+                transport: OllamaTransport,
+                stream: bool) -> Dict[str, Any]:
+    """Run one podcast and return its per-turn latencies."""
+    runner = PodcastRunner(podcast_config, create_client(podcast_config, transport), stream=stream)
+    runner.setup()
+    start = time.time()
+    runner.run()
+
+    # Turns are timestamped when they are added, so their gaps are the turn latencies
+    timestamps = [start] + [entry['timestamp'] for entry in runner.conversation]
+    return {"turn_latencies": [b - a for a, b in zip(timestamps, timestamps[1:])]}
+
+
+def run_scenario(name: str,
+                 latency: float = 0.0,
+                 tokens_per_second: float = 0.0,
+                 error_rate: float = 0.0,
+                 seed: int = 0,
+                 output_format: str = "json",
+                 measure_memory: bool = True) -> Dict[str, Any]:
+    """Run a scenario against a fresh mock server and return its result row."""
+    scenario = SCENARIOS[name]
+    podcasts = scenario.get("podcasts", 1)
+    parallel = scenario.get("parallel", 1)
+
+    with MockOllamaServer(scenario["responses"], latency, tokens_per_second, error_rate, seed) as server, \
+            tempfile.TemporaryDirectory() as output_dir:
+        transport = OllamaTransport(server.url, max_retries=3, backoff_base=0.01, backoff_max=0.1,
+                                    pool_size=max(parallel, 10))
+        configs = [
+            make_config(scenario, os.path.join(output_dir, f"podcast_{i}.{output_format}"), output_format)
+            for i in range(podcasts)
+        ]
+
+        if measure_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        # The runner prints every turn; keep the benchmark report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            with ThreadPoolExecutor(max_workers=parallel) as executor:
+                runs = list(executor.map(
+                    lambda podcast_config: run_podcast(podcast_config, transport, scenario.get("stream", False)),
+                    configs
+                ))
+        wall_time = time.perf_counter() - start
+        peak_memory = 0
+        if measure_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        transport.close()
+
+    latencies = [latency for run in runs for latency in run["turn_latencies"]]
+    return {
+        "scenario": name,
+        "podcasts": podcasts,
+        "turns": len(latencies),
+        "requests": server.requests,
+        "injected_errors": server.errors,
+        "wall_time": wall_time,
+        "turn_p50_ms": percentile(latencies, 50) * 1000,
+        "turn_p95_ms": percentile(latencies, 95) * 1000,
+        "turns_per_second": len(latencies) / wall_time if wall_time else 0.0,
+        "tokens_per_second": server.tokens / wall_time if wall_time else 0.0,
+        "peak_memory_mb": peak_memory / (1024 * 1024),
+    }
+
+
+def get_commit() -> str:
+    """Return the current git commit, or an empty string outside a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def format_results(rows: List[Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """Format result rows as a table, with the p50 change against a baseline run if given."""
+    header = (f"{'scenario':<12} {'turns':>6} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'turns/s':>9} {'tokens/s':>10} {'peak MB':>8}")
+    if baseline:
+        header += f" {'p50 vs base':>12}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        line = (f"{row['scenario']:<12} {row['turns']:>6} {row['turn_p50_ms']:>9.2f} {row['turn_p95_ms']:>9.2f} "
+                f"{row['turns_per_second']:>9.1f} {row['tokens_per_second']:>10.0f} {row['peak_memory_mb']:>8.1f}")
+        base = (baseline or {}).get(row['scenario'])
+        if base and base.get('turn_p50_ms'):
+            change = (row['turn_p50_ms'] - base['turn_p50_ms']) / base['turn_p50_ms'] * 100
+            line += f" {change:>+11.1f}%"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    """Run the podcast benchmark scenarios against the mock server."""
+    parser = argparse.ArgumentParser(description='Podcast orchestration benchmarks on a mock Ollama server')
+    parser.add_argument('scenarios', nargs='*',
+                        help=f"Scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds before the first token of every response (default: 0)')
+    parser.add_argument('--token-rate', type=float, default=0.0,
+                        help='Generated tokens per second, 0 for instant responses (default: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Share of generation requests answered with HTTP 503 (default: 0)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for error injection (default: 0)')
+    parser.add_argument('--format', choices=['json', 'jsonl', 'markdown', 'pcz'], default='json',
+                        help='Output format the podcasts are saved in (default: json)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Do not trace peak memory (tracing slows Python down)')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+
+    rows = []
+    for name in args.scenarios or list(SCENARIOS):
+        rows.append(run_scenario(
+            name,
+            latency=args.latency,
+            tokens_per_second=args.token_rate,
+            error_rate=args.error_rate,
+            seed=args.seed,
+            output_format=args.format,
+            measure_memory=not args.no_memory
+        ))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = {row['scenario']: row for row in json.load(f)['scenarios']}
+    print(format_results(rows, baseline))
+
+    if args.output:
+        results = {
+            "commit": get_commit(),
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "settings": {
+                "latency": args.latency,
+                "token_rate": args.token_rate,
+                "error_rate": args.error_rate,
+                "seed": args.seed,
+                "format": args.format,
+            },
+            "scenarios": rows,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..models import scripts
+
+SAMPLES = {
+    "hindi": "नमस्ते दोस्तों, आज हम भारत के इतिहास और संस्कृति के बारे में बात करेंगे। ",
+    "english": "Welcome friends, today we talk about the history and culture of India. ",
+    "mixed": "नमस्ते दोस्तों, today हम history और culture के बारे में बात करेंगे। ",
+}
+
+# The legacy re-scan is quadratic in the text length; longer texts would take minutes
+RESCAN_MAX_LENGTH = 1000
+
+
+def legacy_ratio(text: str) -> float:
+    """The original two-pass generator-expression heuristic, for comparison."""
+    hindi_chars = sum(1 for char in text if 'ऀ' <= char <= 'ॿ')
+    total_chars = sum(1 for char in text if not char.isspace())
+    return hindi_chars / total_chars if total_chars else 0.0
+
+
+def translate_ratio(text: str) -> float:
+    """Single-script ratio through the str.translate path."""
+    reduced = text.translate(scripts._TABLE)
+    return reduced.count(scripts._MARKERS["devanagari"]) / len(reduced) if reduced else 0.0
+
+
+def legacy_streamed_ratio(text: str, chunk_size: int = 8) -> float:
+    """Re-checking the whole buffer after every chunk with the legacy loop."""
+    ratio = 0.0
+    for i in range(0, len(text), chunk_size):
+        ratio = legacy_ratio(text[:i + chunk_size])
+    return ratio
+
+
+def streamed_ratio(text: str, chunk_size: int = 8) -> float:
+    """Ratio computed incrementally over chunks, as for a token stream."""
+    counter = scripts.ScriptCounter()
+    for i in range(0, len(text), chunk_size):
+        counter.update(text[i:i + chunk_size])
+    return counter.ratio("devanagari")
+
+
+def get_cases(rescan_max_length: int = RESCAN_MAX_LENGTH) -> List[Tuple[str, Callable[[str], object], Optional[int]]]:
+    """Return the detector variants to measure, with the longest text each is run on (None for any)."""
+    cases = [
+        ("legacy is_hindi loop", legacy_ratio, None),
+        ("str.translate ratio", translate_ratio, None),
+        ("script_counts (all scripts)", scripts.script_counts, None),
+        ("legacy re-scan, 8-char chunks", legacy_streamed_ratio, rescan_max_length),
+        ("ScriptCounter, 8-char chunks", streamed_ratio, None),
+    ]
+    if scripts.np is not None:
+        cases.append(("NumPy counts (all scripts)", scripts._count_numpy, None))
+    return cases
+
+
+def run(lengths: List[int], number: int, rescan_max_length: int = RESCAN_MAX_LENGTH) -> List[Dict[str, object]]:
+    """Time every variant on every sample and length it runs on; return one row per measurement."""
+    rows = []
+    for sample_name, sample in SAMPLES.items():
+        for length in lengths:
+            text = (sample * (length // len(sample) + 1))[:length]
+            for case_name, func, max_length in get_cases(rescan_max_length):
+                if max_length is not None and length > max_length:
+                    continue
+                seconds = timeit.timeit(lambda: func(text), number=number)
+                rows.append({
+                    "sample": sample_name,
+                    "length": length,
+                    "case": case_name,
+                    "usec_per_call": seconds / number * 1e6,
+                })
+    return rows
+
+
+def main():
+    """Run the script detection micro-benchmarks and print the results."""
+    parser = argparse.ArgumentParser(description='Script detection micro-benchmarks')
+    parser.add_argument('--lengths', type=int, nargs='+', default=[80, 800, 8000],
+                        help='Text lengths in characters (default: 80 800 8000)')
+    parser.add_argument('--number', type=int, default=200,
+                        help='Calls per measurement (default: 200)')
+    parser.add_argument('--rescan-max-length', type=int, default=RESCAN_MAX_LENGTH,
+                        help='Longest text the quadratic legacy re-scan is timed on '
+                             f'(default: {RESCAN_MAX_LENGTH})')
+    args = parser.parse_args()
+
+    print(f"{'sample':<8} {'length':>7}  {'case':<30} {'usec/call':>10}")
+    for row in run(args.lengths, args.number, args.rescan_max_length):
+        print(f"{row['sample']:<8} {row['length']:>7}  {row['case']:<30} {row['usec_per_call']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
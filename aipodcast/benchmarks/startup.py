@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List, Optional
+
+from .podcast import percentile, get_commit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MAIN = os.path.join(PROJECT_ROOT, "main.py")
+DEFAULT_CONFIG = os.path.join(PROJECT_ROOT, "aipodcast", "config", "default_config.yaml")
+
+# Modules whose import dominates start-up; reported when an entry point loads them
+HEAVY_MODULES = ("requests", "yaml", "numpy", "sqlite3")
+
+
+def entry_points(tmp_dir: str) -> Dict[str, List[str]]:
+    """Return the command line of every measured entry point; outputs go to tmp_dir."""
+    return {
+        "help": [MAIN, "--help"],
+        "validate": [MAIN, "validate", DEFAULT_CONFIG],
+        "dry-run": [MAIN, "--dry-run", "--config", DEFAULT_CONFIG, "--output", os.path.join(tmp_dir, "dry.json")],
+        "search": [MAIN, "--index-db", os.path.join(tmp_dir, "archive.sqlite"), "search", "benchmark"],
+        # The modules a podcast run imports, for reference
+        "generate-imports": ["-c", "import aipodcast.cli.runner"],
+    }
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Return the cumulative import time in microseconds of every top-level import in -X importtime output."""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented below the import that caused them
+        if name.startswith(" ") and not name.startswith("  "):
+            imports[name.strip()] = imports.get(name.strip(), 0) + int(cumulative)
+    return imports
+
+
+def loaded_modules(stderr: str) -> List[str]:
+    """Return the heavy modules imported anywhere in -X importtime output."""
+    names = {line.split("|")[-1].strip() for line in stderr.splitlines() if line.startswith("import time:")}
+    return [module for module in HEAVY_MODULES if module in names]
+
+
+def run_entry_point(name: str, command: List[str], runs: int) -> Dict[str, Any]:
+    """Start an entry point runs times in a fresh interpreter and return its start-up timings."""
+    wall_times, import_times, package_times = [], [], []
+    heavy: List[str] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", *command],
+            capture_output=True, text=True, cwd=PROJECT_ROOT
+        )
+        wall_times.append(time.perf_counter() - start)
+        if process.returncode != 0:
+            raise RuntimeError(f"Entry point '{name}' failed: {process.stdout[-500:]}")
+
+        imports = parse_importtime(process.stderr)
+        # site and the encodings are imported by every interpreter, before the program runs
+        import_times.append(sum(us for module, us in imports.items() if module not in ("site", "encodings")))
+        package_times.append(sum(us for module, us in imports.items() if module.startswith("aipodcast")))
+        heavy = loaded_modules(process.stderr)
+
+    return {
+        "entry_point": name,
+        "runs": runs,
+        "wall_p50_ms": percentile(wall_times, 50) * 1000,
+        "import_p50_ms": percentile(import_times, 50) / 1000,
+        "package_import_p50_ms": percentile(package_times, 50) / 1000,
+        "heavy_modules": heavy,
+    }
+
+
+def format_results(rows: List[Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """Format result rows as a table, with the wall time change against a baseline run if given."""
+    header = f"{'entry point':<17} {'wall ms':>8} {'imports ms':>11} {'aipodcast ms':>13}  heavy modules"
+    if baseline:
+        header += "  (wall vs base)"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        line = (f"{row['entry_point']:<17} {row['wall_p50_ms']:>8.1f} {row['import_p50_ms']:>11.1f} "
+                f"{row['package_import_p50_ms']:>13.1f}  {', '.join(row['heavy_modules']) or '-'}")
+        base = (baseline or {}).get(row['entry_point'])
+        if base and base.get('wall_p50_ms'):
+            change = (row['wall_p50_ms'] - base['wall_p50_ms']) / base['wall_p50_ms'] * 100
+            line += f"  ({change:+.1f}%)"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    """Measure the cold start-up time of the CLI entry points."""
+    parser = argparse.ArgumentParser(description='Start-up time of the CLI entry points, from python -X importtime')
+    parser.add_argument('entry_points', nargs='*',
+                        help='Entry points to measure: help, validate, dry-run, search, generate-imports '
+                             '(default: all)')
+    parser.add_argument('--runs', type=int, default=5, help='Interpreter starts per entry point (default: 5)')
+    parser.add_argument('--budget', type=float,
+                        help='Fail if an entry point other than generate-imports spends more than this many '
+                             'milliseconds importing the aipodcast package, or imports requests')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        commands = entry_points(tmp_dir)
+        for name in args.entry_points:
+            if name not in commands:
+                parser.error(f"unknown entry point '{name}' (choose from {', '.join(commands)})")
+        rows = [run_entry_point(name, commands[name], args.runs) for name in args.entry_points or list(commands)]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = {row['entry_point']: row for row in json.load(f)['entry_points']}
+    print(format_results(rows, baseline))
+
+    if args.output:
+        results = {
+            "commit": get_commit(),
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "runs": args.runs,
+            "entry_points": rows,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+    if args.budget is not None:
+        over = [
+            row['entry_point'] for row in rows
+            if row['entry_point'] != "generate-imports"
+            and (row['package_import_p50_ms'] > args.budget or "requests" in row['heavy_modules'])
+        ]
+        if over:
+            print(f"Over the {args.budget:g} ms start-up budget: {', '.join(over)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
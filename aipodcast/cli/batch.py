@@ -0,0 +1,156 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional, Set
+
+from ..config import ConfigManager
+from ..models import OllamaClient, OllamaTransport, ModelPreloader, ModelRouter
+from .runner import PodcastRunner, resolve_output_path, create_client
+
+
+class BatchRunner:
+    """Runs the podcasts for many configs concurrently on a shared transport."""
+
+    def __init__(self,
+                config_paths: List[str],
+                transport: OllamaTransport,
+                max_parallel: int = 4,
+                configure: Optional[Callable[[Dict[str, Any]], None]] = None,
+                resume: bool = False):
+        """
+        Initialize the batch runner.
+        max_parallel should match the number of parallel slots of the Ollama
+        server (OLLAMA_NUM_PARALLEL); configure is applied to every podcast config.
+        With resume, podcasts interrupted in an earlier batch continue from their journals.
+        """
+        self.config_paths = config_paths
+        self.transport = transport
+        self.max_parallel = max(1, max_parallel)
+        self.configure = configure
+        self.resume = resume
+        self.preloaded: Set[str] = set()
+        self._claimed_outputs = set()
+        self._lock = threading.Lock()
+
+    def _claim_output_path(self, podcast_config: Dict[str, Any], name: str) -> str:
+        """Resolve the output path of a job, making sure no two jobs share one."""
+        output_path = resolve_output_path(podcast_config, default_name=f"podcast_{name}")
+        with self._lock:
+            if output_path in self._claimed_outputs:
+                podcast_config['output_file'] = f"podcast_{name}.{podcast_config['output_format']}"
+                output_path = resolve_output_path(podcast_config)
+                print(f"[{name}] Output file already used by another config, writing to {output_path}")
+            self._claimed_outputs.add(output_path)
+        return output_path
+
+    def get_models(self) -> List[str]:
+        """Return the distinct models used by the configs, skipping invalid ones."""
+        models = []
+        for config_path in self.config_paths:
+            try:
+                podcast_config = ConfigManager(config_path).get_config()['podcast_config']
+            except Exception:
+                continue
+            if self.configure:
+                self.configure(podcast_config)
+            models.append(podcast_config['ollama_model'])
+        return list(dict.fromkeys(models))
+
+    def preload(self, podcast_config: Dict[str, Any], keep_alive: Optional[str] = None) -> List[str]:
+        """
+        Start loading the models of a config that are not loaded yet and
+        return the ones the server does not have; nothing is loaded if one is
+        missing. Raises OllamaError if the server cannot be reached.
+        """
+        router = ModelRouter(
+            OllamaClient(base_url=self.transport.base_url, model=podcast_config['ollama_model'],
+                         transport=self.transport),
+            podcast_config.get('model_routes')
+        )
+        with self._lock:
+            models = [model for model in router.models() if model not in self.preloaded]
+        if not models:
+            return []
+
+        preloader = ModelPreloader(OllamaClient(base_url=self.transport.base_url, transport=self.transport),
+                                   keep_alive=keep_alive)
+        missing = preloader.check(models)
+        if missing:
+            return missing
+
+        # Jobs do not wait for the load; a request for a loading model waits on the server
+        preloader.start(models)
+        with self._lock:
+            self.preloaded.update(models)
+        return []
+
+    def run_job(self, config_path: str) -> Dict[str, Any]:
+        """Generate the podcast for one config file and return its summary row."""
+        name = os.path.splitext(os.path.basename(config_path))[0]
+        start = time.perf_counter()
+
+        try:
+            podcast_config = ConfigManager(config_path).get_config()['podcast_config']
+            if self.configure:
+                self.configure(podcast_config)
+            podcast_config.setdefault('output_format', 'json')
+            self._claim_output_path(podcast_config, name)
+        except Exception as e:
+            return {"config": name, "status": f"failed: {str(e)}", "turns": 0,
+                    "wall_time": time.perf_counter() - start, "output": ""}
+        return self.run_config(name, podcast_config, start)
+
+    def run_config(self,
+                  name: str,
+                  podcast_config: Dict[str, Any],
+                  start: Optional[float] = None,
+                  on_turn: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Generate the podcast for a loaded config whose output path is already
+        resolved and return its summary row. on_turn is called with every
+        finished turn.
+        """
+        result = {"config": name, "status": "ok", "turns": 0, "wall_time": 0.0, "output": ""}
+        if start is None:
+            start = time.perf_counter()
+
+        try:
+            if podcast_config.get('metrics_file'):
+                # One metrics file per podcast, e.g. metrics_history.prom
+                root, ext = os.path.splitext(podcast_config['metrics_file'])
+                podcast_config['metrics_file'] = f"{root}_{name}{ext}"
+
+            runner = PodcastRunner(podcast_config, create_client(podcast_config, self.transport))
+            if on_turn is not None:
+                runner.setup().subscribe_turns(on_turn)
+            result["output"] = runner.run(resume=self.resume)
+            result["turns"] = len(runner.conversation)
+        except Exception as e:
+            result["status"] = f"failed: {str(e)}"
+
+        result["wall_time"] = time.perf_counter() - start
+        return result
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Run every config, at most max_parallel at a time, in input order."""
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            return list(executor.map(self.run_job, self.config_paths))
+
+    @staticmethod
+    def format_summary(results: List[Dict[str, Any]]) -> str:
+        """Format batch results as a plain-text table."""
+        headers = ("Config", "Status", "Turns", "Wall time", "Output")
+        rows = [
+            (r["config"], r["status"], str(r["turns"]), f"{r['wall_time']:.1f}s", r["output"])
+            for r in results
+        ]
+        widths = [max(len(row[i]) for row in rows + [headers]) for i in range(len(headers))]
+
+        lines = [
+            "  ".join(h.ljust(w) for h, w in zip(headers, widths)),
+            "  ".join("-" * w for w in widths)
+        ]
+        for row in rows:
+            lines.append("  ".join(cell.ljust(w) for cell, w in zip(row, widths)))
+        return "\n".join(lines)
@@ -1,15 +1,16 @@
 import argparse
 import os
-import yaml
 import sys
-import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, TYPE_CHECKING
 
-from ..config import ConfigManager
-from ..models import OllamaClient
-from ..agents import HostAgent, GuestAgent
-from ..conversation import ConversationManager
-from ..output import OutputFormatter
+from .paths import resolve_output_path, get_project_root, get_output_dir
+
+if TYPE_CHECKING:
+    from ..models import OllamaClient, ModelPreloader
+    from ..output import TranscriptIndex
+
+# The generation modules (and with them requests) are imported inside the
+# commands that need them, so --help, validate and --dry-run start quickly.
 
 class CLI:
     """Command-line interface for the AI podcast generator."""
@@ -28,7 +29,7 @@ class CLI:
         parser.add_argument('--output', '-o', type=str,
                           help='Output file path for the generated podcast')
         
-        parser.add_argument('--format', '-f', choices=['json', 'markdown'], default='json',
+        parser.add_argument('--format', '-f', choices=['json', 'jsonl', 'markdown', 'pcz'], default='json',
                           help='Output format (default: json)')
         
         parser.add_argument('--host', type=str,
@@ -49,23 +50,94 @@ class CLI:
         parser.add_argument('--model', type=str,
                           help='Ollama model to use')
         
+        parser.add_argument('--no-stream', action='store_true',
+                          help='Wait for each full turn instead of streaming tokens as they arrive')
+        
+        parser.add_argument('--session', action='store_true',
+                          help='Keep a stateful chat per agent so the model reuses its KV cache between turns')
+        
+        parser.add_argument('--no-cache', action='store_true',
+                          help='Bypass the response cache configured in response_cache')
+        
+        parser.add_argument('--metrics-file', type=str,
+                          help='Also write run metrics to this file: Prometheus text for .prom, JSON otherwise')
+        
+        parser.add_argument('--resume', action='store_true',
+                          help='Continue an interrupted run from the turn journal next to its output file')
+        
+        parser.add_argument('--dry-run', action='store_true',
+                          help='Validate the config(s) and show what would be generated, without contacting Ollama')
+        
+        parser.add_argument('--batch', action='store_true',
+                          help='Generate a podcast for every config in the inputs folder')
+        
+        parser.add_argument('--watch', action='store_true',
+                          help='Keep running and generate a podcast whenever a config is added to '
+                               'or changed in the inputs folder')
+        
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                          help='Seconds between scans of the inputs folder in watch mode (default: 2)')
+        
+        parser.add_argument('--max-parallel', type=int, default=4,
+                          help='Maximum podcasts generated at once in batch, watch and serve mode; '
+                               'match it to OLLAMA_NUM_PARALLEL (default: 4)')
+        
+        parser.add_argument('--index-db', type=str,
+                          help='SQLite index of the output folder used by search and turns '
+                               '(default: .cache/archive.sqlite)')
+        
+        commands = parser.add_subparsers(dest='command', metavar='COMMAND',
+                                         help='Run without a command to generate a podcast')
+        
+        search = commands.add_parser('search', help='Search the transcripts in the output folder')
+        search.add_argument('query', nargs='+', help='Words to search for')
+        for field in ('host', 'guest', 'theme', 'tone', 'model', 'language'):
+            search.add_argument(f'--{field}', dest=f'filter_{field}', type=str,
+                              help=f'Only search episodes whose {field} is exactly this')
+        search.add_argument('--limit', type=int, default=10, help='Results per page (default: 10)')
+        search.add_argument('--page', type=int, default=1, help='Page of results to show (default: 1)')
+        search.add_argument('--raw', action='store_true',
+                          help='Pass the query to SQLite FTS5 as is (e.g. prefix* or OR queries)')
+        
+        turns = commands.add_parser('turns', help='Show the turns of an indexed episode')
+        turns.add_argument('episode', help='Episode id from search results, or the file name')
+        turns.add_argument('--offset', type=int, default=0, help='First turn to show (default: 0)')
+        turns.add_argument('--limit', type=int, default=20, help='Turns to show (default: 20)')
+        
+        commands.add_parser('index', help='Update the index of the output folder and report what changed')
+        
+        validate = commands.add_parser('validate',
+                                       help='Check configs without contacting Ollama; exits with 1 if one is invalid')
+        validate.add_argument('configs', nargs='*',
+                            help='Config files to check (default: every config in the inputs folder)')
+        
+        convert = commands.add_parser('convert',
+                                      help='Convert a JSON transcript to a compressed .pcz archive or back')
+        convert.add_argument('input', help='A .json transcript or a .pcz archive')
+        convert.add_argument('--output', '-o', dest='convert_output', type=str,
+                           help='Output path (default: the input path with the other extension)')
+        convert.add_argument('--codec', choices=['zlib', 'lzma'], default='zlib',
+                           help='Compression used for new archives (default: zlib)')
+        convert.add_argument('--block-size', type=int, default=16,
+                           help='Turns per compressed block in new archives (default: 16)')
+        
+        serve = commands.add_parser('serve',
+                                    help='Run an HTTP server that generates podcasts for submitted configs')
+        serve.add_argument('--bind', type=str, default='127.0.0.1',
+                         help='Address to listen on (default: 127.0.0.1)')
+        serve.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+        serve.add_argument('--queue-size', type=int, default=16,
+                         help='Jobs that may wait for a worker before submissions are refused with '
+                              'HTTP 429 (default: 16)')
+        
         return parser
     
     def parse_args(self):
         """Parse command-line arguments."""
         return self.parser.parse_args()
     
-    def run(self):
-        """Run the podcast generator with the provided arguments."""
-        args = self.parse_args()
-        
-        # Load the config
-        config_manager = ConfigManager(args.config)
-        config = config_manager.get_config()
-        
-        # Override config with command-line arguments
-        podcast_config = config['podcast_config']
-        
+    def apply_overrides(self, podcast_config: Dict[str, Any], args) -> None:
+        """Override config values with command-line arguments."""
         if args.host:
             podcast_config['host']['name'] = args.host
             
@@ -87,98 +159,362 @@ class CLI:
         if args.format:
             podcast_config['output_format'] = args.format
             
+        if args.session:
+            podcast_config['session_mode'] = True
+            
+        if args.no_cache:
+            podcast_config.pop('response_cache', None)
+            
+        if args.metrics_file:
+            podcast_config['metrics_file'] = args.metrics_file
+    
+    def run(self):
+        """Run the podcast generator with the provided arguments."""
+        args = self.parse_args()
+        
+        if args.command in ('search', 'turns', 'index'):
+            return self.run_archive(args)
+        
+        if args.command == 'convert':
+            return self.run_convert(args)
+        
+        if args.command == 'serve':
+            return self.run_serve(args)
+        
+        if args.command == 'validate' or args.dry_run:
+            return self.run_validate(args)
+        
+        if args.watch:
+            return self.run_watch(args)
+        
+        if args.batch:
+            return self.run_batch(args)
+        
+        from ..config import ConfigManager
+        from ..models import ModelPreloader
+        from .runner import PodcastRunner, create_client
+        
+        # Load the config
+        config_manager = ConfigManager(args.config)
+        config = config_manager.get_config()
+        
+        # Override config with command-line arguments
+        podcast_config = config['podcast_config']
+        self.apply_overrides(podcast_config, args)
+            
         # Handle output file path
         if args.output:
             podcast_config['output_file'] = args.output
-        elif 'output_file' in podcast_config:
-            # If there's a configured output file in the YAML but no command-line override,
-            # we need to make sure it's an absolute path
-            if not os.path.isabs(podcast_config['output_file']):
-                # Convert to absolute path relative to the output directory
-                root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                project_root = os.path.dirname(root_dir)
-                output_dir = os.path.join(project_root, "output")
-                os.makedirs(output_dir, exist_ok=True)
-                podcast_config['output_file'] = os.path.join(output_dir, podcast_config['output_file'])
+        elif args.resume and not podcast_config.get('output_file'):
+            # The default output file is timestamped, so a new run never finds the old journal
+            self.exit_unresumable(podcast_config['output_format'])
         else:
-            # If no output file specified anywhere, use default with timestamp
-            root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            project_root = os.path.dirname(root_dir)
-            output_dir = os.path.join(project_root, "output")
-            os.makedirs(output_dir, exist_ok=True)
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            podcast_config['output_file'] = os.path.join(output_dir, f"podcast_{timestamp}.{podcast_config['output_format']}")
+            resolve_output_path(podcast_config)
         
         # Initialize the Ollama client
-        ollama_client = OllamaClient(model=podcast_config['ollama_model'])
+        ollama_client = create_client(podcast_config)
+        
+        runner = PodcastRunner(podcast_config, ollama_client, stream=not args.no_stream)
+        
+        # Check that Ollama is running and has the models, then load them in the background
+        preloader = self.start_preload(ollama_client, runner.get_models(), podcast_config.get('keep_alive'))
+        
+        # Agent setup runs while the models load
+        runner.setup()
+        print(ModelPreloader.format_report(preloader.wait()))
+        
+        saved_path = runner.run(resume=args.resume)
+        
+        print("-" * 50)
+        print(f"Podcast generated and saved to: {saved_path}")
+        
+        return saved_path
+    
+    def exit_unresumable(self, output_format: str) -> None:
+        """Explain that --resume needs the interrupted run's output file, suggest the journaled ones, and exit."""
+        print("Error: --resume needs the output file of the interrupted run, but the config sets no output_file.")
+        print("Pass it with --output, or set output_file in the config so later runs can be resumed.")
+        output_dir = get_output_dir()
+        journals = sorted(
+            (name for name in os.listdir(output_dir) if name.endswith('.journal.jsonl')),
+            key=lambda name: os.path.getmtime(os.path.join(output_dir, name)),
+            reverse=True
+        )
+        if journals:
+            print("Interrupted runs in the output folder, newest first:")
+            for name in journals:
+                output_path = os.path.join(output_dir, f"{name[:-len('.journal.jsonl')]}.{output_format}")
+                print(f"  --resume --output {output_path}")
+        sys.exit(1)
+    
+    def run_validate(self, args) -> List[Dict[str, Any]]:
+        """
+        Load and validate configs with the command-line overrides applied and
+        print what each would generate, without importing the network stack.
+        """
+        from ..config import ConfigManager
+        
+        if args.command == 'validate':
+            config_paths = args.configs or ConfigManager.get_input_configs()
+        elif args.batch or args.watch:
+            config_paths = ConfigManager.get_input_configs()
+        else:
+            # The config a normal run would pick
+            config_paths = [None]
+        
+        results = []
+        for config_path in config_paths:
+            name = os.path.basename(config_path or args.config or "") or "config"
+            result = {"config": config_path, "valid": True, "error": "", "output": ""}
+            try:
+                if config_path is None:
+                    config = ConfigManager(args.config).get_config()
+                else:
+                    config = ConfigManager.load_file(config_path)
+                podcast_config = config['podcast_config']
+                self.apply_overrides(podcast_config, args)
+                if args.output and config_path is None:
+                    podcast_config['output_file'] = args.output
+                default_name = None
+                if config_path is not None:
+                    default_name = f"podcast_{os.path.splitext(name)[0]}"
+                result["output"] = resolve_output_path(podcast_config, default_name=default_name)
+            except Exception as e:
+                result.update(valid=False, error=str(e))
+                print(f"INVALID  {name}: {str(e)}")
+            else:
+                models = [podcast_config['ollama_model']]
+                models += [route['model'] for route in podcast_config.get('model_routes', {}).values()
+                           if route.get('model')]
+                print(f"OK       {name}: {podcast_config['host']['name']} with {podcast_config['guest']['name']}, "
+                      f"{podcast_config['total_podcast_duration_minutes']} minutes on "
+                      f"{', '.join(dict.fromkeys(models))} -> {result['output']}")
+            results.append(result)
+        
+        if not results:
+            print("No configs found in the inputs folder.")
+        if any(not result["valid"] for result in results):
+            sys.exit(1)
+        return results
+    
+    def start_preload(self, 
+                     ollama_client: 'OllamaClient', 
+                     models: List[str], 
+                     keep_alive: str = None,
+                     require_all: bool = True) -> 'ModelPreloader':
+        """
+        Verify the server and models without generating anything, then start loading the models.
+        Exits if the server is down, or if a model is missing and require_all is set.
+        """
+        from ..models import ModelPreloader, OllamaError
+        
+        preloader = ModelPreloader(ollama_client, keep_alive=keep_alive)
         
-        # Check if Ollama is running
         try:
             print("Checking connection to Ollama...")
-            test_response = ollama_client.generate("Hello", max_tokens=5)
+            missing = preloader.check(models)
             print("Connected to Ollama successfully!")
-        except Exception as e:
-            print(f"Error: Could not connect to Ollama. Make sure it's running on localhost:11434")
+        except OllamaError as e:
+            print(f"Error: Could not connect to Ollama. Make sure it's running on {ollama_client.base_url}")
             print(f"Error details: {str(e)}")
             sys.exit(1)
+            
+        for model in missing:
+            print(f"Error: Model '{model}' is not available. Pull it with: ollama pull {model}")
+        if missing and require_all:
+            sys.exit(1)
         
-        # Initialize the agents
-        host = HostAgent(
-            name=podcast_config['host']['name'],
-            personality=podcast_config['host']['personality'],
-            ollama_client=ollama_client,
-            language=podcast_config['language']
-        )
+        preloader.start([model for model in models if model not in missing])
+        return preloader
+    
+    def run_batch(self, args):
+        """Generate podcasts for every config in the inputs folder concurrently."""
+        from ..config import ConfigManager
+        from ..models import OllamaClient, OllamaTransport, ModelPreloader
+        from .batch import BatchRunner
+        
+        config_paths = ConfigManager.get_input_configs()
+        if not config_paths:
+            print("No configs found in the inputs folder.")
+            sys.exit(1)
+            
+        if args.output:
+            print("Ignoring --output in batch mode; each config writes its own output file.")
         
-        guest = GuestAgent(
-            name=podcast_config['guest']['name'],
-            personality=podcast_config['guest']['personality'],
-            ollama_client=ollama_client,
-            language=podcast_config['language']
+        transport = OllamaTransport(pool_size=max(10, args.max_parallel))
+        batch_runner = BatchRunner(
+            config_paths,
+            transport,
+            max_parallel=args.max_parallel,
+            resume=args.resume,
+            configure=lambda podcast_config: self.apply_overrides(podcast_config, args)
         )
         
-        # Initialize the conversation manager
-        conversation_manager = ConversationManager(
-            host=host,
-            guest=guest,
-            theme=podcast_config['theme'],
-            tone=podcast_config['tone'],
-            max_tokens_per_response=podcast_config['max_tokens_per_response'],
-            total_podcast_duration_minutes=podcast_config['total_podcast_duration_minutes']
+        # Jobs start right away; a job whose model is still loading waits for it on the server
+        preloader = self.start_preload(
+            OllamaClient(base_url=transport.base_url, transport=transport),
+            batch_runner.get_models(),
+            require_all=False
         )
         
-        # Generate the conversation
-        print(f"Generating podcast between {host.name} and {guest.name}...")
-        print(f"Theme: {podcast_config['theme']}")
-        print(f"Tone: {podcast_config['tone']}")
-        print(f"Duration: {podcast_config['total_podcast_duration_minutes']} minutes")
-        print(f"Model: {podcast_config['ollama_model']}")
+        print(f"Generating {len(config_paths)} podcasts, {batch_runner.max_parallel} at a time...")
+        results = batch_runner.run()
+        preload_results = preloader.wait()
+        transport.close()
+        
         print("-" * 50)
+        print(ModelPreloader.format_report(preload_results))
+        print(BatchRunner.format_summary(results))
         
-        conversation = conversation_manager.start_conversation()
-        
-        # Save the conversation
-        metadata = {
-            "host": podcast_config['host']['name'],
-            "guest": podcast_config['guest']['name'],
-            "theme": podcast_config['theme'],
-            "tone": podcast_config['tone'],
-            "language": podcast_config['language'],
-            "duration": f"{podcast_config['total_podcast_duration_minutes']} minutes",
-            "model": podcast_config['ollama_model']
-        }
+        return results
+    
+    def run_watch(self, args):
+        """Generate podcasts for configs as they land in the inputs folder, until interrupted."""
+        from ..config import ConfigCache
+        from ..models import OllamaClient, OllamaTransport
+        from .batch import BatchRunner
+        from .watch import WatchRunner
+        
+        if args.output:
+            print("Ignoring --output in watch mode; each config writes its own output file.")
         
-        output_path = podcast_config.get('output_file')
-        output_format = podcast_config.get('output_format', 'json')
+        transport = OllamaTransport(pool_size=max(10, args.max_parallel))
+        # Exits if the server is down; models are loaded as configs arrive
+        self.start_preload(OllamaClient(base_url=transport.base_url, transport=transport), [])
         
-        saved_path = OutputFormatter.save_conversation(
-            conversation, 
-            format_type=output_format, 
-            output_path=output_path,
-            metadata=metadata
+        batch_runner = BatchRunner(
+            [],
+            transport,
+            max_parallel=args.max_parallel,
+            resume=args.resume,
+            configure=lambda podcast_config: self.apply_overrides(podcast_config, args)
         )
+        watch_runner = WatchRunner(
+            batch_runner,
+            ConfigCache(),
+            os.path.join(get_project_root(), '.cache', 'watch_state.json'),
+            interval=args.poll_interval
+        )
+        results = watch_runner.run()
+        transport.close()
+        
+        if results:
+            print("-" * 50)
+            print(BatchRunner.format_summary(results))
+        
+        return results
+    
+    def run_serve(self, args):
+        """Generate podcasts for configs submitted over HTTP, until interrupted."""
+        from ..models import OllamaClient, OllamaTransport
+        from .batch import BatchRunner
+        from .server import PodcastServer
+        
+        transport = OllamaTransport(pool_size=max(10, args.max_parallel))
+        # Exits if the server is down; models are loaded as configs are submitted
+        self.start_preload(OllamaClient(base_url=transport.base_url, transport=transport), [])
+        
+        # Submitted configs are generated as they are; command-line overrides do not apply
+        batch_runner = BatchRunner([], transport, max_parallel=args.max_parallel)
+        server = PodcastServer(batch_runner, host=args.bind, port=args.port, queue_size=args.queue_size)
+        results = server.run()
+        transport.close()
+        
+        if results:
+            print("-" * 50)
+            print(BatchRunner.format_summary(results))
+        
+        return results
+    
+    def open_index(self, args) -> 'TranscriptIndex':
+        """Open the transcript index and bring it up to date with the output folder."""
+        from ..output import TranscriptIndex
+        
+        db_path = args.index_db or os.path.join(get_project_root(), '.cache', 'archive.sqlite')
+        index = TranscriptIndex(db_path)
+        stats = index.update(get_output_dir())
+        if args.command == 'index' or stats['added'] or stats['updated'] or stats['removed']:
+            print(f"Indexed {get_output_dir()}: {stats['added']} added, {stats['updated']} updated, "
+                  f"{stats['removed']} removed, {stats['unchanged']} unchanged, {stats['failed']} failed")
+        return index
+    
+    def run_archive(self, args):
+        """Run the search, turns or index command against the transcript index."""
+        index = self.open_index(args)
+        try:
+            if args.command == 'search':
+                return self.run_search(index, args)
+            if args.command == 'turns':
+                return self.run_turns(index, args)
+        finally:
+            index.close()
+    
+    def run_search(self, index: 'TranscriptIndex', args) -> List[Dict[str, Any]]:
+        """Print one page of search results."""
+        import sqlite3
+        from ..output.index import METADATA_FIELDS, quote_query
+        
+        query = " ".join(args.query)
+        filters = {
+            field: getattr(args, f'filter_{field}')
+            for field in METADATA_FIELDS if getattr(args, f'filter_{field}')
+        }
+        
+        try:
+            results = index.search(
+                query if args.raw else quote_query(query),
+                filters,
+                limit=args.limit,
+                offset=(max(args.page, 1) - 1) * args.limit
+            )
+        except sqlite3.OperationalError as e:
+            print(f"Error: Invalid search query: {str(e)}")
+            sys.exit(1)
+        
+        if not results:
+            print("No matches.")
+        for result in results:
+            name = os.path.basename(result['path'])
+            if result['turn'] < 0:
+                print(f"[{result['episode_id']}] {name} (metadata): {result['snippet']}")
+            else:
+                print(f"[{result['episode_id']}] {name} turn {result['turn']} - {result['speaker']}: {result['snippet']}")
+        return results
+    
+    def run_turns(self, index: 'TranscriptIndex', args) -> List[Dict[str, Any]]:
+        """Print a page of an episode's turns."""
+        episode = index.get_episode(args.episode)
+        if episode is None:
+            print(f"Error: No indexed episode matches '{args.episode}'")
+            sys.exit(1)
         
+        turns = index.get_turns(episode['id'], offset=args.offset, limit=args.limit)
+        print(f"{os.path.basename(episode['path'])}: {episode['host']} with {episode['guest']} "
+              f"on {episode['theme']} ({episode['model']})")
+        print(f"Turns {args.offset}-{args.offset + len(turns) - 1} of {episode['turns']}")
         print("-" * 50)
-        print(f"Podcast generated and saved to: {saved_path}")
+        for turn in turns:
+            print(f"{turn['turn']}. {turn['speaker']}: {turn['text']}\n")
+        return turns
+    
+    def run_convert(self, args) -> str:
+        """Convert between JSON transcripts and compressed archives."""
+        from ..output import json_to_archive, archive_to_json
+        
+        if not os.path.exists(args.input):
+            print(f"Error: {args.input} does not exist")
+            sys.exit(1)
+        
+        try:
+            if args.input.endswith('.pcz'):
+                saved_path = archive_to_json(args.input, args.convert_output)
+            else:
+                saved_path = json_to_archive(args.input, args.convert_output,
+                                             codec=args.codec, block_size=args.block_size)
+        except ValueError as e:
+            print(f"Error: Could not convert {args.input}: {str(e)}")
+            sys.exit(1)
         
+        print(f"Converted {args.input} ({os.path.getsize(args.input):,} bytes) "
+              f"to {saved_path} ({os.path.getsize(saved_path):,} bytes)")
         return saved_path
@@ -0,0 +1,38 @@
+import os
+import datetime
+from typing import Dict, Any
+
+
+def get_project_root() -> str:
+    """Return the project root directory (2 levels up from the package)."""
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.dirname(root_dir)
+
+
+def get_output_dir() -> str:
+    """Return the output directory at the project root, creating it if needed."""
+    output_dir = os.path.join(get_project_root(), "output")
+    os.makedirs(output_dir, exist_ok=True)
+    return output_dir
+
+
+def resolve_output_path(podcast_config: Dict[str, Any], default_name: str = None) -> str:
+    """
+    Make podcast_config['output_file'] an absolute path and return it.
+    Relative paths are placed in the output directory. Without a configured
+    file, default_name (or a timestamp) is used.
+    """
+    output_file = podcast_config.get('output_file')
+
+    if output_file:
+        # A configured output file is relative to the output directory
+        if not os.path.isabs(output_file):
+            output_file = os.path.join(get_output_dir(), output_file)
+    else:
+        # If no output file specified anywhere, use default with timestamp
+        if default_name is None:
+            default_name = f"podcast_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        output_file = os.path.join(get_output_dir(), f"{default_name}.{podcast_config['output_format']}")
+
+    podcast_config['output_file'] = output_file
+    return output_file
@@ -0,0 +1,263 @@
+import os
+from typing import Dict, Any, List, Optional
+
+from ..models import (
+    OllamaClient, OllamaTransport, ResponseCache, SentenceTranslator, ModelRouter,
+    MetricsRecorder, write_metrics_file
+)
+from ..agents import HostAgent, GuestAgent, ConversationMemory, TurnRetriever, RepetitionDetector
+from ..conversation import ConversationManager, TurnJournal
+from ..output import OutputFormatter
+from .paths import get_project_root, get_output_dir, resolve_output_path
+
+
+def create_cache(podcast_config: Dict[str, Any]) -> Optional[ResponseCache]:
+    """Create the response cache described by podcast_config['response_cache'], if any."""
+    cache_config = podcast_config.get('response_cache')
+    if not cache_config or not cache_config.get('enabled', True):
+        return None
+        
+    cache_dir = cache_config.get('directory', os.path.join('.cache', 'responses'))
+    if not os.path.isabs(cache_dir):
+        cache_dir = os.path.join(get_project_root(), cache_dir)
+        
+    return ResponseCache(
+        cache_dir,
+        max_size_mb=cache_config.get('max_size_mb', 256),
+        max_age_days=cache_config.get('max_age_days', 30)
+    )
+
+
+def create_client(podcast_config: Dict[str, Any], 
+                  transport: Optional[OllamaTransport] = None) -> OllamaClient:
+    """Create the Ollama client for a podcast config, optionally on a shared transport."""
+    client_args = {}
+    if transport is not None:
+        client_args = {"base_url": transport.base_url, "transport": transport}
+        
+    return OllamaClient(
+        model=podcast_config['ollama_model'],
+        options=podcast_config.get('generation_options'),
+        cache=create_cache(podcast_config),
+        keep_alive=podcast_config.get('keep_alive'),
+        metrics=MetricsRecorder(),
+        **client_args
+    )
+
+
+class PodcastRunner:
+    """Builds the agents for one podcast config, runs the conversation and saves it."""
+
+    def __init__(self,
+                podcast_config: Dict[str, Any],
+                ollama_client: OllamaClient,
+                stream: bool = False):
+        """Initialize the runner with a validated podcast config."""
+        self.podcast_config = podcast_config
+        self.ollama_client = ollama_client
+        self.stream = stream
+        self.conversation: List[Dict[str, Any]] = []
+        self.stats: Dict[str, Any] = {}
+        self.conversation_manager: Optional[ConversationManager] = None
+        self.router = ModelRouter(ollama_client, podcast_config.get('model_routes'))
+
+    def get_metadata(self) -> Dict[str, Any]:
+        """Build the output metadata for this podcast."""
+        podcast_config = self.podcast_config
+        metadata = {
+            "host": podcast_config['host']['name'],
+            "guest": podcast_config['guest']['name'],
+            "theme": podcast_config['theme'],
+            "tone": podcast_config['tone'],
+            "language": podcast_config['language'],
+            "duration": f"{podcast_config['total_podcast_duration_minutes']} minutes",
+            "model": podcast_config['ollama_model'],
+            **self.stats
+        }
+        if self.ollama_client.metrics is not None:
+            metadata["performance"] = self.ollama_client.metrics.summary()
+        if podcast_config.get('model_routes'):
+            metadata["model_routes"] = self.router.describe()
+        return metadata
+
+    def get_models(self) -> List[str]:
+        """Return the models this podcast needs loaded."""
+        return self.router.models()
+
+    def setup(self) -> ConversationManager:
+        """Create the agents and the conversation manager."""
+        podcast_config = self.podcast_config
+
+        # Host and guest share one translator, so its sentence counts cover the whole podcast
+        translator = SentenceTranslator(self.router.client("translation"))
+        
+        # Both agents see the same history, so they share one memory and its summary
+        memory_config = podcast_config.get('memory', {})
+        
+        # Older turns relevant to the latest one are recalled with the "embedding" route's model
+        retriever = None
+        retrieval_config = memory_config.get('retrieval')
+        if retrieval_config:
+            retrieval_config = retrieval_config if isinstance(retrieval_config, dict) else {}
+            retriever = TurnRetriever(
+                self.router.client("embedding"),
+                language=podcast_config['language'],
+                top_k=retrieval_config.get('top_k', 3),
+                max_tokens=retrieval_config.get('tokens', 300),
+                min_similarity=retrieval_config.get('min_similarity', 0.3)
+            )
+        
+        memory = ConversationMemory(
+            self.router.client("summary"),
+            language=podcast_config['language'],
+            history_tokens=memory_config.get('history_tokens', 800),
+            summary_every=memory_config.get('summary_every', 4),
+            summary_tokens=memory_config.get('summary_tokens', 200),
+            retriever=retriever
+        )
+        
+        # Looping responses are cut off while they stream
+        repetition_config = podcast_config.get('repetition', {})
+        repetition_detector = RepetitionDetector(
+            ngram_size=repetition_config.get('ngram_size', 6),
+            max_ngram_repeats=repetition_config.get('max_ngram_repeats', 2),
+            check_history=repetition_config.get('check_history', True),
+            duplicate_threshold=repetition_config.get('duplicate_threshold', 0.6)
+        )
+        
+        # Initialize the agents
+        host = HostAgent(
+            name=podcast_config['host']['name'],
+            personality=podcast_config['host']['personality'],
+            ollama_client=self.router.client("host"),
+            language=podcast_config['language'],
+            use_session=podcast_config.get('session_mode', False),
+            translator=translator,
+            memory=memory,
+            repetition_detector=repetition_detector
+        )
+
+        guest = GuestAgent(
+            name=podcast_config['guest']['name'],
+            personality=podcast_config['guest']['personality'],
+            ollama_client=self.router.client("guest"),
+            language=podcast_config['language'],
+            use_session=podcast_config.get('session_mode', False),
+            translator=translator,
+            memory=memory,
+            repetition_detector=repetition_detector
+        )
+
+        # Initialize the conversation manager
+        self.conversation_manager = ConversationManager(
+            host=host,
+            guest=guest,
+            theme=podcast_config['theme'],
+            tone=podcast_config['tone'],
+            max_tokens_per_response=podcast_config['max_tokens_per_response'],
+            total_podcast_duration_minutes=podcast_config['total_podcast_duration_minutes'],
+            stream=self.stream,
+            closing_client=self.router.client("closing"),
+            metrics=self.ollama_client.metrics,
+            max_parallel=podcast_config.get('parallel_requests', 1),
+            adaptive_duration=podcast_config.get('duration_control', 'fixed') == 'adaptive'
+        )
+        return self.conversation_manager
+
+    def open_journal(self, resume: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """
+        Start the turn journal next to the output file and return the history
+        to resume from, if resume is set and an interrupted run left a journal.
+        """
+        journal = TurnJournal(TurnJournal.path_for(self.podcast_config['output_file']))
+        self.conversation_manager.journal = journal
+        
+        if resume and journal.exists():
+            history = journal.resume(self.podcast_config)
+            print(f"Resuming from {journal.path} ({len(history)} turns already generated)")
+            return history
+        
+        if resume:
+            print(f"No journal found at {journal.path}; starting a new podcast.")
+        elif journal.exists():
+            print(f"Replacing the journal of an interrupted run at {journal.path} (use --resume to continue it)")
+        journal.start(self.podcast_config)
+        return None
+    
+    def run(self, resume: bool = False) -> str:
+        """
+        Generate the podcast and return the path it was saved to.
+        Every finished turn is journaled next to the output file and written
+        to a live "<output>.part" file; with resume, a run interrupted before
+        saving continues from its journal.
+        """
+        podcast_config = self.podcast_config
+        conversation_manager = self.conversation_manager or self.setup()
+        host, guest = conversation_manager.host, conversation_manager.guest
+        if not podcast_config.get('output_file'):
+            resolve_output_path(podcast_config)
+        
+        resume_history = None
+        if podcast_config.get('journal', True):
+            resume_history = self.open_journal(resume)
+            
+        # Turns are written out as they finish, so the output can be followed live
+        writer_config = podcast_config.get('output_writer', {})
+        writer = OutputFormatter.create_writer(
+            podcast_config.get('output_format', 'json'),
+            podcast_config['output_file'],
+            metadata=self.get_metadata(),
+            flush_every=writer_config.get('flush_every', 1),
+            fsync=writer_config.get('fsync', False),
+            codec=writer_config.get('codec', 'zlib'),
+            block_size=writer_config.get('block_size', 16)
+        )
+        for entry in resume_history or []:
+            writer.write_turn(entry)
+        conversation_manager.subscribe_turns(writer.write_turn)
+
+        # Generate the conversation
+        print(f"Generating podcast between {host.name} and {guest.name}...")
+        print(f"Theme: {podcast_config['theme']}")
+        print(f"Tone: {podcast_config['tone']}")
+        print(f"Duration: {podcast_config['total_podcast_duration_minutes']} minutes")
+        print(f"Model: {podcast_config['ollama_model']}")
+        print("-" * 50)
+
+        try:
+            self.conversation = conversation_manager.start_conversation(resume_history)
+        except BaseException:
+            writer.close()
+            raise
+        finally:
+            if conversation_manager.journal is not None:
+                conversation_manager.journal.close()
+        self.stats["language_enforcement"] = conversation_manager.get_language_stats()
+        if conversation_manager.duration_controller is not None:
+            self.stats["spoken_duration"] = conversation_manager.duration_controller.summary()
+
+        # Save the conversation with the final metadata
+        metadata = self.get_metadata()
+        saved_path = writer.finalize(metadata)
+        
+        if podcast_config.get('metrics_file') and "performance" in metadata:
+            self.save_metrics(metadata["performance"], saved_path)
+            
+        # The podcast is safely saved, so the journal is no longer needed
+        if conversation_manager.journal is not None:
+            conversation_manager.journal.remove()
+        return saved_path
+    
+    def save_metrics(self, summary: Dict[str, Any], saved_path: str) -> str:
+        """Write the run metrics to podcast_config['metrics_file'] (relative to the output directory)."""
+        metrics_path = self.podcast_config['metrics_file']
+        if not os.path.isabs(metrics_path):
+            metrics_path = os.path.join(get_output_dir(), metrics_path)
+            
+        labels = {
+            "podcast": os.path.splitext(os.path.basename(saved_path))[0],
+            "model": self.podcast_config['ollama_model']
+        }
+        write_metrics_file(metrics_path, summary, labels)
+        print(f"Metrics saved to: {metrics_path}")
+        return metrics_path
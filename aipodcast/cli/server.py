@@ -0,0 +1,504 @@
+import datetime
+import itertools
+import json
+import os
+import queue
+import re
+import signal
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit, parse_qs
+
+import yaml
+
+from ..config import ConfigManager
+from ..models import OllamaError
+from ..output.writers import WRITERS
+from .batch import BatchRunner
+from .paths import resolve_output_path
+
+# Largest config accepted in a request body
+MAX_BODY_BYTES = 1 << 20
+
+# Content type of a finished transcript per output format
+CONTENT_TYPES = {
+    "json": "application/json",
+    "jsonl": "application/x-ndjson",
+    "markdown": "text/markdown; charset=utf-8",
+    "pcz": "application/octet-stream",
+}
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while queue_size jobs are already waiting."""
+
+
+class Job:
+    """A podcast submitted to the server and its progress."""
+
+    FINISHED = ("done", "failed", "cancelled")
+
+    def __init__(self, job_id: str, name: str, podcast_config: Dict[str, Any], priority: int = 0):
+        """Initialize a queued job."""
+        self.id = job_id
+        self.name = name
+        self.podcast_config = podcast_config
+        self.priority = priority
+        self.status = "queued"
+        self.error = ""
+        self.turns: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Notified whenever a turn is added or the status changes
+        self.changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        """True once the job will not change any more."""
+        return self.status in self.FINISHED
+
+    def start(self) -> bool:
+        """Mark the job running; returns False if it was cancelled while queued."""
+        with self.changed:
+            if self.status != "queued":
+                return False
+            self.status = "running"
+            self.started_at = time.time()
+            self.changed.notify_all()
+            return True
+
+    def add_turn(self, entry: Dict[str, Any]) -> None:
+        """Record a finished turn (a turn listener of the job's conversation)."""
+        with self.changed:
+            self.turns.append(entry)
+            self.changed.notify_all()
+
+    def finish(self, status: str, error: str = "", result: Optional[Dict[str, Any]] = None) -> None:
+        """Mark the job finished with status "done", "failed" or "cancelled"."""
+        with self.changed:
+            self.status = status
+            self.error = error
+            self.result = result
+            self.finished_at = time.time()
+            self.changed.notify_all()
+
+    def describe(self) -> Dict[str, Any]:
+        """Return the job's status as sent to clients."""
+        def timestamp(value: Optional[float]) -> Optional[str]:
+            return datetime.datetime.fromtimestamp(value).isoformat(timespec='seconds') if value else None
+
+        with self.changed:
+            return {
+                "id": self.id,
+                "name": self.name,
+                "status": self.status,
+                "priority": self.priority,
+                "turns": len(self.turns),
+                "submitted_at": timestamp(self.submitted_at),
+                "started_at": timestamp(self.started_at),
+                "finished_at": timestamp(self.finished_at),
+                "wall_time": round(self.result["wall_time"], 2) if self.result else None,
+                "output": self.result["output"] if self.result else "",
+                "error": self.error,
+            }
+
+
+class PodcastServer:
+    """
+    HTTP server that generates podcasts for submitted configs.
+    Configs are validated when they are submitted and wait in a bounded
+    priority queue; once it is full, submissions are refused with HTTP 429
+    so clients back off instead of piling work onto Ollama. max_parallel
+    workers of the batch runner generate the jobs on its shared transport,
+    and models are preloaded and kept loaded between jobs.
+    """
+
+    # How long models stay loaded between podcasts unless a config sets keep_alive
+    DEFAULT_KEEP_ALIVE = "30m"
+
+    def __init__(self,
+                batch_runner: BatchRunner,
+                host: str = "127.0.0.1",
+                port: int = 8080,
+                queue_size: int = 16,
+                keep_jobs: int = 100):
+        """
+        Initialize the server.
+        At most queue_size jobs wait for a worker; the status of the last
+        keep_jobs finished jobs is kept.
+        """
+        self.batch_runner = batch_runner
+        self.address = (host, port)
+        self.queue_size = max(1, queue_size)
+        self.keep_jobs = keep_jobs
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.results: List[Dict[str, Any]] = []
+        # Higher priority first, then in the order submitted; cancelled jobs stay
+        # in it until a worker skips them, so it is not what queue_size limits
+        self._queue: "queue.PriorityQueue[tuple]" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    def submit(self, config: Any, name: Optional[str] = None, priority: int = 0) -> Job:
+        """
+        Validate a config and queue its podcast.
+        Raises ValueError for an invalid config or a missing model,
+        QueueFullError when queue_size jobs are already waiting, OllamaError if Ollama cannot be reached and
+        RuntimeError once the server is stopping.
+        """
+        ConfigManager._validate_config(config)
+        podcast_config = config['podcast_config']
+        output_format = podcast_config.setdefault('output_format', 'json')
+        if not isinstance(output_format, str) or output_format not in WRITERS:
+            raise ValueError(f"Invalid output_format. Must be one of: {', '.join(WRITERS)}")
+        podcast_config.setdefault('keep_alive', self.DEFAULT_KEEP_ALIVE)
+
+        job_id = uuid.uuid4().hex[:12]
+        # Every job writes to its own file in the output folder, whatever the config asks for
+        podcast_config['output_file'] = f"podcast_{job_id}.{output_format}"
+        resolve_output_path(podcast_config)
+        if podcast_config.get('metrics_file'):
+            if not isinstance(podcast_config['metrics_file'], str):
+                raise ValueError("Invalid metrics_file. Must be a file name.")
+            podcast_config['metrics_file'] = os.path.basename(podcast_config['metrics_file'])
+        cache_config = podcast_config.get('response_cache')
+        if cache_config:
+            if not isinstance(cache_config, dict):
+                raise ValueError("Invalid response_cache. Must be a mapping of cache settings.")
+            # The cache evicts files from its directory, so jobs always use the server's own
+            cache_config.pop('directory', None)
+
+        # Refuse before asking Ollama for anything, so a full queue costs the server nothing
+        with self._lock:
+            self._check_accepting()
+        missing = self.batch_runner.preload(podcast_config, podcast_config['keep_alive'])
+        if missing:
+            raise ValueError(f"Model(s) not available on the Ollama server: {', '.join(missing)}")
+
+        # The name labels log lines and metrics files, so it is kept to safe characters
+        job = Job(job_id, re.sub(r'[^\w.-]+', '_', name) if name else job_id, podcast_config, priority)
+        with self._lock:
+            # Other jobs may have filled the queue while the models were loading
+            self._check_accepting()
+            self._queue.put((-priority, next(self._sequence), job))
+            self.jobs[job_id] = job
+            self._forget_finished()
+        print(f"[{job.name}] Queued as {job_id} (priority {priority})")
+        return job
+
+    def _check_accepting(self) -> None:
+        """Raise unless a job can be queued now (called with the lock held)."""
+        if self._stop.is_set():
+            raise RuntimeError("Server is shutting down")
+        # Only jobs still waiting count; cancelled and started ones have left the queue
+        if sum(1 for queued in self.jobs.values() if queued.status == "queued") >= self.queue_size:
+            raise QueueFullError(f"Queue is full ({self.queue_size} jobs waiting); try again later")
+
+    def _forget_finished(self) -> None:
+        """Drop the oldest finished jobs beyond keep_jobs (called with the lock held)."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.keep_jobs)]:
+            del self.jobs[job_id]
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, if it is still known."""
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        """Return the known jobs in the order submitted."""
+        with self._lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued job; running and finished jobs are left alone."""
+        job = self.get_job(job_id)
+        if job is not None:
+            with job.changed:
+                if job.status == "queued":
+                    job.finish("cancelled")
+        return job
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return the queue and worker counts."""
+        with self._lock:
+            statuses = [job.status for job in self.jobs.values()]
+        return {
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running"),
+            "workers": self.batch_runner.max_parallel,
+            "queue_size": self.queue_size,
+        }
+
+    def work(self) -> None:
+        """Worker thread: generate queued podcasts until stopped."""
+        while True:
+            job = self._queue.get()[2]
+            if job is None:
+                return
+            if not job.start():
+                continue
+
+            print(f"[{job.name}] Generating {job.podcast_config['output_file']}")
+            result = self.batch_runner.run_config(job.name, job.podcast_config, on_turn=job.add_turn)
+            print(f"[{job.name}] {result['status']} ({result['turns']} turns, {result['wall_time']:.1f}s)")
+
+            if result["status"] == "ok":
+                job.finish("done", result=result)
+            else:
+                job.finish("failed", error=result["status"][len("failed: "):], result=result)
+            with self._lock:
+                self.results.append(result)
+
+    def stop(self) -> None:
+        """Stop accepting jobs; running ones finish and queued ones are cancelled."""
+        self._stop.set()
+        if self._httpd is not None:
+            # shutdown() waits for serve_forever(), so it cannot run on the serving thread
+            threading.Thread(target=self._httpd.shutdown, daemon=True).start()
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Serve until interrupted and return the results of every podcast generated."""
+        workers = [
+            threading.Thread(target=self.work, daemon=True)
+            for _ in range(self.batch_runner.max_parallel)
+        ]
+        for worker in workers:
+            worker.start()
+
+        self._httpd = _Server(self.address, _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.podcast_server = self
+
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(signal.SIGTERM, lambda *_: self.stop())
+
+        host, port = self._httpd.server_address[:2]
+        print(f"Serving on http://{host}:{port} with {len(workers)} workers "
+              f"and room for {self.queue_size} queued jobs (Ctrl-C to stop)...")
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._stop.set()
+            self._httpd.server_close()
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
+
+        # Queued jobs are cancelled; running ones finish
+        while True:
+            try:
+                job = self._queue.get_nowait()[2]
+            except queue.Empty:
+                break
+            self.cancel(job.id)
+        running = self.get_stats()["running"]
+        if running > 0:
+            print(f"Stopping: waiting for {running} podcasts to finish (Ctrl-C again to abort)...")
+        for _ in workers:
+            self._queue.put((float("inf"), next(self._sequence), None))
+        for worker in workers:
+            worker.join()
+        return self.results
+
+
+class _Server(ThreadingHTTPServer):
+    """HTTP server that ignores clients dropping their connections."""
+
+    def handle_error(self, request, client_address) -> None:
+        """Clients may disconnect at any time, e.g. while following a job's turns."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Request handler of PodcastServer:
+
+    POST   /jobs                  submit a config (YAML or JSON); ?priority=N&name=...
+    GET    /jobs                  status of every known job
+    GET    /jobs/<id>             status of one job
+    GET    /jobs/<id>/turns       finished turns as NDJSON, streamed until the job ends; ?offset=N
+    GET    /jobs/<id>/transcript  the saved transcript once the job is done
+    DELETE /jobs/<id>             cancel a queued job
+    GET    /status                queue and worker counts
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    # Seconds between checks for new turns while streaming; also how soon a stream notices a disconnect
+    POLL_INTERVAL = 15.0
+
+    def log_message(self, format: str, *args) -> None:
+        """Job progress is printed by the server; requests are not logged."""
+
+    def send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        """Send a complete JSON response."""
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def route(self) -> tuple:
+        """Return the path segments and query parameters of the request."""
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        return parts, params
+
+    def find_job(self, job_id: str) -> Optional[Job]:
+        """Return the job, or answer 404 and return None."""
+        job = self.server.podcast_server.get_job(job_id)
+        if job is None:
+            self.send_json(404, {"error": f"No job with id '{job_id}'"})
+        return job
+
+    def do_POST(self) -> None:
+        server = self.server.podcast_server
+        parts, params = self.route()
+        if parts != ["jobs"]:
+            self.send_json(404, {"error": "not found"})
+            return
+
+        try:
+            length = max(0, int(self.headers.get("Content-Length", 0)))
+        except ValueError:
+            self.close_connection = True
+            self.send_json(400, {"error": "Invalid Content-Length"})
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self.send_json(413, {"error": f"Config is larger than {MAX_BODY_BYTES} bytes"})
+            return
+        try:
+            # JSON is valid YAML, so either can be posted
+            config = yaml.safe_load(self.rfile.read(length).decode("utf-8"))
+            priority = int(params.get("priority", 0))
+        except (yaml.YAMLError, UnicodeDecodeError) as e:
+            self.send_json(400, {"error": f"Could not parse config: {str(e)}"})
+            return
+        except ValueError:
+            self.send_json(400, {"error": "priority must be a whole number"})
+            return
+
+        try:
+            job = server.submit(config, name=params.get("name"), priority=priority)
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+        except QueueFullError as e:
+            self.send_json(429, {"error": str(e)}, headers={"Retry-After": "30"})
+        except OllamaError as e:
+            self.send_json(502, {"error": f"Could not reach Ollama: {str(e)}"})
+        except RuntimeError as e:
+            self.send_json(503, {"error": str(e)})
+        except Exception as e:
+            # Answer even for errors nobody anticipated, instead of dropping the connection
+            print(f"Could not submit job: {type(e).__name__}: {str(e)}")
+            self.send_json(500, {"error": f"Could not submit job: {str(e)}"})
+        else:
+            self.send_json(202, job.describe(), headers={"Location": f"/jobs/{job.id}"})
+
+    def do_GET(self) -> None:
+        server = self.server.podcast_server
+        parts, params = self.route()
+        if parts == ["status"]:
+            self.send_json(200, server.get_stats())
+        elif parts == ["jobs"]:
+            self.send_json(200, {"jobs": [job.describe() for job in server.list_jobs()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.find_job(parts[1])
+            if job is not None:
+                self.send_json(200, job.describe())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "turns":
+            job = self.find_job(parts[1])
+            if job is not None:
+                try:
+                    offset = max(0, int(params.get("offset", 0)))
+                except ValueError:
+                    self.send_json(400, {"error": "offset must be a whole number"})
+                    return
+                self.stream_turns(job, offset)
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "transcript":
+            job = self.find_job(parts[1])
+            if job is not None:
+                self.send_transcript(job)
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_DELETE(self) -> None:
+        parts, _ = self.route()
+        if len(parts) != 2 or parts[0] != "jobs":
+            self.send_json(404, {"error": "not found"})
+            return
+        job = self.server.podcast_server.cancel(parts[1])
+        if job is None:
+            self.send_json(404, {"error": f"No job with id '{parts[1]}'"})
+        elif job.status != "cancelled":
+            self.send_json(409, {"error": f"Job is {job.status}; only queued jobs can be cancelled"})
+        else:
+            self.send_json(200, job.describe())
+
+    def stream_turns(self, job: Job, offset: int) -> None:
+        """Send the job's turns from offset as NDJSON chunks, following new ones until the job ends."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        position = offset
+        while True:
+            with job.changed:
+                job.changed.wait_for(lambda: len(job.turns) > position or job.finished, self.POLL_INTERVAL)
+                turns = job.turns[position:]
+                finished = job.finished
+            for entry in turns:
+                self.write_chunk(entry)
+            position += len(turns)
+            if finished:
+                break
+            if not turns:
+                # An empty line keeps idle connections open and detects clients that left
+                self.write_chunk(None)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def write_chunk(self, body: Optional[Dict[str, Any]]) -> None:
+        """Write one NDJSON line (an empty line for None) as an HTTP chunk."""
+        data = (json.dumps(body, ensure_ascii=False) if body is not None else "").encode("utf-8") + b"\n"
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def send_transcript(self, job: Job) -> None:
+        """Send the saved output file of a finished job."""
+        if job.status != "done":
+            self.send_json(409, {"error": f"Job is {job.status}; the transcript is available once it is done",
+                                 "status": job.status})
+            return
+        output_path = job.result["output"]
+        try:
+            with open(output_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            self.send_json(410, {"error": f"Transcript is no longer available: {str(e)}"})
+            return
+        output_format = job.podcast_config['output_format']
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPES.get(output_format, "application/octet-stream"))
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Content-Disposition", f'attachment; filename="{os.path.basename(output_path)}"')
+        self.end_headers()
+        self.wfile.write(data)
@@ -0,0 +1,181 @@
+import copy
+import json
+import os
+import queue
+import signal
+import threading
+from typing import Dict, Any, List, Optional, Set
+
+from ..config import ConfigCache
+from ..conversation import TurnJournal
+from ..models import OllamaError
+from .batch import BatchRunner
+from .paths import resolve_output_path
+
+
+class WatchRunner:
+    """
+    Generates a podcast whenever a config is added to or changed in the inputs folder.
+    The folder is polled with a ConfigCache, so each config is parsed and
+    validated once per change. Jobs run on the batch runner's shared
+    transport, at most max_parallel at a time, and models are preloaded and
+    kept loaded between podcasts. A config whose output already exists for
+    the same config hash is skipped, also across restarts.
+    """
+
+    # How long models stay loaded between podcasts unless a config sets keep_alive
+    DEFAULT_KEEP_ALIVE = "30m"
+
+    def __init__(self,
+                batch_runner: BatchRunner,
+                config_cache: ConfigCache,
+                state_path: str,
+                interval: float = 2.0,
+                keep_alive: str = DEFAULT_KEEP_ALIVE):
+        """
+        Initialize the watcher.
+        state_path records the config hash each output was generated from;
+        the inputs folder is scanned every interval seconds.
+        """
+        self.batch_runner = batch_runner
+        self.config_cache = config_cache
+        self.state_path = state_path
+        self.interval = interval
+        self.keep_alive = keep_alive
+        self.state: Dict[str, str] = self.load_state()
+        self.results: List[Dict[str, Any]] = []
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        # Output paths being generated, and the newest job waiting for each of them
+        self._active: Set[str] = set()
+        self._deferred: Dict[str, Dict[str, Any]] = {}
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def load_state(self) -> Dict[str, str]:
+        """Return the recorded config hash of every generated output."""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self) -> None:
+        """Write the state file atomically."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def poll(self) -> None:
+        """Scan the inputs folder and queue every new or changed config."""
+        for entry in self.config_cache.scan():
+            if entry["error"]:
+                print(f"[{entry['name']}] Invalid config, skipping until it changes: {entry['error']}")
+                continue
+            self.submit(entry)
+
+    def submit(self, entry: Dict[str, Any]) -> None:
+        """Queue the podcast of a validated config unless its output is already up to date."""
+        name = entry["name"]
+        # The cached config stays untouched; every job gets its own copy
+        podcast_config = copy.deepcopy(entry["config"])['podcast_config']
+        if self.batch_runner.configure:
+            self.batch_runner.configure(podcast_config)
+        podcast_config.setdefault('output_format', 'json')
+        podcast_config.setdefault('keep_alive', self.keep_alive)
+        output_path = resolve_output_path(podcast_config, default_name=f"podcast_{name}")
+        config_hash = TurnJournal.hash_config(podcast_config)
+
+        with self._lock:
+            generated = self.state.get(output_path) == config_hash
+        if generated and os.path.exists(output_path):
+            print(f"[{name}] Already generated: {output_path}")
+            return
+        if not self.preload(name, podcast_config):
+            return
+
+        job = {"name": name, "podcast_config": podcast_config, "output": output_path, "hash": config_hash}
+        with self._lock:
+            if output_path in self._active:
+                # Regenerate once the running job for the same output is done
+                self._deferred[output_path] = job
+                print(f"[{name}] Changed while generating; queued to run again")
+                return
+            self._active.add(output_path)
+        print(f"[{name}] Queued")
+        self._queue.put(job)
+
+    def preload(self, name: str, podcast_config: Dict[str, Any]) -> bool:
+        """Start loading the models of a config not loaded yet; returns False if one is missing."""
+        try:
+            missing = self.batch_runner.preload(podcast_config, podcast_config['keep_alive'])
+        except OllamaError as e:
+            print(f"[{name}] Could not reach Ollama, skipping until the config changes: {str(e)}")
+            return False
+        for model in missing:
+            print(f"[{name}] Model '{model}' is not available. Pull it with: ollama pull {model}, "
+                  "then save the config again")
+        return not missing
+
+    def work(self) -> None:
+        """Worker thread: generate queued podcasts until stopped."""
+        while True:
+            job = self._queue.get()
+            if job is None or self._stop.is_set():
+                return
+
+            print(f"[{job['name']}] Generating {job['output']}")
+            result = self.batch_runner.run_config(job["name"], job["podcast_config"])
+            print(f"[{job['name']}] {result['status']} ({result['turns']} turns, {result['wall_time']:.1f}s)")
+
+            with self._lock:
+                self.results.append(result)
+                if result["status"] == "ok":
+                    self.state[job["output"]] = job["hash"]
+                    self.save_state()
+                self._active.discard(job["output"])
+                deferred = self._deferred.pop(job["output"], None)
+                if deferred is not None:
+                    self._active.add(deferred["output"])
+            if deferred is not None:
+                self._queue.put(deferred)
+
+    def stop(self) -> None:
+        """Stop polling and starting new podcasts; running ones finish."""
+        self._stop.set()
+
+    def run(self) -> List[Dict[str, Any]]:
+        """Watch the inputs folder until interrupted and return the results of every podcast generated."""
+        workers = [
+            threading.Thread(target=self.work, daemon=True)
+            for _ in range(self.batch_runner.max_parallel)
+        ]
+        for worker in workers:
+            worker.start()
+
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(signal.SIGTERM, lambda *_: self.stop())
+
+        print(f"Watching {self.config_cache.inputs_dir} for configs (Ctrl-C to stop)...")
+        try:
+            self.poll()
+            while not self._stop.wait(self.interval):
+                self.poll()
+        except KeyboardInterrupt:
+            self.stop()
+        finally:
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
+
+        with self._lock:
+            running = len(self._active) - self._queue.qsize()
+        if running > 0:
+            print(f"Stopping: waiting for {running} podcasts to finish "
+                  "(Ctrl-C again to abort; continue them later with --resume)...")
+        for _ in workers:
+            self._queue.put(None)
+        for worker in workers:
+            worker.join()
+        return self.results
@@ -1 +1,6 @@
-from .config_manager import ConfigManager
+from ..lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    "ConfigManager": ".config_manager",
+    "ConfigCache": ".cache",
+})
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import yaml
+from typing import Dict, Any, List
+
+from .config_manager import ConfigManager
+
+
+class ConfigCache:
+    """
+    Validated configs of the inputs folder, kept between scans.
+    A scan lists the folder once and only reads files whose modification
+    time or size changed; a file is only parsed and validated again if its
+    content hash changed too, so touching a file or re-saving it unchanged
+    costs no YAML parsing.
+    """
+
+    def __init__(self, inputs_dir: str = None):
+        """Initialize an empty cache over inputs_dir (default: the inputs folder)."""
+        self.inputs_dir = inputs_dir or ConfigManager.get_inputs_dir()
+        # Per config path: name, stat, hash, and the config or the validation error
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    def scan(self) -> List[Dict[str, Any]]:
+        """Return the entries of configs that are new or whose content changed since the last scan."""
+        if not os.path.isdir(self.inputs_dir):
+            self.entries.clear()
+            return []
+
+        changed = []
+        seen = set()
+        with os.scandir(self.inputs_dir) as it:
+            files = sorted(
+                (entry for entry in it if entry.name.endswith(('.yaml', '.yml')) and entry.is_file()),
+                key=lambda entry: entry.name
+            )
+        for file in files:
+            seen.add(file.path)
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            file_stat = (stat.st_mtime_ns, stat.st_size)
+            cached = self.entries.get(file.path)
+            if cached is not None and cached["stat"] == file_stat:
+                continue
+
+            try:
+                with open(file.path, 'rb') as f:
+                    content = f.read()
+            except OSError:
+                # Removed or still being written; picked up on the next scan
+                continue
+            content_hash = hashlib.sha256(content).hexdigest()
+            if cached is not None and cached["hash"] == content_hash:
+                cached["stat"] = file_stat
+                continue
+
+            entry = {
+                "path": file.path,
+                "name": os.path.splitext(file.name)[0],
+                "stat": file_stat,
+                "hash": content_hash,
+                "config": None,
+                "error": ""
+            }
+            try:
+                entry["config"] = self.parse(content)
+            except (ValueError, yaml.YAMLError) as e:
+                entry["error"] = str(e)
+            self.entries[file.path] = entry
+            changed.append(entry)
+
+        for path in set(self.entries) - seen:
+            del self.entries[path]
+        return changed
+
+    @staticmethod
+    def parse(content: bytes) -> Dict[str, Any]:
+        """Parse and validate the content of a config file."""
+        config = yaml.safe_load(content.decode('utf-8'))
+        ConfigManager._validate_config(config)
+        return config
@@ -1,7 +1,9 @@
 import os
 import yaml
 import glob
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+from ..models.roles import ROLES
 
 class ConfigManager:
     """Manages loading and validating podcast configurations."""
@@ -12,18 +14,30 @@ class ConfigManager:
         self.config_path = config_path
         self.config = self._load_config()
         
-    def _get_latest_input_config(self) -> str:
-        """Find the latest YAML file in the inputs folder."""
+    @staticmethod
+    def get_inputs_dir() -> str:
+        """Return the inputs folder at the project root."""
         # Get project root directory (2 levels up from this file)
         root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        inputs_dir = os.path.join(root_dir, "inputs")
+        return os.path.join(root_dir, "inputs")
+    
+    @staticmethod
+    def get_input_configs(inputs_dir: str = None) -> List[str]:
+        """List all YAML files in the inputs folder, sorted by name."""
+        if inputs_dir is None:
+            inputs_dir = ConfigManager.get_inputs_dir()
         
         if not os.path.exists(inputs_dir):
-            return None
+            return []
             
         # Get all YAML files in the inputs directory
         yaml_files = glob.glob(os.path.join(inputs_dir, "*.yaml"))
         yaml_files += glob.glob(os.path.join(inputs_dir, "*.yml"))
+        return sorted(yaml_files)
+        
+    def _get_latest_input_config(self) -> str:
+        """Find the latest YAML file in the inputs folder."""
+        yaml_files = self.get_input_configs()
         
         if not yaml_files:
             return None
@@ -45,14 +59,20 @@ class ConfigManager:
                 config_path = self.default_config_path
                 print(f"No config specified or found in inputs folder. Using default config.")
         
+        return self.load_file(config_path)
+    
+    @staticmethod
+    def load_file(config_path: str) -> Dict[str, Any]:
+        """Load and validate one configuration file."""
         with open(config_path, 'r', encoding='utf-8') as file:
             config = yaml.safe_load(file)
             
         # Validate the loaded config
-        self._validate_config(config)
+        ConfigManager._validate_config(config)
         return config
     
-    def _validate_config(self, config: Dict[str, Any]) -> None:
+    @staticmethod
+    def _validate_config(config: Dict[str, Any]) -> None:
         """Ensure all required configuration fields are present."""
         required_fields = {
             'podcast_config': [
@@ -62,7 +82,12 @@ class ConfigManager:
             ]
         }
         
+        if not isinstance(config, dict):
+            raise ValueError("Invalid configuration. Must be a YAML mapping with a podcast_config section.")
+        
         pc = config.get('podcast_config', {})
+        if not isinstance(pc, dict):
+            raise ValueError("Invalid podcast_config. Must be a mapping of configuration fields.")
         for field in required_fields['podcast_config']:
             if field not in pc:
                 raise ValueError(f"Missing required configuration field: podcast_config.{field}")
@@ -72,6 +97,24 @@ class ConfigManager:
             agent = pc.get(agent_type, {})
             if not isinstance(agent, dict) or 'name' not in agent or 'personality' not in agent:
                 raise ValueError(f"Invalid {agent_type} configuration. Must include name and personality.")
+                
+        # Validate optional per-role model routes
+        routes = pc.get('model_routes', {})
+        if not isinstance(routes, dict):
+            raise ValueError("Invalid model_routes. Must be a mapping of role names to routes.")
+        for role, route in routes.items():
+            if role not in ROLES:
+                raise ValueError(f"Invalid model route '{role}'. Must be one of: {', '.join(ROLES)}")
+            if not isinstance(route, dict):
+                raise ValueError(f"Invalid model route '{role}'. Must be a mapping with model and/or options.")
+        
+        if pc.get('duration_control', 'fixed') not in ('adaptive', 'fixed'):
+            raise ValueError("Invalid duration_control. Must be 'adaptive' or 'fixed'.")
+        
+        parallel_requests = pc.get('parallel_requests', 1)
+        # bool is a subclass of int, but "parallel_requests: true" is not a count
+        if isinstance(parallel_requests, bool) or not isinstance(parallel_requests, int) or parallel_requests < 1:
+            raise ValueError("Invalid parallel_requests. Must be a whole number of at least 1.")
     
     def get_config(self) -> Dict[str, Any]:
         """Return the loaded configuration."""
@@ -1 +1,8 @@
-from .manager import ConversationManager
+from ..lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    "ConversationManager": ".manager",
+    "TurnJournal": ".journal",
+    "TaskGraph": ".scheduler",
+    "DurationController": ".duration",
+})
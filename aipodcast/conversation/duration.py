@@ -0,0 +1,90 @@
+import re
+from typing import Dict, Any, List, Optional
+
+# Devanagari syllables (aksharas): an independent vowel, or a consonant that is
+# not joined to the next one by a virama (after an optional nukta)
+DEVANAGARI_SYLLABLE = re.compile('[\u0904-\u0914\u0960\u0961\u0972-\u0977]|[\u0915-\u0939\u0958-\u095F](?!\u093C?\u094D)')
+DEVANAGARI_CHAR = re.compile('[\u0900-\u097F]')
+
+# Speaking rates: conversational Hindi runs at about five syllables a second;
+# words in other scripts are counted at the same 150 words per minute the
+# up-front turn estimate uses
+SYLLABLES_PER_SECOND = 5.0
+WORDS_PER_SECOND = 150 / 60
+
+# Turns are not expected to be shorter than this; bounds the number of turns
+# when responses come back empty or nearly so
+MIN_TURN_SECONDS = 5.0
+
+
+def spoken_seconds(text: str) -> float:
+    """
+    Estimate how long text takes to say.
+    Devanagari is measured in syllables, since Hindi words vary a lot in
+    length; words in other scripts (e.g. English mixed into a Hindi turn)
+    are counted as words.
+    """
+    syllables = len(DEVANAGARI_SYLLABLE.findall(text))
+    words = sum(1 for word in text.split() if not DEVANAGARI_CHAR.search(word))
+    return syllables / SYLLABLES_PER_SECOND + words / WORDS_PER_SECOND
+
+
+class DurationController:
+    """
+    Decides turn by turn when a podcast has reached its target length.
+    Every finished turn's spoken length is measured, and after each guest
+    answer the podcast is closed once another exchange (a host turn and
+    a guest answer) would overshoot the target by more than stopping falls
+    short of it. The closing is expected to be as long as an average turn.
+    """
+
+    def __init__(self, target_minutes: float, max_turns: Optional[int] = None, min_turns: int = 2):
+        """
+        Initialize the controller for a podcast of target_minutes.
+        The dialogue always has at least min_turns and at most max_turns turns
+        (by default, as many as fit the target at MIN_TURN_SECONDS each).
+        """
+        self.target_seconds = target_minutes * 60
+        if max_turns is None:
+            max_turns = int(self.target_seconds / MIN_TURN_SECONDS)
+        self.max_turns = max(min_turns, max_turns)
+        self.min_turns = min_turns
+        self.turn_seconds: List[float] = []
+
+    @property
+    def elapsed(self) -> float:
+        """Spoken seconds of the turns so far."""
+        return sum(self.turn_seconds)
+
+    @property
+    def average_turn(self) -> float:
+        """Average spoken seconds per turn so far."""
+        return self.elapsed / len(self.turn_seconds) if self.turn_seconds else 0.0
+
+    def add(self, text: str) -> float:
+        """Measure a finished turn and return its spoken seconds."""
+        seconds = spoken_seconds(text)
+        self.turn_seconds.append(seconds)
+        return seconds
+
+    def remaining(self) -> float:
+        """Seconds left for the dialogue once the expected closing is taken off."""
+        return self.target_seconds - self.elapsed - self.average_turn
+
+    def should_close(self) -> bool:
+        """Return True if the dialogue so far should be followed by the closing."""
+        turns = len(self.turn_seconds)
+        if turns < self.min_turns:
+            return False
+        if turns >= self.max_turns:
+            return True
+        # Another exchange adds two turns: worth it only while it lands closer to the target
+        return self.remaining() <= self.average_turn
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the measured length of the podcast so far."""
+        return {
+            "target_minutes": round(self.target_seconds / 60, 2),
+            "spoken_minutes": round(self.elapsed / 60, 2),
+            "turns": len(self.turn_seconds),
+        }
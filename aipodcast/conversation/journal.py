@@ -0,0 +1,136 @@
+import datetime
+import hashlib
+import json
+import os
+from typing import Dict, Any, List, Optional
+
+# Config keys that only affect where or how the result is saved or how fast
+# it is generated, so a run can be resumed after changing them
+RESUME_IGNORED_KEYS = ("output_file", "output_format", "metrics_file", "response_cache", "keep_alive", "journal",
+                       "parallel_requests")
+
+
+class TurnJournal:
+    """
+    Append-only JSONL record of a conversation, written as each turn completes.
+    The first line identifies the config; every following line holds one turn
+    and is flushed and fsynced before the next turn starts, so after a crash
+    the journal has every finished turn. A partly written last line is dropped
+    when the journal is resumed.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the journal at path; nothing is written until start() or resume()."""
+        self.path = path
+        self.config_hash = ""
+        self._file = None
+
+    @staticmethod
+    def path_for(output_path: str) -> str:
+        """Return the journal path used for an output file."""
+        return f"{os.path.splitext(output_path)[0]}.journal.jsonl"
+
+    @staticmethod
+    def hash_config(podcast_config: Dict[str, Any]) -> str:
+        """Hash the parts of a podcast config that determine the conversation."""
+        relevant = {key: value for key, value in podcast_config.items() if key not in RESUME_IGNORED_KEYS}
+        data = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def exists(self) -> bool:
+        """Return True if a journal was left at the path."""
+        return os.path.exists(self.path)
+
+    def start(self, podcast_config: Dict[str, Any]) -> None:
+        """Start a new journal, replacing any existing one."""
+        self.close()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.config_hash = self.hash_config(podcast_config)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write({
+            "type": "header",
+            "config_hash": self.config_hash,
+            "created_at": datetime.datetime.now().isoformat(),
+            "output_file": podcast_config.get('output_file')
+        })
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Read the journal and return its header, its turns in order and the
+        byte offset where the last complete turn ends.
+        """
+        header: Dict[str, Any] = {}
+        turns: List[Dict[str, Any]] = []
+        offset = 0
+
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # The run stopped while writing this line
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record.get("type") == "header" and not header:
+                    header = record
+                elif record.get("type") == "turn" and record.get("index") == len(turns):
+                    turns.append(record)
+                else:
+                    break
+                offset += len(line)
+
+        return {"header": header, "turns": turns, "offset": offset}
+
+    def resume(self, podcast_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Reopen the journal for appending and return the recorded history entries.
+        Raises ValueError if the journal was written for a different config.
+        """
+        journal = self.load()
+        config_hash = self.hash_config(podcast_config)
+        if not journal["header"]:
+            raise ValueError(f"Journal {self.path} has no header and cannot be resumed")
+        if journal["header"].get("config_hash") != config_hash:
+            raise ValueError(
+                f"Journal {self.path} was written for a different podcast config; "
+                "run without --resume to start over"
+            )
+
+        self.close()
+        self.config_hash = config_hash
+        # Drop anything after the last complete turn before appending
+        with open(self.path, 'r+b') as f:
+            f.truncate(journal["offset"])
+        self._file = open(self.path, 'a', encoding='utf-8')
+        return [record["entry"] for record in journal["turns"]]
+
+    def append(self, index: int, entry: Dict[str, Any], params: Optional[Dict[str, Any]] = None) -> None:
+        """Durably record a finished turn with the parameters it was generated with."""
+        if self._file is None:
+            return
+        self._write({
+            "type": "turn",
+            "index": index,
+            "config_hash": self.config_hash,
+            "params": params or {},
+            "entry": entry
+        })
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Write one line and make sure it reached the disk."""
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Close and delete the journal, e.g. once the podcast has been saved."""
+        self.close()
+        if self.exists():
+            os.remove(self.path)
@@ -1,9 +1,15 @@
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Callable, Optional
 import time
 import math
+import threading
 from ..agents.host import HostAgent
 from ..agents.guest import GuestAgent
 from ..models.ollama_client import OllamaClient
+from ..models.metrics import MetricsRecorder, summarize
+from ..models.transport import OllamaError
+from .journal import TurnJournal
+from .scheduler import TaskGraph
+from .duration import DurationController
 
 class ConversationManager:
     """Manages the podcast conversation flow."""
@@ -14,15 +20,40 @@ class ConversationManager:
                 theme: str,
                 tone: str,
                 max_tokens_per_response: int,
-                total_podcast_duration_minutes: int):
-        """Initialize the conversation manager."""
+                total_podcast_duration_minutes: int,
+                max_turn_retries: int = 2,
+                stream: bool = False,
+                closing_client: Optional[OllamaClient] = None,
+                metrics: Optional[MetricsRecorder] = None,
+                journal: Optional[TurnJournal] = None,
+                max_parallel: int = 1,
+                adaptive_duration: bool = False):
+        """
+        Initialize the conversation manager.
+        closing_client, if given, generates the closing instead of the host's own client.
+        metrics is the recorder the agents' clients write to; each turn's calls
+        are summarized from it into the turn's history entry. Every finished
+        turn is written to journal, if given, so the run can be resumed.
+        Turns that do not depend on each other are generated concurrently,
+        at most max_parallel at a time, and recorded in order. With
+        adaptive_duration, the number of turns follows the measured spoken
+        length of the conversation instead of the up-front estimate.
+        """
         self.host = host
         self.guest = guest
         self.theme = theme
         self.tone = tone
         self.max_tokens_per_response = max_tokens_per_response
         self.total_podcast_duration_minutes = total_podcast_duration_minutes
+        self.max_turn_retries = max_turn_retries
+        self.stream = stream
+        self.closing_client = closing_client
+        self.metrics = metrics
+        self.journal = journal
+        self.max_parallel = max_parallel
         self.conversation_history = []
+        self.listeners = []
+        self.turn_listeners = []
         
         # Estimate the number of exchanges based on duration and token count
         # This is a rough estimate: assuming ~1.5 words per token and ~150 words per minute
@@ -31,55 +62,259 @@ class ConversationManager:
         tokens_per_minute = words_per_minute / 1.5
         total_tokens = tokens_per_minute * total_podcast_duration_minutes
         self.estimated_exchanges = math.ceil(total_tokens / (max_tokens_per_response * 2))
-    
-    def start_conversation(self) -> List[Dict[str, str]]:
-        """Start and manage the entire podcast conversation."""
-        print(f"Starting podcast with {self.estimated_exchanges} estimated exchanges...")
-        
-        # Add initial context - will be empty but serves as a placeholder for the first turn
-        self.conversation_history = []
         
+        self.duration_controller: Optional[DurationController] = None
+        if adaptive_duration:
+            self.duration_controller = DurationController(total_podcast_duration_minutes)
+        self.closed = False
+    
+    def plan_turns(self) -> List[str]:
+        """Return the role of every turn in order: 'host', 'guest' and finally 'closing'."""
         # Start with host introduction
-        host_intro = self.host.generate_response(
-            self.conversation_history,
-            self.theme,
-            self.tone,
-            self.max_tokens_per_response
-        )
-        self.add_to_history(self.host.name, host_intro)
-        print(f"{self.host.name}: {host_intro}\n")
+        turns = ["host"]
         
         # Alternate between host and guest for the estimated number of exchanges
         for i in range(self.estimated_exchanges - 1):  # -1 because we already added the intro
-            # Guest response
-            guest_response = self.guest.generate_response(
-                self.conversation_history,
-                self.theme,
-                self.tone,
-                self.max_tokens_per_response
-            )
-            self.add_to_history(self.guest.name, guest_response)
-            print(f"{self.guest.name}: {guest_response}\n")
-            
+            turns.append("guest")
             # Host question/comment (except for the last exchange)
             if i < self.estimated_exchanges - 2:
-                host_response = self.host.generate_response(
-                    self.conversation_history,
-                    self.theme,
-                    self.tone,
-                    self.max_tokens_per_response
-                )
-                self.add_to_history(self.host.name, host_response)
-                print(f"{self.host.name}: {host_response}\n")
-        
+                turns.append("host")
+                
         # Add host closing
-        host_closing = self.generate_closing()
-        self.add_to_history(self.host.name, host_closing)
-        print(f"{self.host.name}: {host_closing}\n")
+        turns.append("closing")
+        return turns
+    
+    def start_conversation(self, 
+                          resume_history: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Start and manage the entire podcast conversation.
+        With resume_history (e.g. from a turn journal), the finished turns are
+        kept and the conversation continues from the next one.
+        """
+        self.conversation_history = list(resume_history or [])
+        self.closed = False
+        if self.duration_controller is not None:
+            self.replay_duration()
         
+        if self.conversation_history and self.duration_controller is not None:
+            print(f"Resuming podcast at turn {len(self.conversation_history) + 1}...")
+        elif self.conversation_history:
+            print(f"Resuming podcast at turn {len(self.conversation_history) + 1} of {len(self.plan_turns())}...")
+        elif self.duration_controller is not None:
+            print(f"Starting podcast, aiming for {self.total_podcast_duration_minutes} minutes "
+                  f"(about {self.estimated_exchanges} exchanges)...")
+        else:
+            print(f"Starting podcast with {self.estimated_exchanges} estimated exchanges...")
+        
+        # Agents in session mode start a fresh chat for every conversation
+        for agent in (self.host, self.guest):
+            if agent.use_session:
+                agent.restore_session(self.conversation_history, self.theme, self.tone)
+        
+        # Every dialogue turn depends on the turn before it, whose text its prompt
+        # includes; the closing is the task named "closing"
+        graph = TaskGraph(self.max_parallel)
+        held_closing = []
+        
+        def add_turn(index: int, role: str) -> None:
+            previous = [index - 1] if index - 1 in graph.tasks else []
+            if role != "closing":
+                graph.add(index, lambda: self.generate_role_turn(index, role), previous)
+            elif "closing" not in graph.tasks:
+                graph.add("closing", lambda: self.generate_role_turn(index, "closing"), previous)
+        
+        def on_done(name: Any, turn: Dict[str, Any]) -> None:
+            if name == "closing":
+                # A closing generated alongside the dialogue is recorded once the dialogue ends
+                held_closing.append(turn)
+            else:
+                self.record_turn(turn)
+                role = self.next_role()
+                if self.duration_controller is not None and role is not None:
+                    # The measured length so far decides what comes next
+                    add_turn(len(self.conversation_history), role)
+            if held_closing and self.next_role() == "closing":
+                self.record_turn(held_closing.pop())
+        
+        # The closing prompt only uses the speakers' names, so with room for
+        # another request it depends on no other turn
+        if (self.max_parallel > 1 and self.next_role() is not None
+                and not self.needs_history("closing")):
+            graph.add("closing", lambda: self.generate_role_turn(None, "closing"))
+        if self.duration_controller is None:
+            # The planned turns are all known up front
+            plan = self.plan_turns()
+            for index in range(len(self.conversation_history), len(plan)):
+                add_turn(index, plan[index])
+        elif self.next_role() is not None:
+            add_turn(len(self.conversation_history), self.next_role())
+        graph.run(on_done)
         return self.conversation_history
     
-    def generate_closing(self) -> str:
+    def next_role(self) -> Optional[str]:
+        """
+        Return the role of the next turn, or None once the podcast is complete.
+        Without a duration controller the roles follow plan_turns(); with one,
+        host and guest alternate until the controller ends the dialogue after
+        a guest answer.
+        """
+        index = len(self.conversation_history)
+        if self.duration_controller is None:
+            plan = self.plan_turns()
+            return plan[index] if index < len(plan) else None
+        if self.closed:
+            return None
+        if index % 2 == 0 and index > 0 and self.duration_controller.should_close():
+            return "closing"
+        return "host" if index % 2 == 0 else "guest"
+    
+    def replay_duration(self) -> None:
+        """Measure the turns already in the history, e.g. after resuming, and note if the closing is among them."""
+        controller = self.duration_controller
+        controller.turn_seconds = []
+        for index, entry in enumerate(self.conversation_history):
+            # The controller makes the same decisions it made when the turns were generated
+            if index % 2 == 0 and index > 0 and controller.should_close():
+                self.closed = True
+            controller.add(entry.get('text', ''))
+    
+    def needs_history(self, role: str) -> bool:
+        """
+        Return True if a turn of role depends on the turns before it.
+        The closing prompt only uses the speakers' names, so it can be
+        generated alongside the dialogue unless it goes through the host's session.
+        """
+        if role != "closing":
+            return True
+        return self.host._uses_session(self.closing_client or self.host.ollama_client)
+    
+    def take_role_turn(self, role: str) -> str:
+        """Take the next turn of a planned role."""
+        return self.record_turn(self.generate_role_turn(len(self.conversation_history), role))
+    
+    def generate_role_turn(self, index: Optional[int], role: str) -> Dict[str, Any]:
+        """
+        Generate the turn of a planned role at position index in the conversation
+        (None for a closing generated before its position is known).
+        """
+        # Only the next turn is streamed; one generated ahead of it is printed once recorded
+        stream = self.stream and len(self.conversation_history) == index
+        if role == "closing":
+            turn = self.generate_turn(self.host.name, self.generate_closing,
+                                      self.closing_client or self.host.ollama_client, stream)
+            turn["closing"] = True
+            return turn
+        
+        agent = self.host if role == "host" else self.guest
+        return self.generate_turn(agent.name, lambda on_chunk: agent.generate_response(
+            self.conversation_history,
+            self.theme,
+            self.tone,
+            self.max_tokens_per_response,
+            on_chunk
+        ), agent.ollama_client, stream)
+    
+    def subscribe(self, listener: Callable[[str, str], None]) -> None:
+        """Register a listener called with (speaker, chunk) for every streamed chunk."""
+        self.listeners.append(listener)
+    
+    def subscribe_turns(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Register a listener called with the history entry of every finished turn."""
+        self.turn_listeners.append(listener)
+    
+    def take_turn(self, 
+                 speaker: str, 
+                 generate: Callable[[Optional[Callable[[str], None]]], str],
+                 ollama_client: Optional[OllamaClient] = None) -> str:
+        """
+        Generate one turn, record it in the history and print it.
+        In stream mode the text is printed and published to listeners as it arrives.
+        ollama_client is the client generating the turn, whose settings are journaled.
+        """
+        return self.record_turn(self.generate_turn(speaker, generate, ollama_client, self.stream))
+    
+    def generate_turn(self, 
+                     speaker: str, 
+                     generate: Callable[[Optional[Callable[[str], None]]], str],
+                     ollama_client: Optional[OllamaClient] = None,
+                     stream: bool = False) -> Dict[str, Any]:
+        """
+        Generate one turn and return it with its metrics, ready for record_turn().
+        With stream, the text is printed and published to listeners as it arrives.
+        """
+        mark = self.metrics.mark() if self.metrics is not None else 0
+        language_before = self.get_language_stats()
+        start = time.perf_counter()
+        turn = {"speaker": speaker, "client": ollama_client, "streamed": None}
+        
+        if not stream:
+            turn["text"] = self.run_turn(lambda: generate(None))
+            turn["metrics"] = self.turn_metrics(mark, start, language_before)
+            return turn
+        
+        streamed = []
+        first_chunk_time = None
+        
+        def on_chunk(chunk: str) -> None:
+            nonlocal first_chunk_time
+            if first_chunk_time is None:
+                first_chunk_time = time.perf_counter()
+            streamed.append(chunk)
+            print(chunk, end="", flush=True)
+            for listener in self.listeners:
+                listener(speaker, chunk)
+        
+        def attempt() -> str:
+            streamed.clear()
+            print(f"{speaker}: ", end="", flush=True)
+            try:
+                return generate(on_chunk)
+            finally:
+                print("\n")
+        
+        turn["text"] = self.run_turn(attempt)
+        turn["metrics"] = self.turn_metrics(mark, start, language_before, first_chunk_time)
+        turn["streamed"] = "".join(streamed).strip()
+        return turn
+    
+    def record_turn(self, turn: Dict[str, Any]) -> str:
+        """Add a generated turn to the history, journal it and print it unless it was streamed."""
+        self.add_to_history(turn["speaker"], turn["text"], turn["metrics"])
+        if self.duration_controller is not None:
+            self.duration_controller.add(turn["text"])
+        self.closed = self.closed or turn.get("closing", False)
+        self.finish_turn(turn["client"])
+        
+        streamed = turn["streamed"]
+        if streamed is not None and streamed != turn["text"] and streamed.startswith(turn["text"]):
+            # A loop was cut off after part of it was streamed; the turn ends before the repetition
+            print(f"[{turn['speaker']} started repeating; the turn ends before the repeated part]\n")
+        elif turn["text"] != streamed:
+            # The streamed text is replaced when the response had to be translated
+            print(f"{turn['speaker']}: {turn['text']}\n")
+        return turn["text"]
+    
+    def run_turn(self, generate: Callable[[], str]) -> str:
+        """
+        Run one turn, retrying it when the model fails or returns nothing.
+        Re-raises the last OllamaError once the retries are used up.
+        """
+        for attempt in range(self.max_turn_retries + 1):
+            try:
+                response = generate()
+            except OllamaError as e:
+                if attempt == self.max_turn_retries:
+                    raise
+                print(f"Turn failed ({str(e)}), retrying ({attempt + 1}/{self.max_turn_retries})...")
+                continue
+                
+            if response.strip() or attempt == self.max_turn_retries:
+                return response
+            print(f"Empty response from model, retrying ({attempt + 1}/{self.max_turn_retries})...")
+            
+        return response
+    
+    def generate_closing(self, on_chunk: Optional[Callable[[str], None]] = None) -> str:
         """Generate a closing statement from the host."""
         language = self.host.language
         
@@ -96,22 +331,71 @@ class ConversationManager:
                 f"Provide a brief summary of the main points discussed in the podcast."
             )
         
-        closing = self.host.ollama_client.generate(
-            prompt=prompt,
-            system_prompt=self.host.get_system_prompt(),
-            max_tokens=self.max_tokens_per_response
-        )
-        
-        # Only check/translate if language is Hindi
-        if language.lower() == "hindi" and not self.host.ollama_client.is_hindi(closing):
-            closing = self.host.ollama_client.translate_to_hindi(closing)
+        return self.host.complete(prompt, self.max_tokens_per_response, on_chunk, self.closing_client)
+    
+    def get_language_stats(self) -> Dict[str, int]:
+        """Return how often responses were aborted for language drift, translated or cut off for looping."""
+        stats: Dict[str, int] = {}
+        # Host and guest may share a guard, translator or detector; count each one once
+        components = {}
+        for agent in (self.host, self.guest):
+            components[id(agent.language_guard)] = agent.language_guard
+            components[id(agent.translator)] = agent.translator
+            components[id(agent.repetition_detector)] = agent.repetition_detector
+        for component in components.values():
+            for key, value in component.get_stats().items():
+                stats[key] = stats.get(key, 0) + value
+        return stats
+    
+    def turn_metrics(self, 
+                    mark: int, 
+                    start: float, 
+                    language_before: Dict[str, int],
+                    first_chunk_time: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Summarize the turn that started at start (perf_counter): its wall time,
+        the Ollama calls this thread recorded since mark and its language
+        fallbacks. Turns generated concurrently may share their language counts.
+        """
+        metrics = {"wall_time": round(time.perf_counter() - start, 4)}
+        if first_chunk_time is not None:
+            metrics["first_token_time"] = round(first_chunk_time - start, 4)
             
-        return closing
+        if self.metrics is not None:
+            calls = summarize(self.metrics.since(mark, threading.get_ident()))
+            for key in ("calls", "retries", "failed_calls", "cancelled_calls", "prompt_tokens",
+                        "generated_tokens", "load_duration", "prompt_eval_duration", "eval_duration",
+                        "tokens_per_second"):
+                metrics[key] = calls[key]
+                
+        # Language guard aborts and translated sentences during this turn
+        for key, value in self.get_language_stats().items():
+            metrics[key] = value - language_before.get(key, 0)
+        return metrics
+    
+    def finish_turn(self, ollama_client: Optional[OllamaClient] = None) -> None:
+        """Journal the turn just added to the history, then pass it to the turn listeners."""
+        entry = self.conversation_history[-1]
+        if self.journal is not None:
+            self.journal_turn(entry, ollama_client)
+        for listener in self.turn_listeners:
+            listener(entry)
+    
+    def journal_turn(self, entry: Dict[str, Any], ollama_client: Optional[OllamaClient] = None) -> None:
+        """Write a history entry to the journal with its generation settings."""
+        params = {"max_tokens": self.max_tokens_per_response, "stream": self.stream}
+        if ollama_client is not None:
+            params["model"] = ollama_client.model
+            params["options"] = ollama_client.options.to_ollama()
+        self.journal.append(len(self.conversation_history) - 1, entry, params)
     
-    def add_to_history(self, speaker: str, text: str) -> None:
+    def add_to_history(self, speaker: str, text: str, metrics: Optional[Dict[str, Any]] = None) -> None:
         """Add an exchange to the conversation history."""
-        self.conversation_history.append({
+        entry = {
             'speaker': speaker,
             'text': text,
             'timestamp': time.time()
-        })
+        }
+        if metrics is not None:
+            entry['metrics'] = metrics
+        self.conversation_history.append(entry)
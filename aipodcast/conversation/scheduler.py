@@ -0,0 +1,81 @@
+import queue
+import threading
+from typing import Dict, Any, List, Callable, Optional, Hashable, Iterable
+
+
+class TaskGraph:
+    """
+    Runs tasks that declare which other tasks they depend on.
+    A task starts as soon as all of its dependencies have finished, with at
+    most max_parallel tasks running at once; when several are ready, the one
+    added first starts first. With max_parallel 1 every task runs in the
+    calling thread, in the order they were added.
+    """
+
+    def __init__(self, max_parallel: int = 1):
+        """Initialize an empty graph."""
+        if max_parallel < 1:
+            raise ValueError("max_parallel must be at least 1")
+        self.max_parallel = max_parallel
+        self.tasks: Dict[Hashable, Callable[[], Any]] = {}
+        self.dependencies: Dict[Hashable, List[Hashable]] = {}
+
+    def add(self, name: Hashable, run: Callable[[], Any], depends_on: Iterable[Hashable] = ()) -> None:
+        """Add a task; its dependencies must have been added before it, so the graph has no cycles."""
+        if name in self.tasks:
+            raise ValueError(f"Task {name!r} was already added")
+        depends_on = list(depends_on)
+        for dependency in depends_on:
+            if dependency not in self.tasks:
+                raise ValueError(f"Task {name!r} depends on unknown task {dependency!r}")
+        self.tasks[name] = run
+        self.dependencies[name] = depends_on
+
+    def run(self, on_done: Optional[Callable[[Hashable, Any], None]] = None) -> Dict[Hashable, Any]:
+        """
+        Run every task and return their results by name.
+        on_done(name, result) is called in the calling thread as each task
+        finishes, before any task that depends on it starts; it may add
+        more tasks, which are run too. If a task raises, no more tasks are
+        started and the error is re-raised.
+        """
+        results: Dict[Hashable, Any] = {}
+        if self.max_parallel == 1:
+            position = 0
+            while position < len(self.tasks):
+                name = list(self.tasks)[position]
+                results[name] = self.tasks[name]()
+                if on_done is not None:
+                    on_done(name, results[name])
+                position += 1
+            return results
+
+        started = set()
+        running = set()
+        finished: "queue.Queue[tuple]" = queue.Queue()
+
+        def work(name: Hashable, run: Callable[[], Any]) -> None:
+            try:
+                finished.put((name, run(), None))
+            except BaseException as e:
+                finished.put((name, None, e))
+
+        while running or len(started) < len(self.tasks):
+            ready = [
+                name for name in self.tasks
+                if name not in started and all(d in results for d in self.dependencies[name])
+            ]
+            for name in ready[:self.max_parallel - len(running)]:
+                started.add(name)
+                running.add(name)
+                # Daemon threads, so Ctrl-C or an error does not wait for requests still running
+                threading.Thread(target=work, args=(name, self.tasks[name]), daemon=True).start()
+
+            name, result, error = finished.get()
+            running.discard(name)
+            if error is not None:
+                raise error
+            results[name] = result
+            if on_done is not None:
+                on_done(name, result)
+        return results
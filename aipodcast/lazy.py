@@ -0,0 +1,24 @@
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable, List[str]]:
+    """
+    Return the __getattr__, __dir__ and __all__ of a package whose names are
+    imported from their submodules on first use.
+    exports maps every public name to the relative module that defines it,
+    so importing the package itself costs nothing until a name is used.
+    """
+    def __getattr__(name: str):
+        if name not in exports:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        # Later lookups find the name directly and skip __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__, list(exports)
@@ -1 +1,23 @@
-from .ollama_client import OllamaClient
+# Names are imported from their modules on first use, so code that only
+# needs e.g. ROLES or GenerationOptions does not load requests
+from ..lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    "OllamaClient": ".ollama_client",
+    "GenerationOptions": ".options",
+    "ResponseCache": ".cache",
+    "MetricsRecorder": ".metrics",
+    "write_metrics_file": ".metrics",
+    "ChatSession": ".session",
+    "SentenceTranslator": ".translator",
+    "ModelPreloader": ".preload",
+    "ModelRouter": ".router",
+    "ROLES": ".roles",
+    "OllamaTransport": ".transport",
+    "CircuitBreaker": ".transport",
+    "OllamaError": ".transport",
+    "OllamaConnectionError": ".transport",
+    "OllamaTimeoutError": ".transport",
+    "OllamaResponseError": ".transport",
+    "CircuitOpenError": ".transport",
+})
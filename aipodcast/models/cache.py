@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed cache of model responses.
+    Entries are keyed by a hash of everything that determines the output and
+    evicted least-recently-used first once the cache exceeds its size or age limit.
+    """
+
+    def __init__(self,
+                cache_dir: str,
+                max_size_mb: float = 256,
+                max_age_days: float = 30):
+        """Initialize the cache and drop entries that are already expired."""
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age = max_age_days * 24 * 3600
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.size = 0
+        self.evict()
+
+    @staticmethod
+    def is_cacheable(options: Optional[Dict[str, Any]]) -> bool:
+        """Only deterministic generations (seeded or temperature 0) are cached."""
+        if not options:
+            return False
+        return options.get("seed") is not None or options.get("temperature") == 0
+
+    @staticmethod
+    def make_key(model: str,
+                system_prompt: Optional[str],
+                prompt: str,
+                options: Optional[Dict[str, Any]] = None) -> str:
+        """Hash the model, prompts and generation options into a cache key."""
+        material = json.dumps(
+            {"model": model, "system": system_prompt or "", "prompt": prompt, "options": options or {}},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Return the file path of an entry."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                self._remove(path)
+                self.misses += 1
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            # Touch the entry so eviction sees it as recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry.get("response")
+
+    def put(self, key: str, response: str, model: str = "") -> None:
+        """Store a response and evict old entries if the cache is too large."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temp file first so concurrent readers never see partial entries
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"model": model, "response": response, "created_at": time.time()}, f, ensure_ascii=False)
+        new_size = os.path.getsize(tmp_path)
+
+        with self._lock:
+            # An overwritten entry no longer counts towards the size
+            try:
+                replaced_size = os.path.getsize(path)
+            except OSError:
+                replaced_size = 0
+            os.replace(tmp_path, path)
+            self.size += new_size - replaced_size
+            over_limit = self.size > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def _remove(self, path: str) -> None:
+        """Delete one entry, ignoring entries removed by someone else."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self.size -= size
+
+    def evict(self) -> None:
+        """Remove expired entries, then the least recently used ones until under 90% of the size limit."""
+        entries = []
+        now = time.time()
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.max_age:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+
+        with self._lock:
+            self.size = total
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    self._remove(os.path.join(root, name))
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+from typing import Dict, Any, List, Optional
+
+# Ollama reports durations in nanoseconds
+NANOSECONDS = 1e9
+
+# Timing fields of Ollama's final response object, reported in seconds
+DURATION_FIELDS = ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration")
+
+
+def call_metrics(result: Dict[str, Any],
+                 model: str,
+                 wall_time: float,
+                 first_token_time: Optional[float] = None,
+                 retries: int = 0,
+                 status: str = "ok") -> Dict[str, Any]:
+    """Build the metrics record of one call from Ollama's final response object."""
+    metrics = {
+        "model": model,
+        "status": status,
+        "wall_time": wall_time,
+        "first_token_time": first_token_time,
+        "retries": retries,
+        "prompt_eval_count": result.get("prompt_eval_count", 0),
+        "eval_count": result.get("eval_count", 0),
+    }
+    for name in DURATION_FIELDS:
+        metrics[name] = result.get(name, 0) / NANOSECONDS
+    return metrics
+
+
+def summarize(calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate call records into totals and rates."""
+    generated = [call for call in calls if call["status"] in ("ok", "cancelled")]
+    first_tokens = [call["first_token_time"] for call in calls if call.get("first_token_time") is not None]
+    summary = {
+        "calls": len(calls),
+        "cached_calls": sum(1 for call in calls if call["status"] == "cached"),
+        "failed_calls": sum(1 for call in calls if call["status"] == "error"),
+        "cancelled_calls": sum(1 for call in calls if call["status"] == "cancelled"),
+        "retries": sum(call["retries"] for call in calls),
+        "wall_time": sum(call["wall_time"] for call in calls),
+        "prompt_tokens": sum(call["prompt_eval_count"] for call in generated),
+        "generated_tokens": sum(call["eval_count"] for call in generated),
+    }
+    for name in DURATION_FIELDS:
+        summary[name] = sum(call[name] for call in generated)
+
+    summary["tokens_per_second"] = (
+        summary["generated_tokens"] / summary["eval_duration"] if summary["eval_duration"] else 0.0
+    )
+    summary["prompt_tokens_per_second"] = (
+        summary["prompt_tokens"] / summary["prompt_eval_duration"] if summary["prompt_eval_duration"] else 0.0
+    )
+    summary["avg_first_token_time"] = sum(first_tokens) / len(first_tokens) if first_tokens else None
+    for name, value in summary.items():
+        if isinstance(value, float):
+            summary[name] = round(value, 4)
+    return summary
+
+
+class MetricsRecorder:
+    """
+    Collects the metrics of every call made by the clients of one run.
+    Clients that share a recorder (e.g. all the role clients of a router)
+    append to the same list, so a caller can mark a position and later read
+    back just the calls made since, e.g. for one turn. Each call is tagged
+    with the thread that made it, so calls made concurrently can be told apart.
+    """
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self.calls: List[Dict[str, Any]] = []
+        self._threads: List[int] = []
+        self._lock = threading.Lock()
+
+    def record(self, metrics: Dict[str, Any]) -> None:
+        """Add the metrics of one call."""
+        with self._lock:
+            self.calls.append(metrics)
+            self._threads.append(threading.get_ident())
+
+    def mark(self) -> int:
+        """Return the current position, for since()."""
+        with self._lock:
+            return len(self.calls)
+
+    def since(self, mark: int, thread: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the calls recorded after mark, only those made by thread if given."""
+        with self._lock:
+            if thread is None:
+                return self.calls[mark:]
+            return [call for call, ident in zip(self.calls[mark:], self._threads[mark:]) if ident == thread]
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate every call recorded so far."""
+        with self._lock:
+            calls = list(self.calls)
+        summary = summarize(calls)
+        models = sorted({call["model"] for call in calls})
+        if len(models) > 1:
+            summary["by_model"] = {
+                model: summarize([call for call in calls if call["model"] == model]) for model in models
+            }
+        return summary
+
+
+def format_prometheus(summary: Dict[str, Any], labels: Optional[Dict[str, str]] = None) -> str:
+    """Format run metrics in the Prometheus text exposition format."""
+    lines = []
+
+    def add(name: str, value: Any, extra_labels: Dict[str, str]) -> None:
+        if value is None:
+            return
+        all_labels = {**(labels or {}), **extra_labels}
+        label_text = ",".join(f'{key}="{str(val)}"' for key, val in sorted(all_labels.items()))
+        lines.append(f"aipodcast_{name}{{{label_text}}} {value}" if label_text else f"aipodcast_{name} {value}")
+
+    by_model = summary.get("by_model", {})
+    for name, value in summary.items():
+        if name == "by_model":
+            continue
+        lines.append(f"# TYPE aipodcast_{name} gauge")
+        add(name, value, {})
+        for model, model_summary in by_model.items():
+            add(name, model_summary.get(name), {"model": model})
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path: str, summary: Dict[str, Any], labels: Optional[Dict[str, str]] = None) -> str:
+    """
+    Write run metrics to path: Prometheus text for .prom or .txt files, JSON otherwise.
+    The file is replaced atomically, so a scraper never reads a partial file.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if os.path.splitext(path)[1].lower() in (".prom", ".txt"):
+        content = format_prometheus(summary, labels)
+    else:
+        content = json.dumps({"labels": labels or {}, **summary}, ensure_ascii=False, indent=2)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return path
@@ -1,47 +1,344 @@
-import requests
 import json
-from typing import Dict, Any, Optional, List
+import time
+from typing import Dict, Any, Optional, List, Iterator, Union
+
+from .transport import OllamaTransport, OllamaError, OllamaResponseError, iter_json_lines
+from .cache import ResponseCache
+from .options import GenerationOptions
+from .metrics import MetricsRecorder, call_metrics
+from .scripts import is_script, estimate_tokens
 
 class OllamaClient:
     """Client for interacting with Ollama local models."""
     
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3"):
-        """Initialize the Ollama client with base URL and model."""
+    # Bounds of the automatically sized context window (num_ctx)
+    MIN_NUM_CTX = 2048
+    MAX_NUM_CTX = 8192
+    # Tokens added to the estimated prompt size to cover template and estimate error
+    NUM_CTX_MARGIN = 128
+    
+    def __init__(self, 
+                base_url: str = "http://localhost:11434", 
+                model: str = "llama3",
+                transport: Optional[OllamaTransport] = None,
+                options: Optional[Union[GenerationOptions, Dict[str, Any]]] = None,
+                cache: Optional[ResponseCache] = None,
+                keep_alive: Optional[str] = None,
+                metrics: Optional[MetricsRecorder] = None):
+        """
+        Initialize the Ollama client with base URL and model.
+        options are Ollama generation options sent with every request; when they
+        are deterministic, responses are served from and stored in cache.
+        keep_alive controls how long Ollama keeps the model loaded (e.g. "30m").
+        If metrics is given, the timings and token counts of every call are recorded in it.
+        """
         self.base_url = base_url
         self.model = model
-        self.api_generate = f"{self.base_url}/api/generate"
+        self.transport = transport or OllamaTransport(base_url)
+        if not isinstance(options, GenerationOptions):
+            options = GenerationOptions.from_dict(options)
+        self.options = options
+        self.cache = cache
+        self.keep_alive = keep_alive
+        self.metrics = metrics
+        # Context window used when options do not set num_ctx. It only grows,
+        # since every change of num_ctx makes Ollama reload the model.
+        self.num_ctx = self.MIN_NUM_CTX
+        # Token counts Ollama reported for the last completed request
+        self.last_usage: Dict[str, Any] = {}
         
     def set_model(self, model: str) -> None:
         """Update the model being used."""
         self.model = model
+    
+    def _request_options(self,
+                        max_tokens: int,
+                        options: Optional[GenerationOptions],
+                        prompt_text: str) -> GenerationOptions:
+        """
+        Merge the client options, the per-call options and the token limit.
+        Unless num_ctx is set explicitly it is sized to fit the prompt plus
+        the response.
+        """
+        merged = self.options.merge(num_predict=max_tokens).merge(options)
+        if merged.num_ctx is None:
+            needed = estimate_tokens(prompt_text) + (merged.num_predict or 0) + self.NUM_CTX_MARGIN
+            self._grow_num_ctx(needed)
+            merged.num_ctx = self.num_ctx
+        return merged
+    
+    def _grow_num_ctx(self, needed: int) -> None:
+        """Grow the automatic context window to the next power of two that holds needed."""
+        while self.num_ctx < needed and self.num_ctx < self.MAX_NUM_CTX:
+            self.num_ctx *= 2
+        if needed > self.num_ctx:
+            print(f"Warning: prompt needs about {needed} tokens, more than the "
+                  f"{self.num_ctx}-token context window; the oldest context will be truncated")
+    
+    def _build_payload(self, 
+                      options: GenerationOptions,
+                      stream: bool,
+                      **fields) -> Dict[str, Any]:
+        """Build a request body with the settings shared by every endpoint."""
+        payload = {
+            "model": self.model,
+            **fields,
+            "stream": stream,
+            "options": options.to_ollama()
+        }
+            
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+            
+        return payload
+    
+    def _cache_key(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Return the cache key for a request, or None if it must not be cached."""
+        options = dict(payload["options"])
+        if self.cache is None or not ResponseCache.is_cacheable(options):
+            return None
+        if "messages" in payload:
+            prompt = json.dumps(payload["messages"], ensure_ascii=False)
+        else:
+            prompt = payload["prompt"]
+        # The context window does not change the output of a prompt that fits in it
+        options.pop("num_ctx", None)
+        return ResponseCache.make_key(self.model, payload.get("system"), prompt, options)
+    
+    def _check_usage(self, result: Dict[str, Any], options: Dict[str, Any]) -> None:
+        """
+        Record the token counts Ollama reports in its final response object
+        and check them against the limits that were sent.
+        """
+        self.last_usage = {
+            "prompt_eval_count": result.get("prompt_eval_count", 0),
+            "eval_count": result.get("eval_count", 0),
+            "done_reason": result.get("done_reason", "")
+        }
+        num_predict = options.get("num_predict")
+        if num_predict is not None and num_predict >= 0 and self.last_usage["eval_count"] > num_predict:
+            print(f"Warning: {self.model} generated {self.last_usage['eval_count']} tokens, "
+                  f"over the num_predict limit of {num_predict}")
+        
+        num_ctx = options.get("num_ctx")
+        used = self.last_usage["prompt_eval_count"] + self.last_usage["eval_count"]
+        if num_ctx and used >= num_ctx:
+            print(f"Warning: {self.model} used {used} tokens, the whole {num_ctx}-token context window")
+            if self.options.num_ctx is None:
+                self._grow_num_ctx(used + self.NUM_CTX_MARGIN)
+    
+    def _record(self,
+               result: Dict[str, Any],
+               start: float,
+               first_token_time: Optional[float] = None,
+               retries: int = 0,
+               status: str = "ok") -> None:
+        """Record the metrics of a call that started at start (perf_counter)."""
+        if self.metrics is not None:
+            wall_time = time.perf_counter() - start
+            self.metrics.record(call_metrics(result, self.model, wall_time, first_token_time, retries, status))
+    
+    def _complete(self, path: str, payload: Dict[str, Any]) -> str:
+        """Send a non-streaming request and return the generated text."""
+        start = time.perf_counter()
+        cache_key = self._cache_key(payload)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record({}, start, status="cached")
+                return cached
+            
+        try:
+            response = self.transport.post(path, payload)
+        except OllamaError as e:
+            self._record({}, start, retries=e.retries, status="error")
+            raise
+        retries = getattr(response, "retries", 0)
+        
+        try:
+            result = response.json()
+        except ValueError as e:
+            self._record({}, start, retries=retries, status="error")
+            raise OllamaResponseError(f"Invalid JSON from Ollama API: {str(e)}")
+            
+        if "error" in result:
+            self._record({}, start, retries=retries, status="error")
+            raise OllamaResponseError(f"Error from Ollama API: {result['error']}")
+            
+        self._check_usage(result, payload["options"])
+        self._record(result, start, retries=retries)
+        text = self._extract_text(result)
+        if cache_key and text:
+            self.cache.put(cache_key, text, self.model)
+        return text
+    
+    def _stream(self, path: str, payload: Dict[str, Any]) -> Iterator[str]:
+        """Send a streaming request and yield the generated text chunks."""
+        start = time.perf_counter()
+        cache_key = self._cache_key(payload)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record({}, start, status="cached")
+                yield cached
+                return
+            
+        try:
+            response = self.transport.post(path, payload, stream=True)
+        except OllamaError as e:
+            self._record({}, start, retries=e.retries, status="error")
+            raise
+        
+        chunks = []
+        final: Dict[str, Any] = {}
+        first_token_time = None
+        # Stays "cancelled" if the consumer closes the stream early
+        status = "cancelled"
+        try:
+            for chunk in iter_json_lines(response):
+                text = self._extract_text(chunk)
+                if text:
+                    if first_token_time is None:
+                        first_token_time = time.perf_counter() - start
+                    chunks.append(text)
+                    yield text
+                if chunk.get("done"):
+                    final = chunk
+                    self._check_usage(chunk, payload["options"])
+                    break
+            status = "ok"
+        except OllamaError:
+            status = "error"
+            raise
+        finally:
+            self._record(final, start, first_token_time, getattr(response, "retries", 0), status)
+        
+        # Only complete streams are cached; a cancelled one never gets here
+        if cache_key and chunks:
+            self.cache.put(cache_key, "".join(chunks), self.model)
+    
+    @staticmethod
+    def _extract_text(result: Dict[str, Any]) -> str:
+        """Return the generated text of a /api/generate or /api/chat response object."""
+        if "message" in result:
+            return result["message"].get("content", "")
+        return result.get("response", "")
         
     def generate(self, 
                 prompt: str, 
                 system_prompt: Optional[str] = None,
-                max_tokens: int = 200) -> str:
-        """Generate text using the specified Ollama model."""
+                max_tokens: int = 200,
+                options: Optional[GenerationOptions] = None) -> str:
+        """
+        Generate text using the specified Ollama model.
+        max_tokens is sent as num_predict; options override the client options for this call.
+        Raises an OllamaError subclass if the server cannot produce a response.
+        """
+        return self._complete("/api/generate", self._generate_payload(prompt, system_prompt, max_tokens, options, False))
+    
+    def generate_stream(self, 
+                       prompt: str, 
+                       system_prompt: Optional[str] = None,
+                       max_tokens: int = 200,
+                       options: Optional[GenerationOptions] = None) -> Iterator[str]:
+        """
+        Generate text as a stream of token chunks from Ollama's NDJSON API.
+        Closing the generator early cancels the request.
+        """
+        return self._stream("/api/generate", self._generate_payload(prompt, system_prompt, max_tokens, options, True))
+    
+    def _generate_payload(self,
+                         prompt: str,
+                         system_prompt: Optional[str],
+                         max_tokens: int,
+                         options: Optional[GenerationOptions],
+                         stream: bool) -> Dict[str, Any]:
+        """Build the body of a /api/generate request."""
+        fields = {"prompt": prompt}
+        if system_prompt:
+            fields["system"] = system_prompt
+        options = self._request_options(max_tokens, options, (system_prompt or "") + prompt)
+        return self._build_payload(options, stream, **fields)
+    
+    def _chat_payload(self,
+                     messages: List[Dict[str, str]],
+                     max_tokens: int,
+                     options: Optional[GenerationOptions],
+                     stream: bool) -> Dict[str, Any]:
+        """Build the body of a /api/chat request."""
+        prompt_text = "\n".join(message.get("content", "") for message in messages)
+        options = self._request_options(max_tokens, options, prompt_text)
+        return self._build_payload(options, stream, messages=messages)
+    
+    def chat(self, 
+            messages: List[Dict[str, str]], 
+            max_tokens: int = 200,
+            options: Optional[GenerationOptions] = None) -> str:
+        """Generate the next assistant message for a chat using /api/chat."""
+        return self._complete("/api/chat", self._chat_payload(messages, max_tokens, options, False))
+    
+    def chat_stream(self, 
+                   messages: List[Dict[str, str]], 
+                   max_tokens: int = 200,
+                   options: Optional[GenerationOptions] = None) -> Iterator[str]:
+        """Stream the next assistant message for a chat using /api/chat."""
+        return self._stream("/api/chat", self._chat_payload(messages, max_tokens, options, True))
+    
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Return the embedding vector of every text, in one /api/embed request."""
+        payload: Dict[str, Any] = {"model": self.model, "input": texts}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        
+        start = time.perf_counter()
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "max_tokens": max_tokens
-            }
-            
-            if system_prompt:
-                payload["system"] = system_prompt
-                
-            response = requests.post(self.api_generate, json=payload)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "")
-            else:
-                raise Exception(f"Error from Ollama API: {response.status_code} - {response.text}")
-                
-        except Exception as e:
-            print(f"Error communicating with Ollama: {str(e)}")
-            return ""
+            response = self.transport.post("/api/embed", payload)
+            result = response.json()
+        except OllamaError as e:
+            self._record({}, start, retries=e.retries, status="error")
+            raise
+        except ValueError as e:
+            self._record({}, start, status="error")
+            raise OllamaResponseError(f"Invalid JSON from Ollama API: {str(e)}")
+        
+        embeddings = result.get("embeddings")
+        if "error" in result or not isinstance(embeddings, list) or len(embeddings) != len(texts):
+            self._record({}, start, retries=getattr(response, "retries", 0), status="error")
+            raise OllamaResponseError(f"Error from Ollama API: {result.get('error', 'no embeddings returned')}")
+        self._record(result, start, retries=getattr(response, "retries", 0))
+        return embeddings
+    
+    def list_models(self) -> List[str]:
+        """Return the names of the models available on the server (/api/tags)."""
+        response = self.transport.get("/api/tags", timeout=(self.transport.timeout[0], 10))
+        return [model.get("name", "") for model in response.json().get("models", [])]
+    
+    def list_running_models(self) -> List[str]:
+        """Return the names of the models currently loaded in memory (/api/ps)."""
+        response = self.transport.get("/api/ps", timeout=(self.transport.timeout[0], 10))
+        return [model.get("name", "") for model in response.json().get("models", [])]
+    
+    def load_model(self, model: Optional[str] = None, keep_alive: Optional[str] = None) -> None:
+        """
+        Load a model into memory without generating anything.
+        The context window is sent too, so the first real request does not reload the model.
+        """
+        payload = {"model": model or self.model, "options": {"num_ctx": self.options.num_ctx or self.num_ctx}}
+        keep_alive = keep_alive if keep_alive is not None else self.keep_alive
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        try:
+            self.transport.post("/api/generate", payload).close()
+        except OllamaResponseError as e:
+            if e.status_code != 400:
+                raise
+            # Embedding models cannot generate; an empty embed request loads them
+            payload.pop("options")
+            self.transport.post("/api/embed", {**payload, "input": []}).close()
+    
+    def close(self) -> None:
+        """Release pooled connections."""
+        self.transport.close()
     
     def is_hindi(self, text: str, min_hindi_ratio: float = 0.7) -> bool:
         """
@@ -50,16 +347,7 @@ class OllamaClient:
         """
         if not text:
             return False
-            
-        # Unicode range for Devanagari script used in Hindi
-        hindi_chars = sum(1 for char in text if '\u0900' <= char <= '\u097F')
-        total_chars = sum(1 for char in text if not char.isspace())
-        
-        if total_chars == 0:
-            return False
-            
-        hindi_ratio = hindi_chars / total_chars
-        return hindi_ratio >= min_hindi_ratio
+        return is_script(text, "devanagari", min_hindi_ratio)
     
     def translate_to_hindi(self, text: str) -> str:
         """Translate text to Hindi using the model."""
@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, Any, List, Optional
+
+
+@dataclass
+class GenerationOptions:
+    """
+    Generation settings sent in the `options` object of an Ollama request.
+    Unset fields are left out so the model's defaults apply; any other Ollama
+    option can be passed through extra.
+    """
+
+    num_predict: Optional[int] = None
+    num_ctx: Optional[int] = None
+    stop: Optional[List[str]] = None
+    temperature: Optional[float] = None
+    seed: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, options: Optional[Dict[str, Any]]) -> 'GenerationOptions':
+        """Build options from a config mapping; max_tokens is accepted for num_predict."""
+        options = dict(options or {})
+        if 'max_tokens' in options:
+            options.setdefault('num_predict', options.pop('max_tokens'))
+
+        known = {f.name for f in fields(cls)} - {'extra'}
+        values = {key: options.pop(key) for key in list(options) if key in known}
+        return cls(extra=options, **values)
+
+    def merge(self, other: Optional['GenerationOptions'] = None, **overrides) -> 'GenerationOptions':
+        """Return a copy with the set fields of other, then the keyword overrides, applied."""
+        merged = replace(self, extra=dict(self.extra))
+        if other is not None:
+            for f in fields(other):
+                value = getattr(other, f.name)
+                if f.name == 'extra':
+                    merged.extra.update(value)
+                elif value is not None:
+                    setattr(merged, f.name, value)
+        for name, value in overrides.items():
+            if value is not None:
+                setattr(merged, name, value)
+        return merged
+
+    def to_ollama(self) -> Dict[str, Any]:
+        """Return the options object for an Ollama request."""
+        options = dict(self.extra)
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if f.name != 'extra' and value is not None:
+                options[f.name] = value
+        return options
+
+    def is_deterministic(self) -> bool:
+        """Seeded or temperature 0 generations always give the same output."""
+        return self.seed is not None or self.temperature == 0
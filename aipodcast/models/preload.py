@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, List, Optional
+
+from .ollama_client import OllamaClient
+from .transport import OllamaError
+
+
+def normalize_model_name(name: str) -> str:
+    """Return the model name with an explicit tag, as Ollama lists it."""
+    return name if ":" in name else f"{name}:latest"
+
+
+class ModelPreloader:
+    """
+    Verifies the Ollama server and loads the models a run needs in the background.
+    The health check only lists models, so it costs no generation, and the
+    models load concurrently while the caller keeps setting up the run.
+    """
+
+    def __init__(self, ollama_client: OllamaClient, keep_alive: Optional[str] = None):
+        """Initialize the preloader on a client whose transport is shared with the run."""
+        self.ollama_client = ollama_client
+        self.keep_alive = keep_alive
+        self.available: List[str] = []
+        self.futures: Dict[str, Future] = {}
+        self.warm: Dict[str, bool] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def check(self, models: List[str]) -> List[str]:
+        """
+        Check that the server is up and return the models it does not have.
+        Raises an OllamaError subclass if the server cannot be reached.
+        """
+        self.available = [normalize_model_name(name) for name in self.ollama_client.list_models()]
+        return [model for model in models if normalize_model_name(model) not in self.available]
+
+    def start(self, models: List[str]) -> None:
+        """Start loading every model concurrently and return immediately."""
+        models = list(dict.fromkeys(models))
+        try:
+            running = {normalize_model_name(name) for name in self.ollama_client.list_running_models()}
+        except OllamaError:
+            running = set()
+
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(models)))
+        for model in models:
+            self.warm[model] = normalize_model_name(model) in running
+            self.futures[model] = self._executor.submit(self._load, model)
+        self._executor.shutdown(wait=False)
+
+    def _load(self, model: str) -> float:
+        """Load one model and return how long it took."""
+        start = time.perf_counter()
+        self.ollama_client.load_model(model, keep_alive=self.keep_alive)
+        return time.perf_counter() - start
+
+    def wait(self) -> List[Dict[str, Any]]:
+        """Wait for every preload and return one report row per model."""
+        results = []
+        for model, future in self.futures.items():
+            row = {"model": model, "warm": self.warm.get(model, False), "seconds": 0.0, "error": ""}
+            try:
+                row["seconds"] = future.result()
+            except OllamaError as e:
+                row["error"] = str(e)
+            results.append(row)
+        return results
+
+    @staticmethod
+    def format_report(results: List[Dict[str, Any]]) -> str:
+        """Format preload results, one line per model."""
+        lines = []
+        for row in results:
+            state = "warm start" if row["warm"] else "cold start"
+            if row["error"]:
+                lines.append(f"Model {row['model']}: failed to load ({row['error']})")
+            else:
+                lines.append(f"Model {row['model']}: {state}, ready in {row['seconds']:.1f}s")
+        return "\n".join(lines)
@@ -0,0 +1,2 @@
+# Call roles that can be routed to their own model
+ROLES = ("host", "guest", "translation", "summary", "closing", "embedding")
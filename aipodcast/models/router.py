@@ -0,0 +1,62 @@
+from typing import Dict, Any, List, Optional
+
+from .ollama_client import OllamaClient
+from .options import GenerationOptions
+from .roles import ROLES
+
+
+class ModelRouter:
+    """
+    Maps each call role to its own model and generation options.
+    Every role client shares the default client's transport (and so its
+    pooled connections), cache and metrics recorder. Roles without a route
+    use the default client.
+    """
+
+    # Keeps routed models loaded between their (often infrequent) calls
+    DEFAULT_KEEP_ALIVE = "30m"
+
+    def __init__(self,
+                default_client: OllamaClient,
+                routes: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Initialize the router with the default client and the routing table."""
+        self.default_client = default_client
+        self.routes = routes or {}
+        self.clients: Dict[str, OllamaClient] = {}
+
+        for role in self.routes:
+            if role not in ROLES:
+                raise ValueError(f"Unknown model route '{role}'. Must be one of: {', '.join(ROLES)}")
+
+    def client(self, role: str) -> OllamaClient:
+        """Return the client for a call role."""
+        route = self.routes.get(role)
+        if not route:
+            return self.default_client
+
+        if role not in self.clients:
+            default = self.default_client
+            keep_alive = route.get('keep_alive', default.keep_alive)
+            if keep_alive is None and len(self.models()) > 1:
+                keep_alive = self.DEFAULT_KEEP_ALIVE
+
+            self.clients[role] = OllamaClient(
+                base_url=default.base_url,
+                model=route.get('model', default.model),
+                transport=default.transport,
+                options=default.options.merge(GenerationOptions.from_dict(route.get('options'))),
+                cache=default.cache,
+                keep_alive=keep_alive,
+                metrics=default.metrics
+            )
+        return self.clients[role]
+
+    def models(self) -> List[str]:
+        """Return every distinct model the routes need, the default model first."""
+        models = [self.default_client.model]
+        models += [route['model'] for route in self.routes.values() if route.get('model')]
+        return list(dict.fromkeys(models))
+
+    def describe(self) -> Dict[str, str]:
+        """Return the model used for every role."""
+        return {role: self.client(role).model for role in ROLES}
@@ -0,0 +1,230 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; str.translate is used without it
+    np = None
+
+# Unicode blocks per script
+SCRIPT_RANGES: Dict[str, List[Tuple[int, int]]] = {
+    "devanagari": [(0x0900, 0x097F), (0xA8E0, 0xA8FF)],
+    "bengali": [(0x0980, 0x09FF)],
+    "gurmukhi": [(0x0A00, 0x0A7F)],
+    "gujarati": [(0x0A80, 0x0AFF)],
+    "oriya": [(0x0B00, 0x0B7F)],
+    "tamil": [(0x0B80, 0x0BFF)],
+    "telugu": [(0x0C00, 0x0C7F)],
+    "kannada": [(0x0C80, 0x0CFF)],
+    "malayalam": [(0x0D00, 0x0D7F)],
+    "arabic": [(0x0600, 0x06FF), (0x0750, 0x077F), (0xFB50, 0xFDFF), (0xFE70, 0xFEFF)],
+    "latin": [(0x0041, 0x005A), (0x0061, 0x007A), (0x00C0, 0x024F), (0x1E00, 0x1EFF)],
+    "cyrillic": [(0x0400, 0x04FF)],
+    "greek": [(0x0370, 0x03FF)],
+    "han": [(0x4E00, 0x9FFF), (0x3400, 0x4DBF)],
+    "kana": [(0x3040, 0x30FF)],
+    "hangul": [(0xAC00, 0xD7AF), (0x1100, 0x11FF)],
+}
+
+# Script used to write each language an agent can be configured with
+LANGUAGE_SCRIPTS: Dict[str, str] = {
+    "hindi": "devanagari",
+    "marathi": "devanagari",
+    "nepali": "devanagari",
+    "sanskrit": "devanagari",
+    "bengali": "bengali",
+    "assamese": "bengali",
+    "punjabi": "gurmukhi",
+    "gujarati": "gujarati",
+    "odia": "oriya",
+    "oriya": "oriya",
+    "tamil": "tamil",
+    "telugu": "telugu",
+    "kannada": "kannada",
+    "malayalam": "malayalam",
+    "urdu": "arabic",
+    "arabic": "arabic",
+    "persian": "arabic",
+    "english": "latin",
+    "french": "latin",
+    "german": "latin",
+    "spanish": "latin",
+    "portuguese": "latin",
+    "italian": "latin",
+    "russian": "cyrillic",
+    "greek": "greek",
+    "chinese": "han",
+    "japanese": "kana",
+    "korean": "hangul",
+}
+
+_MARKER_BASE = 0xE000  # Start of the Private Use Area
+_SCRIPTS = list(SCRIPT_RANGES)
+_MARKERS = {script: chr(_MARKER_BASE + i) for i, script in enumerate(_SCRIPTS)}
+
+
+def _build_table() -> Dict[int, Optional[str]]:
+    """
+    Build the str.translate table used for one-pass script analysis.
+    Characters of a known script map to that script's private-use marker and
+    whitespace is dropped, so counting is a few str.count calls on the result.
+    """
+    table: Dict[int, Optional[str]] = {}
+    # Private-use characters in the input must not be mistaken for markers
+    for code in range(_MARKER_BASE, _MARKER_BASE + len(_SCRIPTS)):
+        table[code] = "?"
+    for script, ranges in SCRIPT_RANGES.items():
+        for start, end in ranges:
+            for code in range(start, end + 1):
+                table[code] = _MARKERS[script]
+    # All Unicode whitespace lies below U+3001
+    for code in range(0x3001):
+        if chr(code).isspace():
+            table[code] = None
+    return table
+
+
+_TABLE = _build_table()
+
+# Texts at least this long are counted with NumPy when it is installed
+NUMPY_MIN_LENGTH = 512
+
+
+def _build_intervals() -> Tuple[List[int], List[int]]:
+    """
+    Build sorted interval starts and their labels for NumPy counting.
+    Labels are script indexes, len(_SCRIPTS) for whitespace and
+    len(_SCRIPTS) + 1 for everything else.
+    """
+    whitespace, other = len(_SCRIPTS), len(_SCRIPTS) + 1
+    intervals = []
+    for index, script in enumerate(_SCRIPTS):
+        for start, end in SCRIPT_RANGES[script]:
+            intervals.append((start, end + 1, index))
+    for code in range(0x3001):
+        if chr(code).isspace():
+            intervals.append((code, code + 1, whitespace))
+    intervals.sort()
+
+    starts, labels = [], []
+    position = 0
+    for start, end, label in intervals:
+        if start > position:
+            starts.append(position)
+            labels.append(other)
+        starts.append(start)
+        labels.append(label)
+        position = end
+    starts.append(position)
+    labels.append(other)
+    return starts, labels
+
+
+if np is not None:
+    _starts, _labels = _build_intervals()
+    _INTERVAL_STARTS = np.array(_starts, dtype=np.uint32)
+    _INTERVAL_LABELS = np.array(_labels, dtype=np.intp)
+
+
+def _count_numpy(text: str) -> Dict[str, int]:
+    """Count scripts by binning a UTF-32 view of the code points."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    intervals = np.searchsorted(_INTERVAL_STARTS, codes, side="right") - 1
+    bins = np.bincount(_INTERVAL_LABELS[intervals], minlength=len(_SCRIPTS) + 2)
+    counts = {script: int(bins[i]) for i, script in enumerate(_SCRIPTS)}
+    counts["total"] = len(text) - int(bins[len(_SCRIPTS)])
+    return counts
+
+
+def script_counts(text: str) -> Dict[str, int]:
+    """
+    Count the characters of every script in text.
+    The 'total' entry is the number of non-whitespace characters.
+    """
+    if np is not None and len(text) >= NUMPY_MIN_LENGTH:
+        return _count_numpy(text)
+    reduced = text.translate(_TABLE)
+    counts = {script: reduced.count(marker) for script, marker in _MARKERS.items()}
+    counts["total"] = len(reduced)
+    return counts
+
+
+def script_ratio(text: str, script: str) -> float:
+    """Return the share of non-whitespace characters of text written in script."""
+    if np is not None and len(text) >= NUMPY_MIN_LENGTH:
+        counts = _count_numpy(text)
+        return counts[script] / counts["total"] if counts["total"] else 0.0
+    reduced = text.translate(_TABLE)
+    if not reduced:
+        return 0.0
+    return reduced.count(_MARKERS[script]) / len(reduced)
+
+
+def script_ratios(text: str) -> Dict[str, float]:
+    """Return the share of non-whitespace characters per script."""
+    counts = script_counts(text)
+    total = counts.pop("total")
+    if not total:
+        return {script: 0.0 for script in counts}
+    return {script: count / total for script, count in counts.items()}
+
+
+def dominant_script(text: str) -> Optional[str]:
+    """Return the script with the most characters in text, or None if it has no letters."""
+    counts = script_counts(text)
+    counts.pop("total")
+    script, count = max(counts.items(), key=lambda item: item[1])
+    return script if count else None
+
+
+def language_script(language: str) -> Optional[str]:
+    """Return the script a language is written in, or None if it is not known."""
+    return LANGUAGE_SCRIPTS.get(language.strip().lower())
+
+
+def is_script(text: str, script: str, min_ratio: float = 0.7) -> bool:
+    """Return True if at least min_ratio of the non-whitespace characters are in script."""
+    return script_ratio(text, script) >= min_ratio
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the number of tokens in text.
+    Latin text averages about four characters per token; Devanagari and other
+    non-Latin scripts are split much more finely, about two characters per token.
+    """
+    counts = script_counts(text)
+    latin = counts["latin"]
+    other = counts["total"] - latin
+    return int(latin / 4 + other / 2) + 1
+
+
+class ScriptCounter:
+    """Script counts of a text that arrives in chunks, e.g. a token stream."""
+
+    def __init__(self):
+        """Initialize empty counts."""
+        self._chars = Counter()
+        self.total = 0
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Characters seen so far per script."""
+        return {script: self._chars[marker] for script, marker in _MARKERS.items()}
+
+    def update(self, chunk: str) -> None:
+        """Add the characters of a new chunk."""
+        reduced = chunk.translate(_TABLE)
+        self._chars.update(reduced)
+        self.total += len(reduced)
+
+    def ratio(self, script: str) -> float:
+        """Return the share of non-whitespace characters seen so far in script."""
+        if not self.total:
+            return 0.0
+        return self._chars[_MARKERS[script]] / self.total
+
+    def reset(self) -> None:
+        """Forget everything counted so far."""
+        self._chars = Counter()
+        self.total = 0
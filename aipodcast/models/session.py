@@ -0,0 +1,75 @@
+from typing import Dict, List, Optional, Callable
+
+from .ollama_client import OllamaClient
+from .options import GenerationOptions
+
+
+class ChatSession:
+    """
+    Append-only chat with an Ollama model.
+    Messages are only ever added at the end, so each request shares its whole
+    prefix with the previous one and Ollama can reuse the evaluated KV cache
+    instead of re-reading the full prompt every turn.
+    """
+
+    def __init__(self, ollama_client: OllamaClient, system_prompt: Optional[str] = None):
+        """Initialize the session with an optional system message."""
+        self.ollama_client = ollama_client
+        self.messages: List[Dict[str, str]] = []
+        if system_prompt:
+            self.messages.append({"role": "system", "content": system_prompt})
+
+    @property
+    def turns(self) -> int:
+        """Number of completed exchanges in the session."""
+        return sum(1 for m in self.messages if m["role"] == "assistant")
+
+    def send(self,
+            content: str,
+            max_tokens: int = 200,
+            on_chunk: Optional[Callable[[str], None]] = None,
+            options: Optional[GenerationOptions] = None) -> str:
+        """
+        Send a user message and return the assistant's reply.
+        The exchange is only recorded once the reply is complete, so a failed
+        call can simply be retried.
+        """
+        messages = self.messages + [{"role": "user", "content": content}]
+
+        if on_chunk:
+            stream = self.ollama_client.chat_stream(messages, max_tokens=max_tokens, options=options)
+            chunks = []
+            try:
+                for chunk in stream:
+                    chunks.append(chunk)
+                    on_chunk(chunk)
+            finally:
+                # Cancels the request if on_chunk aborted it
+                stream.close()
+            reply = "".join(chunks)
+        else:
+            reply = self.ollama_client.chat(messages, max_tokens=max_tokens, options=options)
+
+        self.messages = messages + [{"role": "assistant", "content": reply}]
+        return reply
+
+    def append(self, content: str, reply: str) -> None:
+        """Record an exchange whose reply was produced outside send(), e.g. cut short by the caller."""
+        self.messages = self.messages + [
+            {"role": "user", "content": content},
+            {"role": "assistant", "content": reply}
+        ]
+
+    def drop_last_exchange(self) -> None:
+        """Remove the last exchange, e.g. one whose reply the caller rejected after it was recorded."""
+        if len(self.messages) >= 2 and self.messages[-1]["role"] == "assistant":
+            self.messages = self.messages[:-2]
+
+    def replace_last_reply(self, content: str) -> None:
+        """Replace the last assistant message, e.g. with its translation."""
+        if self.messages and self.messages[-1]["role"] == "assistant":
+            self.messages[-1]["content"] = content
+
+    def reset(self) -> None:
+        """Drop every message except the system prompt."""
+        self.messages = [m for m in self.messages if m["role"] == "system"]
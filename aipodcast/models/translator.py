@@ -0,0 +1,116 @@
+import re
+from typing import Dict, List, Tuple
+
+from .ollama_client import OllamaClient
+
+# Sentence boundaries: whitespace after a danda or Latin end punctuation, or line breaks
+SENTENCE_BOUNDARY = re.compile(r'((?<=[।॥.!?])\s+|\n+)')
+NUMBERED_LINE = re.compile(r'^\s*(\d+)\s*[.):।-]\s*(.*\S)')
+
+
+class SentenceTranslator:
+    """
+    Translates only the parts of responses that are not already Hindi.
+    Responses are split into sentences; the non-Hindi sentences of one or more
+    responses are sent to the model as a single numbered list and the
+    translations are put back in place, leaving Devanagari sentences untouched.
+    """
+
+    SYSTEM_PROMPT = "You are a helpful translator that translates text to Hindi."
+
+    def __init__(self, ollama_client: OllamaClient, min_hindi_ratio: float = 0.7):
+        """Initialize the translator."""
+        self.ollama_client = ollama_client
+        self.min_hindi_ratio = min_hindi_ratio
+        self.translated_sentences = 0
+        self.kept_sentences = 0
+
+    @staticmethod
+    def split_sentences(text: str) -> List[str]:
+        """
+        Split text into alternating sentences and separators.
+        Even indices are sentences, odd indices the whitespace between them, so
+        joining the list gives back the original text.
+        """
+        return SENTENCE_BOUNDARY.split(text)
+
+    def needs_translation(self, sentence: str) -> bool:
+        """Return True for a sentence with words that are not mostly Devanagari."""
+        if not any(char.isalpha() for char in sentence):
+            return False
+        return not self.ollama_client.is_hindi(sentence, min_hindi_ratio=self.min_hindi_ratio)
+
+    def translate(self, text: str) -> str:
+        """Translate the non-Hindi sentences of a single text."""
+        return self.translate_many([text])[0]
+
+    def translate_many(self, texts: List[str]) -> List[str]:
+        """Translate the non-Hindi sentences of several texts with one request."""
+        parts = [self.split_sentences(text) for text in texts]
+
+        # (text index, part index) of every sentence that needs translating
+        pending: List[Tuple[int, int]] = []
+        for text_index, text_parts in enumerate(parts):
+            for part_index in range(0, len(text_parts), 2):
+                sentence = text_parts[part_index]
+                if self.needs_translation(sentence):
+                    pending.append((text_index, part_index))
+                elif sentence.strip():
+                    self.kept_sentences += 1
+
+        sentences = [parts[t][p] for t, p in pending]
+        translations = self._translate_sentences(sentences)
+
+        for (text_index, part_index), translation in zip(pending, translations):
+            parts[text_index][part_index] = translation
+
+        return ["".join(text_parts) for text_parts in parts]
+
+    def _translate_sentences(self, sentences: List[str]) -> List[str]:
+        """Translate sentences as one numbered list, retrying any the model skipped once."""
+        if not sentences:
+            return []
+
+        results = list(sentences)
+        missing = list(range(len(sentences)))
+        for _ in range(2):
+            translated = self._request([sentences[i] for i in missing])
+            still_missing = []
+            for position, index in enumerate(missing):
+                if position + 1 in translated:
+                    results[index] = translated[position + 1]
+                    self.translated_sentences += 1
+                else:
+                    still_missing.append(index)
+            missing = still_missing
+            if not missing:
+                break
+
+        # Sentences the model never returned are kept as they were
+        return results
+
+    def _request(self, sentences: List[str]) -> Dict[int, str]:
+        """Send one numbered translation request and parse the numbered reply."""
+        numbered = "\n".join(
+            f"{i}. {' '.join(sentence.split())}" for i, sentence in enumerate(sentences, start=1)
+        )
+        prompt = (
+            "Translate each numbered line below to Hindi (use Devanagari script). "
+            "Reply with exactly the same numbers, one translated line per number, and nothing else.\n\n"
+            f"{numbered}"
+        )
+        # Devanagari needs roughly one token per two or three characters
+        max_tokens = max(200, len(numbered))
+
+        response = self.ollama_client.generate(prompt, system_prompt=self.SYSTEM_PROMPT, max_tokens=max_tokens)
+
+        translated = {}
+        for line in response.splitlines():
+            match = NUMBERED_LINE.match(line)
+            if match:
+                translated[int(match.group(1))] = match.group(2).strip()
+        return translated
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return how many sentences were translated and kept."""
+        return {"translated_sentences": self.translated_sentences, "kept_sentences": self.kept_sentences}
@@ -0,0 +1,208 @@
+import json
+import random
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class OllamaError(Exception):
+    """Base class for errors raised while talking to the Ollama server."""
+
+    # Retries the transport made before giving up
+    retries = 0
+
+
+class OllamaConnectionError(OllamaError):
+    """The Ollama server could not be reached."""
+
+
+class OllamaTimeoutError(OllamaError):
+    """The Ollama server did not answer within the configured timeout."""
+
+
+class OllamaResponseError(OllamaError):
+    """The Ollama server answered with an error status or an unusable body."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CircuitOpenError(OllamaError):
+    """Requests are being refused because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops sending requests to a server that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    every call is refused until ``recovery_timeout`` seconds have passed. The
+    next call is then let through as a trial; its outcome closes or re-opens
+    the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """Initialize the breaker in the closed state."""
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call should not be attempted."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    raise CircuitOpenError(
+                        f"Ollama circuit is open after {self.failures} consecutive failures"
+                    )
+                self.state = self.HALF_OPEN
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed call and open the breaker when the threshold is hit."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class OllamaTransport:
+    """Pooled HTTP transport with timeouts, retries and a circuit breaker."""
+
+    # Status codes worth retrying: the server is busy or temporarily broken
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self,
+                base_url: str = "http://localhost:11434",
+                connect_timeout: float = 5.0,
+                read_timeout: float = 300.0,
+                max_retries: int = 3,
+                backoff_base: float = 0.5,
+                backoff_max: float = 8.0,
+                pool_size: int = 10,
+                failure_threshold: int = 5,
+                recovery_timeout: float = 30.0):
+        """Initialize the transport with a keep-alive session."""
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = CircuitBreaker(failure_threshold, recovery_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, path: str) -> str:
+        """Return the absolute URL for an API path."""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before retry ``attempt`` (full jitter)."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def request(self,
+               method: str,
+               path: str,
+               payload: Optional[Dict[str, Any]] = None,
+               timeout: Optional[Tuple[float, float]] = None,
+               stream: bool = False) -> requests.Response:
+        """Send a request, retrying transient failures, and return the response."""
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.backoff(attempt - 1))
+
+            self.breaker.before_call()
+            try:
+                response = self.session.request(
+                    method,
+                    self.url(path),
+                    json=payload,
+                    timeout=timeout or self.timeout,
+                    stream=stream
+                )
+            except requests.exceptions.Timeout as e:
+                last_error = OllamaTimeoutError(f"Timed out calling {path}: {e}")
+            except requests.exceptions.ConnectionError as e:
+                last_error = OllamaConnectionError(f"Could not connect to Ollama at {self.base_url}: {e}")
+            else:
+                if response.status_code == 200:
+                    self.breaker.record_success()
+                    # Kept on the response so callers sharing the transport can report it
+                    response.retries = attempt
+                    return response
+
+                error = OllamaResponseError(
+                    f"Error from Ollama API: {response.status_code} - {response.text}",
+                    status_code=response.status_code
+                )
+                response.close()
+                if response.status_code not in self.RETRY_STATUS_CODES:
+                    # The server is healthy, the request itself is wrong
+                    self.breaker.record_success()
+                    error.retries = attempt
+                    raise error
+                last_error = error
+
+            self.breaker.record_failure()
+
+        last_error.retries = self.max_retries
+        raise last_error
+
+    def post(self, path: str, payload: Dict[str, Any], **kwargs) -> requests.Response:
+        """POST a JSON payload to an API path."""
+        return self.request("POST", path, payload, **kwargs)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        """GET an API path."""
+        return self.request("GET", path, **kwargs)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+
+def iter_json_lines(response: requests.Response) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the objects of an NDJSON streaming response.
+    Closing the iterator early closes the response, which cancels the
+    generation on the server.
+    """
+    try:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            try:
+                chunk = json.loads(line)
+            except ValueError as e:
+                raise OllamaResponseError(f"Invalid JSON in Ollama stream: {str(e)}")
+            if "error" in chunk:
+                raise OllamaResponseError(f"Error from Ollama API: {chunk['error']}")
+            yield chunk
+    except requests.exceptions.Timeout as e:
+        raise OllamaTimeoutError(f"Timed out reading Ollama stream: {e}")
+    except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+        raise OllamaConnectionError(f"Ollama stream was interrupted: {e}")
+    finally:
+        response.close()
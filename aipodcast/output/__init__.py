@@ -1 +1,14 @@
-from .formatter import OutputFormatter
+from ..lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    "OutputFormatter": ".formatter",
+    "TranscriptWriter": ".writers",
+    "JSONWriter": ".writers",
+    "JSONLinesWriter": ".writers",
+    "MarkdownWriter": ".writers",
+    "ArchiveWriter": ".archive",
+    "ArchiveReader": ".archive",
+    "json_to_archive": ".archive",
+    "archive_to_json": ".archive",
+    "TranscriptIndex": ".index",
+})
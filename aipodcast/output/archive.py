@@ -0,0 +1,293 @@
+import bisect
+import datetime
+import json
+import lzma
+import mmap
+import os
+import struct
+import zlib
+from typing import Dict, Any, List, Optional, Iterator
+
+# Layout: header | compressed blocks of turns | compressed footer | trailer.
+# The footer holds the metadata, the speaker table and the offset of every
+# block; the trailer at the end of the file points to the footer.
+MAGIC = b"APCZ"
+VERSION = 1
+HEADER = struct.Struct("<4sBB2x")
+TRAILER = struct.Struct("<QI4s")
+
+EXTENSION = ".pcz"
+
+CODECS = {
+    "zlib": (0, lambda data: zlib.compress(data, 9), zlib.decompress),
+    "lzma": (1, lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+CODEC_NAMES = {codec_id: name for name, (codec_id, _, _) in CODECS.items()}
+
+# Keys stored positionally in each turn record; any others are kept in a dict
+TURN_FIELDS = ("speaker", "text", "timestamp")
+
+
+class ArchiveWriter:
+    """
+    Writes a transcript as a compressed archive, turn by turn.
+    Turns are packed into independently compressed blocks of block_size
+    turns, with speaker names replaced by their index in a speaker table.
+    Full blocks are appended to "<output>.part" as the conversation runs;
+    finalize() writes the last block and the footer index and renames the
+    file into place. Offers the same interface as TranscriptWriter.
+    """
+
+    def __init__(self,
+                output_path: str,
+                metadata: Optional[Dict[str, Any]] = None,
+                flush_every: int = 1,
+                fsync: bool = False,
+                codec: str = "zlib",
+                block_size: int = 16):
+        """
+        Initialize the writer and open the live file.
+        Blocks are flushed as they are written unless flush_every is 0; with
+        fsync, every flush is also synced to disk.
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown archive codec '{codec}'. Must be one of: {', '.join(CODECS)}")
+        if block_size < 1:
+            raise ValueError("Archive block_size must be at least 1")
+
+        self.output_path = output_path
+        self.part_path = f"{output_path}.part"
+        self.metadata = dict(metadata or {})
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.codec = codec
+        self.block_size = block_size
+        self.created_at = datetime.datetime.now().isoformat()
+        self.turns = 0
+        self.speakers: List[str] = []
+        self._speaker_ids: Dict[str, int] = {}
+        # [offset, length, first turn] of every block written so far
+        self.blocks: List[List[int]] = []
+        self._pending: List[list] = []
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        self._file = open(self.part_path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, CODECS[codec][0]))
+
+    def encode_turn(self, entry: Dict[str, Any]) -> list:
+        """Return the compact record of a turn: [speaker id, text, timestamp(, other keys)]."""
+        speaker = entry.get('speaker', '')
+        if speaker not in self._speaker_ids:
+            self._speaker_ids[speaker] = len(self.speakers)
+            self.speakers.append(speaker)
+
+        record = [self._speaker_ids[speaker], entry.get('text', ''), entry.get('timestamp')]
+        extra = {key: value for key, value in entry.items() if key not in TURN_FIELDS}
+        if extra:
+            record.append(extra)
+        return record
+
+    def write_turn(self, entry: Dict[str, Any]) -> None:
+        """Add a turn, writing out the block once it is full."""
+        self._pending.append(self.encode_turn(entry))
+        self.turns += 1
+        if len(self._pending) >= self.block_size:
+            self._write_block()
+
+    def _compress(self, value: Any) -> bytes:
+        """Serialize a value as compact JSON and compress it."""
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+        return CODECS[self.codec][1](data)
+
+    def _write_block(self) -> None:
+        """Compress the pending turns into a block at the end of the live file."""
+        if not self._pending:
+            return
+        data = self._compress(self._pending)
+        self.blocks.append([self._file.tell(), len(data), self.turns - len(self._pending)])
+        self._file.write(data)
+        self._pending = []
+        if self.flush_every:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Push buffered writes to the OS, and to the disk if fsync is set."""
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def finalize(self, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Write the remaining turns and the footer, move the archive into place and return its path.
+        metadata, if given, replaces the metadata passed at construction.
+        """
+        if metadata is not None:
+            self.metadata = dict(metadata)
+
+        self._write_block()
+        footer = self._compress({
+            "metadata": self.metadata,
+            "created_at": self.created_at,
+            "turns": self.turns,
+            "speakers": self.speakers,
+            "blocks": self.blocks,
+        })
+        footer_offset = self._file.tell()
+        self._file.write(footer)
+        self._file.write(TRAILER.pack(footer_offset, len(footer), MAGIC))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+        os.replace(self.part_path, self.output_path)
+        return self.output_path
+
+    def close(self) -> None:
+        """Close the live file without finalizing; it is left on disk."""
+        if not self._file.closed:
+            self._flush()
+            self._file.close()
+
+    def __enter__(self) -> 'ArchiveWriter':
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None and not self._file.closed:
+            self.finalize()
+        else:
+            self.close()
+
+
+class ArchiveReader:
+    """
+    Reads turns from a compressed archive without loading all of it.
+    The file is memory-mapped and only the footer is decompressed on open;
+    reading a turn decompresses just the block that holds it.
+    """
+
+    def __init__(self, path: str):
+        """Open the archive and read its footer index."""
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self._map) < HEADER.size + TRAILER.size:
+                raise ValueError(f"{path} is too short to be a transcript archive")
+            magic, version, codec_id = HEADER.unpack_from(self._map, 0)
+            footer_offset, footer_length, end_magic = TRAILER.unpack_from(self._map, len(self._map) - TRAILER.size)
+            if magic != MAGIC or end_magic != MAGIC:
+                raise ValueError(f"{path} is not a complete transcript archive")
+            if version != VERSION or codec_id not in CODEC_NAMES:
+                raise ValueError(f"{path} uses an unsupported archive version or codec")
+
+            self.codec = CODEC_NAMES[codec_id]
+            footer = self._decompress(footer_offset, footer_length)
+        except Exception:
+            self._map.close()
+            raise
+
+        self.metadata: Dict[str, Any] = footer["metadata"]
+        self.created_at: str = footer["created_at"]
+        self.speakers: List[str] = footer["speakers"]
+        self.blocks: List[List[int]] = footer["blocks"]
+        self._first_turns = [block[2] for block in self.blocks]
+        self._turn_count: int = footer["turns"]
+        # The most recently decompressed block, as (index, records)
+        self._cached_block = (-1, [])
+
+    def _decompress(self, offset: int, length: int) -> Any:
+        """Decompress and parse the JSON stored at offset."""
+        try:
+            data = CODECS[self.codec][2](self._map[offset:offset + length])
+        except (zlib.error, lzma.LZMAError) as e:
+            raise ValueError(f"{self.path} is corrupt: {str(e)}")
+        return json.loads(data.decode('utf-8'))
+
+    def _block(self, index: int) -> List[list]:
+        """Return the records of a block, decompressing it unless it was the last one read."""
+        if self._cached_block[0] != index:
+            offset, length, _ = self.blocks[index]
+            self._cached_block = (index, self._decompress(offset, length))
+        return self._cached_block[1]
+
+    def decode_turn(self, record: list) -> Dict[str, Any]:
+        """Rebuild a history entry from its compact record."""
+        entry = {'speaker': self.speakers[record[0]], 'text': record[1]}
+        if record[2] is not None:
+            entry['timestamp'] = record[2]
+        if len(record) > 3:
+            entry.update(record[3])
+        return entry
+
+    def __len__(self) -> int:
+        return self._turn_count
+
+    def turn(self, index: int) -> Dict[str, Any]:
+        """Return one turn; negative indexes count from the end."""
+        if index < 0:
+            index += self._turn_count
+        if not 0 <= index < self._turn_count:
+            raise IndexError(f"Turn {index} is out of range for {self._turn_count} turns")
+        block_index = bisect.bisect_right(self._first_turns, index) - 1
+        return self.decode_turn(self._block(block_index)[index - self._first_turns[block_index]])
+
+    def turns(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the turns from start up to, not including, stop, like a slice."""
+        start, stop, _ = slice(start, stop).indices(self._turn_count)
+        return [self.turn(index) for index in range(start, stop)]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self._turn_count):
+            yield self.turn(index)
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def __enter__(self) -> 'ArchiveReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def json_to_archive(json_path: str,
+                    archive_path: Optional[str] = None,
+                    codec: str = "zlib",
+                    block_size: int = 16) -> str:
+    """Convert a JSON transcript to an archive next to it (or at archive_path) and return its path."""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("conversation"), list):
+        raise ValueError(f"{json_path} is not a JSON transcript (no conversation list)")
+    if not isinstance(data.get("metadata", {}), dict):
+        raise ValueError(f"{json_path} is not a JSON transcript (metadata is not a mapping)")
+    if archive_path is None:
+        archive_path = os.path.splitext(json_path)[0] + EXTENSION
+
+    writer = ArchiveWriter(archive_path, data.get("metadata", {}), flush_every=0,
+                           codec=codec, block_size=block_size)
+    # Keep the original creation time rather than the time of conversion
+    writer.created_at = data.get("created_at", writer.created_at)
+    for entry in data["conversation"]:
+        writer.write_turn(entry)
+    return writer.finalize()
+
+
+def archive_to_json(archive_path: str, json_path: Optional[str] = None) -> str:
+    """Convert an archive back to the JSON transcript format of OutputFormatter.save_as_json."""
+    if json_path is None:
+        json_path = os.path.splitext(archive_path)[0] + ".json"
+
+    with ArchiveReader(archive_path) as reader:
+        output = {
+            "metadata": reader.metadata,
+            "created_at": reader.created_at,
+            "conversation": list(reader)
+        }
+
+    os.makedirs(os.path.dirname(os.path.abspath(json_path)), exist_ok=True)
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    return json_path
@@ -3,6 +3,9 @@ import os
 import datetime
 from typing import Dict, Any, List
 
+from .writers import TranscriptWriter, MarkdownWriter, WRITERS
+from .archive import ArchiveWriter
+
 class OutputFormatter:
     """Formats and saves podcast conversations."""
     
@@ -65,6 +68,60 @@ class OutputFormatter:
                 
         return output_path
     
+    @staticmethod
+    def create_writer(format_type: str,
+                     output_path: str,
+                     metadata: Dict[str, Any] = None,
+                     flush_every: int = 1,
+                     fsync: bool = False,
+                     codec: str = "zlib",
+                     block_size: int = 16) -> TranscriptWriter:
+        """
+        Create a writer that saves the conversation in the specified format turn by turn.
+        Unknown formats are written as Markdown, as in save_conversation.
+        codec and block_size only apply to the compressed "pcz" archive.
+        """
+        writer_class = WRITERS.get(format_type.lower(), MarkdownWriter)
+        if writer_class is ArchiveWriter:
+            return ArchiveWriter(output_path, metadata, flush_every=flush_every, fsync=fsync,
+                                 codec=codec, block_size=block_size)
+        return writer_class(output_path, metadata, flush_every=flush_every, fsync=fsync)
+    
+    @staticmethod
+    def save_as_jsonl(conversation: List[Dict[str, str]], 
+                     output_path: str = None,
+                     metadata: Dict[str, Any] = None) -> str:
+        """Save the conversation as a JSON Lines file: a metadata line, then one line per turn."""
+        if output_path is None:
+            # Use output directory at project root
+            root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            output_dir = os.path.join(root_dir, "output")
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = os.path.join(output_dir, f"podcast_{timestamp}.jsonl")
+            
+        writer = OutputFormatter.create_writer("jsonl", output_path, metadata, flush_every=0)
+        for entry in conversation:
+            writer.write_turn(entry)
+        return writer.finalize()
+    
+    @staticmethod
+    def save_as_archive(conversation: List[Dict[str, str]], 
+                       output_path: str = None,
+                       metadata: Dict[str, Any] = None,
+                       codec: str = "zlib") -> str:
+        """Save the conversation as a compressed archive with random access to turns."""
+        if output_path is None:
+            # Use output directory at project root
+            root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            output_dir = os.path.join(root_dir, "output")
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = os.path.join(output_dir, f"podcast_{timestamp}.pcz")
+            
+        writer = OutputFormatter.create_writer("pcz", output_path, metadata, flush_every=0, codec=codec)
+        for entry in conversation:
+            writer.write_turn(entry)
+        return writer.finalize()
+    
     @staticmethod
     def save_conversation(conversation: List[Dict[str, str]], 
                         format_type: str = "markdown",
@@ -73,5 +130,9 @@ class OutputFormatter:
         """Save the conversation in the specified format."""
         if format_type.lower() == "json":
             return OutputFormatter.save_as_json(conversation, output_path, metadata)
+        elif format_type.lower() == "jsonl":
+            return OutputFormatter.save_as_jsonl(conversation, output_path, metadata)
+        elif format_type.lower() == "pcz":
+            return OutputFormatter.save_as_archive(conversation, output_path, metadata)
         else:
             return OutputFormatter.save_as_markdown(conversation, output_path, metadata)
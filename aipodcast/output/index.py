@@ -0,0 +1,253 @@
+import json
+import os
+import sqlite3
+import unicodedata
+from typing import Dict, Any, List, Optional, Tuple
+
+from .archive import ArchiveReader
+
+# Devanagari vowel signs, virama, nukta and nasal marks. unicode61 treats them
+# as separators by default, which would split every Hindi word into fragments.
+DEVANAGARI_MARKS = "".join(
+    chr(code) for code in range(0x0900, 0x0980) if unicodedata.category(chr(code)) in ("Mn", "Mc")
+)
+
+TOKENIZER = f"unicode61 remove_diacritics 0 tokenchars '{DEVANAGARI_MARKS}'"
+
+# Transcript formats the index can read
+INDEXED_EXTENSIONS = (".json", ".jsonl", ".pcz")
+
+# Turn journals of interrupted runs are JSON Lines too, but not transcripts
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+# Metadata fields stored per episode and searchable with filters
+METADATA_FIELDS = ("host", "guest", "theme", "tone", "model", "language")
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS episodes (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    host TEXT, guest TEXT, theme TEXT, tone TEXT, model TEXT, language TEXT,
+    created_at TEXT,
+    turns INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY,
+    episode_id INTEGER NOT NULL REFERENCES episodes(id) ON DELETE CASCADE,
+    turn INTEGER NOT NULL,
+    speaker TEXT,
+    text TEXT,
+    UNIQUE (episode_id, turn)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(
+    speaker, text, content='turns', content_rowid='id', tokenize="{TOKENIZER}"
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS episodes_fts USING fts5(
+    host, guest, theme, tone, model, content='episodes', content_rowid='id', tokenize="{TOKENIZER}"
+);
+CREATE TRIGGER IF NOT EXISTS turns_ai AFTER INSERT ON turns BEGIN
+    INSERT INTO turns_fts(rowid, speaker, text) VALUES (new.id, new.speaker, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS turns_ad AFTER DELETE ON turns BEGIN
+    INSERT INTO turns_fts(turns_fts, rowid, speaker, text) VALUES ('delete', old.id, old.speaker, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS episodes_ai AFTER INSERT ON episodes BEGIN
+    INSERT INTO episodes_fts(rowid, host, guest, theme, tone, model)
+    VALUES (new.id, new.host, new.guest, new.theme, new.tone, new.model);
+END;
+CREATE TRIGGER IF NOT EXISTS episodes_ad AFTER DELETE ON episodes BEGIN
+    INSERT INTO episodes_fts(episodes_fts, rowid, host, guest, theme, tone, model)
+    VALUES ('delete', old.id, old.host, old.guest, old.theme, old.tone, old.model);
+END;
+"""
+
+
+def read_transcript(path: str) -> Optional[Tuple[Dict[str, Any], str, List[Dict[str, Any]]]]:
+    """
+    Return the metadata, creation time and turns of a JSON, JSON Lines or
+    archived transcript, or None if the file is some other JSON (e.g. metrics).
+    """
+    if path.endswith(".pcz"):
+        with ArchiveReader(path) as reader:
+            return reader.metadata, reader.created_at, list(reader)
+
+    if path.endswith(".jsonl"):
+        metadata, created_at, turns = None, "", []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if metadata is None:
+                    # Transcripts start with their metadata record
+                    if not isinstance(record, dict) or record.get("type") != "metadata":
+                        return None
+                    metadata = record.get("metadata", {})
+                    created_at = record.get("created_at", "")
+                else:
+                    turns.append(record)
+        return (metadata, created_at, turns) if metadata is not None else None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("conversation"), list):
+        return None
+    return data.get("metadata", {}), data.get("created_at", ""), data["conversation"]
+
+
+def quote_query(text: str) -> str:
+    """Turn plain search words into an FTS5 query matching all of them, ignoring query syntax."""
+    words = text.split()
+    return " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+
+class TranscriptIndex:
+    """
+    SQLite full-text index over the generated transcripts.
+    Episodes are keyed by path and re-read only when their modification time
+    or size changes, so updating the index after a run only parses the new files.
+    Turn text and episode metadata are searchable with FTS5, with Devanagari
+    words kept whole.
+    """
+
+    def __init__(self, db_path: str):
+        """Open (or create) the index database."""
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    def update(self, output_dir: str) -> Dict[str, int]:
+        """
+        Bring the index in line with the transcripts in output_dir.
+        Returns how many episodes were added, updated, removed and skipped as unreadable.
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0, "failed": 0}
+        known = {
+            row["path"]: (row["mtime"], row["size"])
+            for row in self.conn.execute("SELECT path, mtime, size FROM episodes")
+        }
+
+        seen = set()
+        for name in sorted(os.listdir(output_dir)):
+            path = os.path.abspath(os.path.join(output_dir, name))
+            if not name.endswith(INDEXED_EXTENSIONS) or name.endswith(JOURNAL_SUFFIX) or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            if known.get(path) == (stat.st_mtime, stat.st_size):
+                seen.add(path)
+                stats["unchanged"] += 1
+                continue
+
+            try:
+                transcript = read_transcript(path)
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"Skipping {name}: {str(e)}")
+                seen.add(path)
+                stats["failed"] += 1
+                continue
+            if transcript is None:
+                # Other JSON in the output folder, such as metrics files
+                continue
+            seen.add(path)
+            metadata, created_at, turns = transcript
+
+            with self.conn:
+                self.conn.execute("DELETE FROM episodes WHERE path = ?", (path,))
+                self.add_episode(path, stat, metadata, created_at, turns)
+            stats["updated" if path in known else "added"] += 1
+
+        with self.conn:
+            for path in set(known) - seen:
+                self.conn.execute("DELETE FROM episodes WHERE path = ?", (path,))
+                stats["removed"] += 1
+        return stats
+
+    def add_episode(self,
+                   path: str,
+                   stat: os.stat_result,
+                   metadata: Dict[str, Any],
+                   created_at: str,
+                   turns: List[Dict[str, Any]]) -> int:
+        """Insert one episode and its turns; the caller owns the transaction."""
+        values = [str(metadata.get(field, "")) for field in METADATA_FIELDS]
+        cursor = self.conn.execute(
+            f"INSERT INTO episodes (path, mtime, size, {', '.join(METADATA_FIELDS)}, created_at, turns) "
+            f"VALUES (?, ?, ?, {', '.join('?' for _ in METADATA_FIELDS)}, ?, ?)",
+            [path, stat.st_mtime, stat.st_size, *values, created_at, len(turns)]
+        )
+        episode_id = cursor.lastrowid
+        self.conn.executemany(
+            "INSERT INTO turns (episode_id, turn, speaker, text) VALUES (?, ?, ?, ?)",
+            [(episode_id, i, turn.get('speaker', ''), turn.get('text', '')) for i, turn in enumerate(turns)]
+        )
+        return episode_id
+
+    def search(self,
+              query: str,
+              filters: Optional[Dict[str, str]] = None,
+              limit: int = 10,
+              offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Return the turns matching an FTS5 query, best matches first.
+        Episodes whose metadata matches the query are included as rows with
+        turn -1; filters restrict the episodes by exact metadata values
+        (e.g. {"model": "llama3"}).
+        """
+        conditions, filter_values = [], []
+        for field, value in (filters or {}).items():
+            if field not in METADATA_FIELDS:
+                raise ValueError(f"Unknown filter '{field}'. Must be one of: {', '.join(METADATA_FIELDS)}")
+            conditions.append(f"e.{field} = ?")
+            filter_values.append(value)
+        where = f"AND {' AND '.join(conditions)}" if conditions else ""
+
+        sql = f"""
+            SELECT e.id AS episode_id, e.path, e.host, e.guest, e.theme, e.model,
+                   t.turn, t.speaker,
+                   snippet(turns_fts, 1, '[', ']', '…', 12) AS snippet,
+                   bm25(turns_fts) AS rank
+            FROM turns_fts
+            JOIN turns t ON t.id = turns_fts.rowid
+            JOIN episodes e ON e.id = t.episode_id
+            WHERE turns_fts MATCH ? {where}
+            UNION ALL
+            SELECT e.id, e.path, e.host, e.guest, e.theme, e.model,
+                   -1, '', snippet(episodes_fts, 2, '[', ']', '…', 12), bm25(episodes_fts)
+            FROM episodes_fts
+            JOIN episodes e ON e.id = episodes_fts.rowid
+            WHERE episodes_fts MATCH ? {where}
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        """
+        # The filter values are needed once per half of the union
+        params = [query, *filter_values, query, *filter_values, limit, offset]
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def get_episode(self, episode: str) -> Optional[Dict[str, Any]]:
+        """Return an episode by id, path or file name."""
+        if episode.isdigit():
+            row = self.conn.execute("SELECT * FROM episodes WHERE id = ?", (int(episode),)).fetchone()
+        else:
+            row = self.conn.execute(
+                "SELECT * FROM episodes WHERE path = ? OR path LIKE ? ORDER BY id LIMIT 1",
+                (os.path.abspath(episode), f"%{os.sep}{os.path.basename(episode)}")
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_turns(self, episode_id: int, offset: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return one page of an episode's turns in order."""
+        rows = self.conn.execute(
+            "SELECT turn, speaker, text FROM turns WHERE episode_id = ? ORDER BY turn LIMIT ? OFFSET ?",
+            (episode_id, limit, offset)
+        )
+        return [dict(row) for row in rows]
@@ -0,0 +1,189 @@
+import datetime
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional
+
+from .archive import ArchiveWriter
+
+
+class TranscriptWriter(ABC):
+    """
+    Writes a conversation turn by turn while it is generated.
+    Turns go to a live "<output>.part" file that stays readable (and, for
+    JSON, valid) after every flush, so a viewer or tail can follow the
+    podcast. finalize() writes the header with the final metadata, copies the
+    turns across in blocks and renames the result over the output path, so
+    the output file is only ever complete and memory use does not grow with
+    the length of the transcript.
+    """
+
+    def __init__(self,
+                output_path: str,
+                metadata: Optional[Dict[str, Any]] = None,
+                flush_every: int = 1,
+                fsync: bool = False):
+        """
+        Initialize the writer and open the live file.
+        The live file is flushed every flush_every turns (0 only flushes on
+        finalize); with fsync, every flush is also synced to disk.
+        """
+        self.output_path = output_path
+        self.part_path = f"{output_path}.part"
+        self.metadata = dict(metadata or {})
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.created_at = datetime.datetime.now().isoformat()
+        self.turns = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        # Binary mode, so positions are plain byte offsets
+        self._file = open(self.part_path, 'w+b')
+        self._file.write(self.render_header(self.metadata).encode('utf-8'))
+        # Byte offsets of the turns in the live file
+        self.body_start = self._file.tell()
+        self.body_end = self.body_start
+        self._file.write(self.render_footer().encode('utf-8'))
+        self._flush()
+
+    def render_header(self, metadata: Dict[str, Any]) -> str:
+        """Return the text before the first turn."""
+        return ""
+
+    @abstractmethod
+    def render_turn(self, entry: Dict[str, Any], index: int) -> str:
+        """Return the text of one turn."""
+
+    def render_footer(self) -> str:
+        """Return the text after the last turn."""
+        return ""
+
+    def write_turn(self, entry: Dict[str, Any]) -> None:
+        """Append a turn to the live file."""
+        # Write over the footer, then put it back after the new turn
+        self._file.seek(self.body_end)
+        self._file.write(self.render_turn(entry, self.turns).encode('utf-8'))
+        self.body_end = self._file.tell()
+        self._file.write(self.render_footer().encode('utf-8'))
+        self._file.truncate()
+        self.turns += 1
+
+        if self.flush_every and self.turns % self.flush_every == 0:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Push buffered writes to the OS, and to the disk if fsync is set."""
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def finalize(self, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Write the complete output file atomically and return its path.
+        metadata, if given, replaces the metadata passed at construction.
+        """
+        if metadata is not None:
+            self.metadata = dict(metadata)
+
+        tmp_path = f"{self.output_path}.tmp"
+        with open(tmp_path, 'wb') as out:
+            out.write(self.render_header(self.metadata).encode('utf-8'))
+            # Copy the turns byte for byte; they were serialized once when written
+            self._file.seek(self.body_start)
+            remaining = self.body_end - self.body_start
+            while remaining > 0:
+                block = self._file.read(min(remaining, 1024 * 1024))
+                if not block:
+                    break
+                out.write(block)
+                remaining -= len(block)
+            out.write(self.render_footer().encode('utf-8'))
+            out.flush()
+            os.fsync(out.fileno())
+
+        os.replace(tmp_path, self.output_path)
+        self._file.close()
+        os.remove(self.part_path)
+        return self.output_path
+
+    def close(self) -> None:
+        """Close the live file without finalizing; it is left on disk."""
+        if not self._file.closed:
+            self._flush()
+            self._file.close()
+
+    def __enter__(self) -> 'TranscriptWriter':
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None and not self._file.closed:
+            self.finalize()
+        else:
+            self.close()
+
+
+class JSONWriter(TranscriptWriter):
+    """
+    Writes the same document as OutputFormatter.save_as_json, one compact
+    line per turn. The closing brackets are rewritten after every turn, so
+    the live file is always valid JSON.
+    """
+
+    def render_header(self, metadata: Dict[str, Any]) -> str:
+        metadata_json = json.dumps(metadata, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        return (
+            "{\n"
+            f'  "metadata": {metadata_json},\n'
+            f'  "created_at": {json.dumps(self.created_at)},\n'
+            '  "conversation": ['
+        )
+
+    def render_turn(self, entry: Dict[str, Any], index: int) -> str:
+        separator = "," if index else ""
+        return f"{separator}\n    {json.dumps(entry, ensure_ascii=False)}"
+
+    def render_footer(self) -> str:
+        return "\n  ]\n}\n"
+
+
+class JSONLinesWriter(TranscriptWriter):
+    """
+    Writes JSON Lines: a metadata record followed by one record per turn.
+    Every line is complete on its own, so a reader can follow the live file
+    with tail -f.
+    """
+
+    def render_header(self, metadata: Dict[str, Any]) -> str:
+        record = {"type": "metadata", "created_at": self.created_at, "metadata": metadata}
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+    def render_turn(self, entry: Dict[str, Any], index: int) -> str:
+        return json.dumps({"type": "turn", "index": index, **entry}, ensure_ascii=False) + "\n"
+
+
+class MarkdownWriter(TranscriptWriter):
+    """Writes the same document as OutputFormatter.save_as_markdown, turn by turn."""
+
+    def render_header(self, metadata: Dict[str, Any]) -> str:
+        header = ""
+        if metadata:
+            header += "# AI-Generated Podcast\n\n"
+            header += "## Metadata\n\n"
+            for key, value in metadata.items():
+                header += f"- **{key}:** {value}\n"
+            header += f"- **Created At:** {self.created_at}\n\n"
+        return header + "## Conversation\n\n"
+
+    def render_turn(self, entry: Dict[str, Any], index: int) -> str:
+        speaker = entry.get('speaker', 'Unknown')
+        text = entry.get('text', '')
+        return f"### {speaker}\n\n{text}\n\n"
+
+
+# Writer class per output format
+WRITERS = {
+    "json": JSONWriter,
+    "jsonl": JSONLinesWriter,
+    "markdown": MarkdownWriter,
+    "pcz": ArchiveWriter,
+}
@@ -0,0 +1,46 @@
+import pytest
+
+from aipodcast.benchmarks.mock_server import MockOllamaServer
+from aipodcast.cli import paths, runner
+from aipodcast.models import OllamaTransport
+
+
+@pytest.fixture
+def mock_ollama():
+    """A mock Ollama server answering with the canned Hindi responses."""
+    with MockOllamaServer("hindi") as server:
+        yield server
+
+
+@pytest.fixture
+def transport(mock_ollama):
+    """A transport to the mock server that gives up quickly."""
+    return OllamaTransport(mock_ollama.url, max_retries=1, backoff_base=0.01, backoff_max=0.05)
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    """Send everything written to the output folder to a temporary directory."""
+    output = tmp_path / "output"
+    output.mkdir()
+    monkeypatch.setattr(paths, "get_output_dir", lambda: str(output))
+    monkeypatch.setattr(runner, "get_output_dir", lambda: str(output))
+    return output
+
+
+def make_podcast_config(**overrides):
+    """Return a small valid Hindi podcast config for the mock model."""
+    podcast_config = {
+        "host": {"name": "Host", "personality": "Curious, warm interviewer"},
+        "guest": {"name": "Guest", "personality": "Thoughtful storyteller"},
+        "language": "Hindi",
+        "tone": "Formal",
+        "theme": "The future of our cities",
+        "max_tokens_per_response": 60,
+        "total_podcast_duration_minutes": 1,
+        "ollama_model": "llama3",
+        "output_format": "json",
+        "duration_control": "fixed",
+    }
+    podcast_config.update(overrides)
+    return podcast_config
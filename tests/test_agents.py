@@ -0,0 +1,27 @@
+import pytest
+
+from aipodcast.agents import HostAgent, LanguageGuard, RepetitionDetector
+from aipodcast.benchmarks.mock_server import MockOllamaServer
+from aipodcast.models import OllamaClient, OllamaTransport
+
+
+@pytest.fixture
+def english_client():
+    """A client of a mock server that only ever answers in English."""
+    with MockOllamaServer("english") as server:
+        transport = OllamaTransport(server.url, max_retries=1, backoff_base=0.01, backoff_max=0.05)
+        yield OllamaClient(base_url=server.url, model="llama3:latest", transport=transport)
+
+
+def test_abandoned_attempts_leave_no_exchange_in_the_session(english_client):
+    # A window longer than the responses holds them back until the guard sees them on flush
+    host = HostAgent("Host", "Curious", english_client, language="Hindi", use_session=True,
+                     language_guard=LanguageGuard(english_client, max_attempts=3),
+                     repetition_detector=RepetitionDetector(ngram_size=100))
+    streamed = []
+    response = host.complete("नमस्ते", on_chunk=streamed.append)
+
+    assert host.language_guard.aborts == 2
+    assert host.session.turns == 1
+    assert host.session.messages[-1] == {"role": "assistant", "content": response}
+    assert [m["role"] for m in host.session.messages] == ["system", "user", "assistant"]
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from aipodcast.output.archive import ArchiveReader, ArchiveWriter, archive_to_json, json_to_archive
+
+TRANSCRIPT = {
+    "metadata": {"host": "Host", "guest": "Guest", "language": "Hindi"},
+    "created_at": "2025-01-01T10:00:00",
+    "conversation": [
+        {"speaker": "Host" if i % 2 == 0 else "Guest", "text": f"मोड़ संख्या {i}", "timestamp": 1000.0 + i}
+        for i in range(37)
+    ] + [{"speaker": "Host", "text": "Closing", "timestamp": 2000.0, "translated": True}],
+}
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_json_round_trip(tmp_path, codec):
+    json_path = tmp_path / "podcast.json"
+    json_path.write_text(json.dumps(TRANSCRIPT, ensure_ascii=False), encoding="utf-8")
+
+    archive_path = json_to_archive(str(json_path), codec=codec, block_size=5)
+    restored_path = archive_to_json(archive_path, str(tmp_path / "restored.json"))
+
+    with open(restored_path, encoding="utf-8") as f:
+        assert json.load(f) == TRANSCRIPT
+
+
+def test_reader_reads_single_turns(tmp_path):
+    path = str(tmp_path / "podcast.pcz")
+    with ArchiveWriter(path, TRANSCRIPT["metadata"], block_size=4) as writer:
+        for entry in TRANSCRIPT["conversation"]:
+            writer.write_turn(entry)
+
+    with ArchiveReader(path) as reader:
+        assert len(reader) == len(TRANSCRIPT["conversation"])
+        assert reader.metadata == TRANSCRIPT["metadata"]
+        assert reader.turn(9) == TRANSCRIPT["conversation"][9]
+        assert reader.turn(-1) == TRANSCRIPT["conversation"][-1]
+        assert reader.turns(3, 6) == TRANSCRIPT["conversation"][3:6]
+        with pytest.raises(IndexError):
+            reader.turn(len(reader))
+
+
+def test_unfinished_archive_is_rejected(tmp_path):
+    path = str(tmp_path / "podcast.pcz")
+    writer = ArchiveWriter(path, block_size=1)
+    writer.write_turn({"speaker": "Host", "text": "Hello"})
+    writer.close()
+
+    with pytest.raises(ValueError):
+        ArchiveReader(writer.part_path)
+
+
+@pytest.mark.parametrize("content", ["[1, 2]", "42", '"text"', '{"metadata": {}}', '{"conversation": {}}',
+                                     '{"metadata": [], "conversation": []}'])
+def test_json_to_archive_rejects_other_json(tmp_path, content):
+    json_path = tmp_path / "other.json"
+    json_path.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError):
+        json_to_archive(str(json_path))
+    assert not (tmp_path / "other.pcz").exists()
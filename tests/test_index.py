@@ -0,0 +1,81 @@
+import json
+import os
+
+import pytest
+
+from aipodcast.conversation import TurnJournal
+from aipodcast.output.index import TranscriptIndex, quote_query
+from aipodcast.output.writers import WRITERS
+
+METADATA = {"host": "Host", "guest": "Guest", "theme": "The future of our cities", "model": "llama3"}
+
+
+def write_transcript(path, turns, output_format="json", metadata=None):
+    """Write a transcript with the writer the podcasts use."""
+    with WRITERS[output_format](str(path), metadata or METADATA) as writer:
+        for speaker, text in turns:
+            writer.write_turn({"speaker": speaker, "text": text})
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = TranscriptIndex(str(tmp_path / "index.sqlite"))
+    yield index
+    index.close()
+
+
+def test_update_and_search(tmp_path, index):
+    output = tmp_path / "output"
+    output.mkdir()
+    write_transcript(output / "first.json", [("Host", "आज हम किसानों की बात करेंगे।"), ("Guest", "खेती बदल रही है।")])
+    write_transcript(output / "second.jsonl", [("Host", "शहरों में पानी की कमी है।")], "jsonl",
+                     dict(METADATA, model="mistral"))
+    write_transcript(output / "third.pcz", [("Guest", "किसानों को पानी चाहिए।")], "pcz")
+
+    assert index.update(str(output))["added"] == 3
+
+    # Devanagari words with vowel signs are matched whole
+    paths = {os.path.basename(row["path"]) for row in index.search(quote_query("किसानों"))}
+    assert paths == {"first.json", "third.pcz"}
+    matches = index.search(quote_query("पानी"), filters={"model": "mistral"})
+    assert [(os.path.basename(row["path"]), row["turn"]) for row in matches] == [("second.jsonl", 0)]
+    with pytest.raises(ValueError):
+        index.search("पानी", filters={"path": "x"})
+
+    episode = index.get_episode("first.json")
+    assert episode["turns"] == 2
+    assert [turn["speaker"] for turn in index.get_turns(episode["id"])] == ["Host", "Guest"]
+
+
+def test_update_only_rereads_changed_files(tmp_path, index):
+    output = tmp_path / "output"
+    output.mkdir()
+    write_transcript(output / "first.json", [("Host", "पहला")])
+    write_transcript(output / "second.json", [("Host", "दूसरा")])
+    index.update(str(output))
+
+    write_transcript(output / "first.json", [("Host", "पहला"), ("Guest", "बदला हुआ")])
+    os.remove(output / "second.json")
+    stats = index.update(str(output))
+
+    assert (stats["updated"], stats["removed"], stats["unchanged"]) == (1, 1, 0)
+    assert index.search(quote_query("बदला"))[0]["turn"] == 1
+    assert index.search(quote_query("दूसरा")) == []
+
+
+def test_update_skips_journals_and_other_json(tmp_path, index):
+    output = tmp_path / "output"
+    output.mkdir()
+    write_transcript(output / "podcast.json", [("Host", "नमस्ते")])
+    journal = TurnJournal(TurnJournal.path_for(str(output / "interrupted.json")))
+    journal.start({"theme": "x"})
+    journal.append(0, {"speaker": "Host", "text": "नमस्ते"})
+    journal.close()
+    (output / "metrics.json").write_text(json.dumps({"requests": 3, "latency": [0.1]}), encoding="utf-8")
+    (output / "list.json").write_text("[1, 2]", encoding="utf-8")
+    (output / "events.jsonl").write_text('{"event": "start"}\n', encoding="utf-8")
+
+    stats = index.update(str(output))
+
+    assert (stats["added"], stats["failed"]) == (1, 0)
+    assert [os.path.basename(row["path"]) for row in index.search(quote_query("नमस्ते"))] == ["podcast.json"]
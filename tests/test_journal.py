@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from aipodcast.cli.runner import PodcastRunner, create_client
+from aipodcast.conversation import TurnJournal
+
+from conftest import make_podcast_config
+
+
+def test_resume_returns_recorded_turns(tmp_path):
+    podcast_config = make_podcast_config()
+    journal = TurnJournal(str(tmp_path / "podcast.journal.jsonl"))
+    journal.start(podcast_config)
+    journal.append(0, {"speaker": "Host", "text": "पहला"})
+    journal.append(1, {"speaker": "Guest", "text": "दूसरा"})
+    journal.close()
+
+    resumed = TurnJournal(journal.path)
+    assert resumed.resume(podcast_config) == [
+        {"speaker": "Host", "text": "पहला"},
+        {"speaker": "Guest", "text": "दूसरा"},
+    ]
+    resumed.close()
+
+
+def test_resume_drops_partly_written_turn(tmp_path):
+    podcast_config = make_podcast_config()
+    journal = TurnJournal(str(tmp_path / "podcast.journal.jsonl"))
+    journal.start(podcast_config)
+    journal.append(0, {"speaker": "Host", "text": "पहला"})
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "turn", "index": 1, "entry": {"spea')
+
+    resumed = TurnJournal(journal.path)
+    assert len(resumed.resume(podcast_config)) == 1
+    resumed.append(1, {"speaker": "Guest", "text": "दूसरा"})
+    resumed.close()
+    assert len(TurnJournal(journal.path).load()["turns"]) == 2
+
+
+def test_resume_ignores_output_settings_but_not_the_conversation(tmp_path):
+    podcast_config = make_podcast_config()
+    journal = TurnJournal(str(tmp_path / "podcast.journal.jsonl"))
+    journal.start(podcast_config)
+    journal.close()
+
+    TurnJournal(journal.path).resume(make_podcast_config(output_format="markdown", keep_alive="5m"))
+    with pytest.raises(ValueError):
+        TurnJournal(journal.path).resume(make_podcast_config(theme="Something else"))
+
+
+def test_runner_continues_from_journal(transport, output_dir):
+    podcast_config = make_podcast_config(total_podcast_duration_minutes=2,
+                                         output_file=str(output_dir / "podcast.json"))
+    journaled = [
+        {"speaker": "Host", "text": "नमस्ते, यह पहले से लिखा गया मोड़ है।", "timestamp": 1.0},
+        {"speaker": "Guest", "text": "धन्यवाद, यह भी पहले से लिखा गया है।", "timestamp": 2.0},
+    ]
+    journal = TurnJournal(TurnJournal.path_for(podcast_config["output_file"]))
+    journal.start(podcast_config)
+    for index, entry in enumerate(journaled):
+        journal.append(index, entry)
+    journal.close()
+
+    runner = PodcastRunner(podcast_config, create_client(podcast_config, transport))
+    saved_path = runner.run(resume=True)
+
+    with open(saved_path, encoding="utf-8") as f:
+        conversation = json.load(f)["conversation"]
+    assert conversation[:2] == journaled
+    assert len(conversation) > 2
+    # The podcast was saved, so its journal is gone
+    assert not journal.exists()
@@ -0,0 +1,69 @@
+import pytest
+
+from aipodcast.agents.repetition import RepetitionDetector, RepetitionError
+
+
+def stream(text, detector=None):
+    """Feed text word by word to a watcher; return it with the passed-on text and whether it was cut."""
+    streamed = []
+    watcher = (detector or RepetitionDetector()).watch(streamed.append)
+    cut = False
+    try:
+        for word in text.split(" "):
+            watcher(word + " ")
+    except RepetitionError:
+        cut = True
+    watcher.flush()
+    return watcher, "".join(streamed), cut
+
+
+def test_text_is_passed_on_before_the_sentence_ends():
+    streamed = []
+    watcher = RepetitionDetector(ngram_size=4).watch(streamed.append)
+    for word in "यह एक बहुत लंबा वाक्य है जो अभी खत्म नहीं हुआ".split():
+        watcher(word + " ")
+
+    # Only the last four words are held back
+    assert "".join(streamed) == "यह एक बहुत लंबा वाक्य है जो "
+    watcher.flush()
+    assert "".join(streamed) == watcher.text
+
+
+def test_clean_response_is_passed_on_whole():
+    text = "आज हम शहरों की बात करेंगे। पानी की कमी एक बड़ी समस्या है। हमें मिलकर काम करना होगा।"
+    watcher, streamed, cut = stream(text)
+    assert not cut
+    assert streamed == watcher.text
+    assert watcher.clean_text() == text
+
+
+def test_loop_is_cut_before_its_repetition():
+    clean = "पहले हम इतिहास की बात करते हैं। "
+    loop = "यह बात हम सबको याद रखनी चाहिए और आगे बढ़ना चाहिए "
+    detector = RepetitionDetector()
+    watcher, streamed, cut = stream(clean + loop * 5, detector)
+
+    assert cut
+    assert watcher.clean_text() == clean.strip()
+    # The loop may have been shown in part, but never the words that triggered the cut
+    assert streamed.startswith(watcher.clean_text())
+    assert streamed.count(loop.strip()) < 3
+    assert detector.loops_cut == 1
+
+
+def test_repeated_sentence_is_cut():
+    text = "पानी की कमी एक बड़ी समस्या है। हमें सोचना होगा। पानी की कमी एक बड़ी समस्या है। और"
+    watcher, _, cut = stream(text)
+    assert cut
+    assert watcher.clean_text() == "पानी की कमी एक बड़ी समस्या है। हमें सोचना होगा।"
+
+
+@pytest.mark.parametrize("text, duplicate", [
+    ("शहरों में पानी की कमी एक बड़ी समस्या बन गई है", True),
+    ("गाँवों में खेती के नए तरीके अपनाए जा रहे हैं", False),
+])
+def test_flag_duplicate(text, duplicate):
+    detector = RepetitionDetector()
+    history = [{"speaker": "Host", "text": "शहरों में पानी की कमी एक बड़ी समस्या बन गई है।"}]
+    assert detector.flag_duplicate("Guest", text, history) == duplicate
+    assert detector.near_duplicates == int(duplicate)
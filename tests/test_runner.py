@@ -0,0 +1,23 @@
+import pytest
+
+from aipodcast.cli.runner import PodcastRunner, create_client
+from aipodcast.config import ConfigManager
+
+from conftest import make_podcast_config
+
+
+@pytest.mark.parametrize("duration_control, adaptive", [(None, False), ("fixed", False), ("adaptive", True)])
+def test_duration_control_is_fixed_unless_adaptive_is_asked_for(transport, duration_control, adaptive):
+    podcast_config = make_podcast_config()
+    del podcast_config["duration_control"]
+    if duration_control is not None:
+        podcast_config["duration_control"] = duration_control
+    ConfigManager._validate_config({"podcast_config": podcast_config})
+
+    manager = PodcastRunner(podcast_config, create_client(podcast_config, transport)).setup()
+    assert (manager.duration_controller is not None) == adaptive
+
+
+def test_unknown_duration_control_is_rejected():
+    with pytest.raises(ValueError):
+        ConfigManager._validate_config({"podcast_config": make_podcast_config(duration_control="auto")})
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from aipodcast.cli import runner
+from aipodcast.cli.batch import BatchRunner
+from aipodcast.cli.server import PodcastServer, QueueFullError
+
+from conftest import make_podcast_config
+
+
+@pytest.fixture
+def server(transport, output_dir):
+    """A server whose workers are not started, so submitted jobs stay queued."""
+    return PodcastServer(BatchRunner([], transport, max_parallel=1), port=0, queue_size=2)
+
+
+@pytest.mark.parametrize("config", [
+    None,
+    "podcast_config",
+    {"podcast_config": None},
+    {"podcast_config": {"host": "x"}},
+    {"podcast_config": make_podcast_config(host={"name": "Host"})},
+    {"podcast_config": make_podcast_config(output_format="pdf")},
+    {"podcast_config": make_podcast_config(metrics_file=["a", "b"])},
+])
+def test_submit_rejects_malformed_configs(server, config):
+    with pytest.raises(ValueError):
+        server.submit(config)
+    assert server.list_jobs() == []
+
+
+def test_submit_rejects_missing_model(server):
+    with pytest.raises(ValueError, match="not-pulled"):
+        server.submit({"podcast_config": make_podcast_config(ollama_model="not-pulled")})
+
+
+def test_submit_keeps_outputs_in_the_output_folder(server, output_dir):
+    config = {"podcast_config": make_podcast_config(output_file="../../escaped.json",
+                                                    metrics_file="/etc/metrics.json")}
+    job = server.submit(config, name="my podcast/../x")
+
+    assert os.path.dirname(job.podcast_config["output_file"]) == str(output_dir)
+    assert job.podcast_config["metrics_file"] == "metrics.json"
+    assert job.name == "my_podcast_.._x"
+    assert job.status == "queued"
+
+
+def test_full_queue_refuses_until_a_job_is_cancelled(server):
+    jobs = [server.submit({"podcast_config": make_podcast_config()}) for _ in range(2)]
+    with pytest.raises(QueueFullError):
+        server.submit({"podcast_config": make_podcast_config()})
+
+    assert server.cancel(jobs[0].id).status == "cancelled"
+    server.submit({"podcast_config": make_podcast_config()}, priority=3)
+    assert server.get_stats()["queued"] == 2
+
+
+def test_submit_refused_once_stopping(server):
+    server.stop()
+    with pytest.raises(RuntimeError):
+        server.submit({"podcast_config": make_podcast_config()})
+
+
+@pytest.mark.parametrize("directory", ["/tmp", "../../..", "responses"])
+def test_submit_keeps_the_response_cache_in_the_server_cache(server, tmp_path, monkeypatch, directory):
+    monkeypatch.setattr(runner, "get_project_root", lambda: str(tmp_path))
+    config = {"podcast_config": make_podcast_config(response_cache={"directory": directory, "max_size_mb": 0})}
+    job = server.submit(config)
+
+    cache = runner.create_cache(job.podcast_config)
+    assert cache.cache_dir == os.path.join(str(tmp_path), ".cache", "responses")
+
+
+def test_submit_rejects_malformed_response_cache(server):
+    with pytest.raises(ValueError):
+        server.submit({"podcast_config": make_podcast_config(response_cache="/tmp")})
+
+
+def test_refused_jobs_do_not_load_models(server, monkeypatch):
+    server.submit({"podcast_config": make_podcast_config()})
+    server.submit({"podcast_config": make_podcast_config()})
+    preloaded = []
+    monkeypatch.setattr(server.batch_runner, "preload", lambda *args: preloaded.append(args) or [])
+
+    with pytest.raises(QueueFullError):
+        server.submit({"podcast_config": make_podcast_config(ollama_model="other")})
+    server.stop()
+    with pytest.raises(RuntimeError):
+        server.submit({"podcast_config": make_podcast_config(ollama_model="other")})
+    assert preloaded == []
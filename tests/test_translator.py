@@ -0,0 +1,19 @@
+from aipodcast.benchmarks.mock_server import TRANSLATION_LINE
+from aipodcast.models import OllamaClient, SentenceTranslator
+
+
+def test_only_non_hindi_sentences_are_translated(mock_ollama, transport):
+    translator = SentenceTranslator(OllamaClient(base_url=mock_ollama.url, model="llama3", transport=transport))
+    requests_before = mock_ollama.requests
+    texts = translator.translate_many([
+        "नमस्ते दोस्तों, आज हम बात करेंगे। This part is English.\nयह हिंदी है।",
+        "Only English here. And here.",
+    ])
+
+    assert texts == [
+        f"नमस्ते दोस्तों, आज हम बात करेंगे। {TRANSLATION_LINE}\nयह हिंदी है।",
+        f"{TRANSLATION_LINE} {TRANSLATION_LINE}",
+    ]
+    # Both texts went out in one request
+    assert mock_ollama.requests - requests_before == 1
+    assert translator.get_stats() == {"translated_sentences": 3, "kept_sentences": 2}
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from aipodcast.output.writers import JSONLinesWriter, JSONWriter, TranscriptWriter
+
+
+def test_transcript_writer_needs_render_turn(tmp_path):
+    with pytest.raises(TypeError):
+        TranscriptWriter(str(tmp_path / "podcast.txt"))
+
+
+def test_json_live_file_is_valid_after_every_turn(tmp_path):
+    path = tmp_path / "podcast.json"
+    writer = JSONWriter(str(path), {"host": "Host"})
+    for i in range(3):
+        writer.write_turn({"speaker": "Host", "text": f"मोड़ {i}"})
+        with open(writer.part_path, encoding="utf-8") as f:
+            assert len(json.load(f)["conversation"]) == i + 1
+
+    writer.finalize({"host": "Host", "turns": 3})
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["metadata"] == {"host": "Host", "turns": 3}
+    assert [entry["text"] for entry in data["conversation"]] == ["मोड़ 0", "मोड़ 1", "मोड़ 2"]
+    assert not (tmp_path / "podcast.json.part").exists()
+
+
+def test_jsonl_starts_with_metadata(tmp_path):
+    path = tmp_path / "podcast.jsonl"
+    with JSONLinesWriter(str(path), {"host": "Host"}) as writer:
+        writer.write_turn({"speaker": "Guest", "text": "नमस्ते"})
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert records[0]["type"] == "metadata"
+    assert records[1] == {"type": "turn", "index": 0, "speaker": "Guest", "text": "नमस्ते"}